@@ -83,6 +83,28 @@ DATABASES = {
 }
 
 
+# Cache
+# The file backend is shared by every process on the host (web workers and the
+# event listener), so signal-driven invalidation reaches all of them. locmem is
+# per-process and only suitable for a single process.
+
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'file')
+
+CACHES = {
+    "default": {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'insurance',
+    } if CACHE_BACKEND == 'locmem' else {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('CACHE_LOCATION', str(BASE_DIR / '.django_cache')),
+        'OPTIONS': {'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', '10000'))},
+    }
+}
+
+# Cached buyer history lifetime; saves to Buyer/Claim/Premium invalidate it earlier
+BUYER_HISTORY_CACHE_TIMEOUT = int(os.getenv('BUYER_HISTORY_CACHE_TIMEOUT', '600'))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -140,6 +162,35 @@ HARDHAT_RPC_URL = os.getenv('HARDHAT_RPC_URL', 'http://127.0.0.1:8545')
 CONTRACT_ADDRESS = os.getenv('CONTRACT_ADDRESS', '')
 ADMIN_WALLET_ADDRESS = os.getenv('ADMIN_WALLET_ADDRESS', '0xf39Fd6e51aad88F6F4ce6aB8827279cffFb92266')
 
+# Admin listings (claims, buyers) are paginated with keyset cursors
+ADMIN_PAGE_SIZE = int(os.getenv('ADMIN_PAGE_SIZE', '50'))
+ADMIN_MAX_PAGE_SIZE = int(os.getenv('ADMIN_MAX_PAGE_SIZE', '500'))
+
+# Admin dashboard statistics are recomputed at most this often (seconds)
+ADMIN_STATS_CACHE_TIMEOUT = int(os.getenv('ADMIN_STATS_CACHE_TIMEOUT', '30'))
+
+# Most unverified claims re-checked by one admin/reverify-claims/ request
+ADMIN_REVERIFY_LIMIT = int(os.getenv('ADMIN_REVERIFY_LIMIT', '1000'))
+
+# Uploads are hashed (SHA-256) as they stream in, for duplicate claim detection
+FILE_UPLOAD_HANDLERS = [
+    'insurance.uploads.HashingMemoryFileUploadHandler',
+    'insurance.uploads.HashingTemporaryFileUploadHandler',
+]
+# Uploads larger than this are spooled to a temporary file instead of held in memory
+FILE_UPLOAD_MAX_MEMORY_SIZE = int(os.getenv('FILE_UPLOAD_MAX_MEMORY_SIZE', str(512 * 1024)))
+
+# Largest claim PDF request accepted by submit-claim (bytes); larger ones get 413
+CLAIM_UPLOAD_MAX_BYTES = int(os.getenv('CLAIM_UPLOAD_MAX_BYTES', str(20 * 1024 * 1024)))
+# Largest submit-claim/batch/ request (bytes; also the most a batch zip may expand to) and most files per batch
+CLAIM_BATCH_MAX_BYTES = int(os.getenv('CLAIM_BATCH_MAX_BYTES', str(200 * 1024 * 1024)))
+CLAIM_BATCH_MAX_ITEMS = int(os.getenv('CLAIM_BATCH_MAX_ITEMS', '100'))
+# Claim PDFs wait here until their job has extracted them; must be shared if jobs can resume on another host
+CLAIM_UPLOAD_DIR = os.getenv('CLAIM_UPLOAD_DIR', str(BASE_DIR / 'claim_uploads'))
+
+# Rows fetched per server-side cursor round trip by the streaming exports
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', '2000'))
+
 # CORS settings
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
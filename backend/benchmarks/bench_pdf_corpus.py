@@ -0,0 +1,179 @@
+"""
+Benchmark PDF claim extraction on a synthetic corpus with known ground truth
+(see pdf_corpus.py): throughput (docs/s, MB/s), peak memory and accuracy, overall
+and per layout, so a parser change can be judged on speed and correctness together.
+
+Usage (from backend/):
+    python benchmarks/bench_pdf_corpus.py --count 200
+    python benchmarks/pdf_corpus.py --out /tmp/claim-corpus --count 500
+    python benchmarks/bench_pdf_corpus.py --corpus /tmp/claim-corpus --workers 4 --json before.json
+"""
+import argparse
+import io
+import json
+import resource
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import bench_utils
+from bench_utils import percentile
+from pdf_corpus import LAYOUTS, generate_corpus, load_corpus
+
+
+def score(result, expected):
+    transaction_ok = result.get('transaction_id') == expected['transaction_id']
+    amount = result.get('amount')
+    amount_ok = amount is not None and abs(amount - expected['amount']) < 0.005
+    return transaction_ok, amount_ok
+
+
+def timed_pass(documents, extract, concurrency):
+    """
+    Latency and result per document; returns (rows, wall-clock seconds)
+    """
+    def one(document):
+        started = time.perf_counter()
+        try:
+            result = extract(document['data'])
+        except Exception as e:
+            result = {'error': str(e)}
+        return time.perf_counter() - started, result
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        rows = list(pool.map(one, documents))
+    return rows, time.perf_counter() - started
+
+
+def memory_pass(documents, extract, per_layout):
+    """
+    Peak Python memory allocated while extracting a document (in process, bytes), for the
+    per_layout largest documents of each layout: tracemalloc slows parsing ~20x
+    Returns {document index: peak}
+    """
+    by_layout = {}
+    for index, document in enumerate(documents):
+        by_layout.setdefault(document['layout'], []).append(index)
+    sampled = [
+        index for indexes in by_layout.values()
+        for index in sorted(indexes, key=lambda i: documents[i]['size'], reverse=True)[:per_layout]
+    ]
+    peaks = {}
+    tracemalloc.start()
+    try:
+        for index in sampled:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            extract(documents[index]['data'])
+            peaks[index] = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def report(label, documents, rows, peaks, elapsed=None):
+    count = len(documents)
+    megabytes = sum(document['size'] for document in documents) / 1e6
+    latencies = [latency for latency, _ in rows]
+    scores = [score(result, document['expected']) for (_, result), document in zip(rows, documents)]
+    busy = elapsed if elapsed is not None else sum(latencies)
+    both = sum(1 for transaction_ok, amount_ok in scores if transaction_ok and amount_ok)
+    errors = sum(1 for _, result in rows if 'error' in result)
+    return {
+        'layout': label,
+        'docs': count,
+        'pages': sum(document['pages'] for document in documents),
+        'mb': round(megabytes, 2),
+        'docs_per_second': round(count / busy, 1) if busy else 0.0,
+        'mb_per_second': round(megabytes / busy, 2) if busy else 0.0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 1),
+        'max_ms': round(max(latencies) * 1000, 1) if latencies else 0.0,
+        'peak_mem_max_mb': round(max(peaks) / 1e6, 2) if peaks else 0.0,
+        'transaction_accuracy': round(sum(1 for ok, _ in scores if ok) / count, 3) if count else 0.0,
+        'amount_accuracy': round(sum(1 for _, ok in scores if ok) / count, 3) if count else 0.0,
+        'accuracy': round(both / count, 3) if count else 0.0,
+        'errors': errors,
+    }
+
+
+def print_table(results):
+    columns = [
+        ('layout', 16), ('docs', 6), ('pages', 7), ('mb', 8), ('docs_per_second', 10), ('mb_per_second', 9),
+        ('p50_ms', 9), ('max_ms', 9), ('peak_mem_max_mb', 10), ('transaction_accuracy', 8), ('amount_accuracy', 8),
+        ('accuracy', 8), ('errors', 6),
+    ]
+    headers = {'docs_per_second': 'docs/s', 'mb_per_second': 'MB/s', 'peak_mem_max_mb': 'peak MB',
+               'transaction_accuracy': 'txn acc', 'amount_accuracy': 'amt acc', 'mb': 'MB'}
+    print(' '.join(headers.get(name, name).rjust(width) for name, width in columns))
+    for row in results:
+        print(' '.join(str(row[name]).rjust(width) for name, width in columns))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', help='Corpus directory written by pdf_corpus.py (default: generate in memory)')
+    parser.add_argument('--count', type=int, default=160, help='Documents to generate when no --corpus is given')
+    parser.add_argument('--layouts', help=f"Comma-separated subset of: {', '.join(LAYOUTS)}")
+    parser.add_argument('--max-pages', type=int)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--workers', type=int, default=0, help='Extract through a PdfExtractionPool of this many processes')
+    parser.add_argument('--memory-docs', type=int, default=2, help='Largest documents per layout measured for peak memory')
+    parser.add_argument('--json', help='Also write the results to this file, for comparing parser changes')
+    args = parser.parse_args()
+
+    from insurance.services.claim_extraction import extract_claim_data_from_pdf
+
+    if args.corpus:
+        documents = list(load_corpus(args.corpus))
+    else:
+        layouts = args.layouts.split(',') if args.layouts else None
+        documents = list(generate_corpus(args.count, args.seed, layouts, args.max_pages))
+    print(f"Corpus: {len(documents)} documents, {sum(d['pages'] for d in documents)} pages, "
+          f"{sum(d['size'] for d in documents) / 1e6:.1f} MB")
+
+    def in_process(data):
+        return extract_claim_data_from_pdf(io.BytesIO(data))
+
+    pool = None
+    extract, concurrency = in_process, 1
+    if args.workers:
+        from insurance.services.pdf_workers import PdfExtractionPool
+        pool = PdfExtractionPool(workers=args.workers, max_pages=10 ** 6, timeout=600, max_rss_mb=10 ** 6)
+        with ThreadPoolExecutor(max_workers=args.workers) as warmup:
+            list(warmup.map(pool.extract, [bench_utils.make_pdf([['warm up']])] * args.workers))
+        extract, concurrency = pool.extract, args.workers
+
+    try:
+        rows, elapsed = timed_pass(documents, extract, concurrency)
+    finally:
+        if pool:
+            pool.shutdown()
+    # Memory is always measured in process: pool workers are other processes
+    peaks = memory_pass(documents, in_process, args.memory_docs)
+
+    results = []
+    by_layout = {}
+    for index, document in enumerate(documents):
+        by_layout.setdefault(document['layout'], []).append(index)
+    for layout, indexes in by_layout.items():
+        results.append(report(
+            layout, [documents[i] for i in indexes], [rows[i] for i in indexes], [peaks[i] for i in indexes if i in peaks]
+        ))
+    overall = report('ALL', documents, rows, list(peaks.values()), elapsed)
+    results.append(overall)
+
+    mode = f'{args.workers} worker processes' if args.workers else 'in process'
+    print(f"Extraction {mode}; per-layout rates use summed latency, ALL uses wall-clock time; "
+          f"peak MB is Python allocations for the {args.memory_docs} largest documents of each layout")
+    print_table(results)
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"Benchmark process max RSS: {max_rss:.0f} MB")
+
+    if args.json:
+        with open(args.json, 'w') as json_file:
+            json.dump({'mode': mode, 'max_rss_mb': round(max_rss), 'results': results}, json_file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+"""
+Benchmark PDF claim extraction (extract_claim_data_from_pdf) on large multi-page bills.
+
+Compares the current single-pass extractor with the previous implementation, which
+concatenated every page's text and then ran uncompiled patterns over the whole document,
+once for the transaction ID and once more for the amount.
+
+With --workers N the same bills are also parsed concurrently through the worker
+process pool (PdfExtractionPool) that claim jobs use, which should scale with cores.
+
+Usage (from backend/):
+    python benchmarks/bench_pdf_extraction.py --pages 200 --documents 20
+    python benchmarks/bench_pdf_extraction.py --pages 500 --lines-per-page 60 --documents 5
+    python benchmarks/bench_pdf_extraction.py --pages 100 --documents 40 --workers 4
+"""
+import argparse
+import io
+import random
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import PyPDF2
+
+import bench_utils
+from bench_utils import summarize
+
+FILLER = [
+    'Ward charges - general ward',
+    'Consultation fee, attending physician',
+    'Laboratory: complete blood count',
+    'Pharmacy: paracetamol 500mg x 20',
+    'Radiology: chest X-ray, two views',
+    'Nursing care, per day',
+    'Medical supplies and consumables',
+]
+
+
+def legacy_extract(file):
+    """
+    The extractor as it was before the single-pass rewrite (two full reads of the PDF)
+    """
+    def read_text():
+        file.seek(0)
+        text = ""
+        for page in PyPDF2.PdfReader(file).pages:
+            text += page.extract_text()
+        return text
+
+    text = read_text()
+    transaction_id = None
+    for pattern in [r'Transaction\s*ID[:\s]*([A-Za-z0-9\-_]+)', r'TXN[:\s]*([A-Za-z0-9\-_]+)',
+                    r'Transaction[:\s]*([A-Za-z0-9\-_]+)', r'ID[:\s]*([A-Za-z0-9\-_]+)']:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            transaction_id = match.group(1)
+            break
+
+    text = read_text()
+    amount = None
+    for pattern in [r'Amount[:\s]*\$?([0-9,]+\.?[0-9]*)', r'Total[:\s]*\$?([0-9,]+\.?[0-9]*)',
+                    r'Claim\s*Amount[:\s]*\$?([0-9,]+\.?[0-9]*)', r'\$([0-9,]+\.?[0-9]*)']:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            try:
+                amount = float(match.group(1).replace(',', ''))
+                break
+            except ValueError:
+                continue
+    return {'transaction_id': transaction_id, 'amount': amount}
+
+
+def make_bill(rng, pages, lines_per_page, fields_on):
+    """
+    A bill with the transaction ID and amount on its first or last page
+    """
+    transaction_id = ''.join(rng.choice('ABCDEFGHJKLMNPQRSTUVWXYZ23456789') for _ in range(8))
+    amount = round(rng.uniform(50, 50000), 2)
+    body = [[rng.choice(FILLER) + f' {rng.randint(1, 999)}.00' for _ in range(lines_per_page)] for _ in range(pages)]
+    header = ['City Hospital - Itemised Bill', f'Transaction ID: {transaction_id}', f'Total Amount: ${amount:,.2f}']
+    target = body[0] if fields_on == 'first' else body[-1]
+    target[:0] = header
+    # Filler lines use no currency sign, so only the header can match the amount patterns
+    return bench_utils.make_pdf(body), {'transaction_id': transaction_id, 'amount': amount}
+
+
+def run(name, extract, documents, concurrency=1):
+    latencies = []
+    wrong = 0
+
+    def one(item):
+        document, expected = item
+        t0 = time.perf_counter()
+        result = extract(document)
+        return time.perf_counter() - t0, result == expected
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for latency, correct in pool.map(one, documents):
+            latencies.append(latency)
+            if not correct:
+                wrong += 1
+    elapsed = time.perf_counter() - started
+    summary = summarize(name, latencies, elapsed, wrong)
+    megabytes = sum(len(document) for document, _ in documents) / 1e6
+    print(f"   {megabytes / elapsed:.2f} MB/s  wrong: {wrong}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--documents', type=int, default=10, help='Bills per case')
+    parser.add_argument('--pages', type=int, default=100)
+    parser.add_argument('--lines-per-page', type=int, default=50)
+    parser.add_argument('--workers', type=int, default=0, help='Also run through a PdfExtractionPool of this many processes')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    from insurance.services.claim_extraction import extract_claim_data_from_pdf
+    from insurance.services.pdf_workers import PdfExtractionPool
+
+    pool = None
+    if args.workers:
+        pool = PdfExtractionPool(workers=args.workers, max_pages=args.pages, timeout=600)
+        # Start every worker before timing
+        with ThreadPoolExecutor(max_workers=args.workers) as warmup:
+            list(warmup.map(pool.extract, [bench_utils.make_pdf([['warm up']])] * args.workers))
+
+    rng = random.Random(args.seed)
+    for fields_on in ('first', 'last'):
+        documents = [make_bill(rng, args.pages, args.lines_per_page, fields_on) for _ in range(args.documents)]
+        size = sum(len(document) for document, _ in documents) / len(documents) / 1e6
+        print(f"== {args.documents} bills x {args.pages} pages ({size:.2f} MB each), fields on the {fields_on} page")
+        legacy = run('legacy (concatenate, two passes)', lambda document: legacy_extract(io.BytesIO(document)), documents)
+        current = run('extract_claim_data_from_pdf', lambda document: extract_claim_data_from_pdf(io.BytesIO(document)), documents)
+        if current['rate']:
+            print(f"   speedup: {current['rate'] / legacy['rate']:.1f}x")
+        if pool:
+            pooled = run(f'PdfExtractionPool ({args.workers} processes)', pool.extract, documents, args.workers)
+            print(f"   vs in-process: {pooled['rate'] / current['rate']:.1f}x")
+
+    if pool:
+        print(f"Pool stats: {pool.stats}")
+        pool.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark the claim and premium Storacha upload paths against the local stand-in.
+
+Usage (from backend/):
+    python benchmarks/bench_storacha.py --uploads 200 --concurrency 8 --latency-ms 50
+"""
+import argparse
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import bench_utils
+from bench_utils import summarize
+from insurance.services.storacha_standin import start_standin
+from insurance.services.storacha_node_service import StorachaNodeService
+
+
+def make_buyer(index):
+    return {
+        'id': str(uuid.uuid4()),
+        'full_name': f'Bench Buyer {index}',
+        'email': f'buyer{index}@bench.local',
+        'wallet_address': '0x' + uuid.uuid4().hex + uuid.uuid4().hex[:8],
+        'national_id': f'NID{index:09d}'
+    }
+
+
+def make_claim(index):
+    return {
+        'claim_id': f'CLM-BENCH-{index:08d}',
+        'amount': f'{1000 + index}.00',
+        'status': 'verified',
+        'description': 'Benchmark claim',
+        'created_at': '2025-01-01T00:00:00+00:00'
+    }
+
+
+def make_premium(index):
+    return {
+        'transaction_hash': '0x' + uuid.uuid4().hex * 2,
+        'amount_eth': '0.050000000000000000',
+        'block_timestamp': '2025-01-01T00:00:00+00:00',
+        'status': 'confirmed'
+    }
+
+
+def run_path(name, kind, payload, uploads, concurrency, service):
+    latencies = []
+    errors = 0
+
+    def one(index):
+        started = time.perf_counter()
+        # Same steps as StorachaNodeService.store_content, without the database bookkeeping
+        for _, cid, content in service.prepare_record_uploads(kind, make_buyer(index), payload(index)):
+            service.upload_content(cid, content)
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(one, i) for i in range(uploads)]
+        for future in futures:
+            try:
+                latencies.append(future.result())
+            except Exception:
+                errors += 1
+    return summarize(name, latencies, time.perf_counter() - started, errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--uploads', type=int, default=100, help='Uploads per path')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    server = start_standin(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        failure_rate=args.failure_rate,
+        seed=args.seed
+    )
+    os.environ['STORACHA_STANDIN_URL'] = server.url
+    print(f"Storacha stand-in at {server.url} "
+          f"(latency={args.latency_ms}ms jitter={args.jitter_ms}ms failure_rate={args.failure_rate})")
+
+    service = StorachaNodeService()
+    try:
+        run_path('upload_claim', 'claim', make_claim, args.uploads, args.concurrency, service)
+        run_path('upload_premium', 'premium', make_premium, args.uploads, args.concurrency, service)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+import math
+import os
+import sys
+import zlib
+
+# Make the backend package importable when running `python benchmarks/<script>.py`
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+
+def setup_django():
+    """
+    Configure Django the same way the backend test scripts do
+    """
+    import django
+    from dotenv import load_dotenv
+
+    load_dotenv(os.path.join(BACKEND_DIR, '.env'))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+    django.setup()
+
+
+def percentile(values, pct):
+    """
+    Nearest-rank percentile of a list of numbers
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(name, latencies, elapsed, errors=0):
+    """
+    Print throughput and latency percentiles (latencies in seconds)
+    """
+    count = len(latencies)
+    rate = count / elapsed if elapsed else 0.0
+    print(f"{name}")
+    print(f"   completed: {count}  errors: {errors}  elapsed: {elapsed:.2f}s")
+    print(f"   throughput: {rate:.1f}/s")
+    if latencies:
+        print(
+            f"   latency ms: p50={percentile(latencies, 50) * 1000:.1f} "
+            f"p90={percentile(latencies, 90) * 1000:.1f} "
+            f"p99={percentile(latencies, 99) * 1000:.1f} "
+            f"max={max(latencies) * 1000:.1f}"
+        )
+    return {'count': count, 'errors': errors, 'elapsed': elapsed, 'rate': rate}
+
+
+def pdf_escape(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def text_stream(lines, x=50, y=760, size=10, leading=12):
+    """
+    Page content that prints lines top to bottom (Helvetica)
+    """
+    shown = ' '.join(f"({pdf_escape(line)}) '" for line in lines)
+    return f'BT /F1 {size} Tf {x} {y} Td {leading} TL {shown} ET'.encode('latin-1')
+
+
+def write_pdf(pages, compress=False):
+    """
+    Assemble a PDF from a list of pages, each (content stream bytes, image or None).
+    An image is (width, height, 8-bit grey pixel bytes) and is available to the content
+    stream as /Im0; text uses /F1 (Helvetica). compress applies FlateDecode to every stream.
+    Returns the document bytes.
+    """
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        None,  # page tree, filled in once the page objects are numbered
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    ]
+
+    def stream(data, extra=b''):
+        if compress:
+            data = zlib.compress(data)
+            extra += b' /Filter /FlateDecode'
+        return b'<< /Length %d%s >>\nstream\n%s\nendstream' % (len(data), extra, data)
+
+    kids = []
+    for content, image in pages:
+        page_number = len(objects) + 1
+        kids.append(b'%d 0 R' % page_number)
+        resources = b'/Font << /F1 3 0 R >>'
+        if image is not None:
+            resources += b' /XObject << /Im0 %d 0 R >>' % (page_number + 2)
+        objects.append(
+            b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+            b'/Resources << %s >> /Contents %d 0 R >>' % (resources, page_number + 1)
+        )
+        objects.append(stream(content))
+        if image is not None:
+            width, height, pixels = image
+            objects.append(stream(
+                pixels,
+                b' /Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace /DeviceGray /BitsPerComponent 8' % (width, height)
+            ))
+    objects[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (b' '.join(kids), len(kids))
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+    xref = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    for offset in offsets:
+        out += b'%010d 00000 n \n' % offset
+    out += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def make_pdf(pages):
+    """
+    Build a minimal text-only PDF (Helvetica, one text line per entry) from a list of
+    pages, each a list of lines. Returns the document bytes.
+    """
+    return write_pdf([(text_stream(lines), None) for lines in pages])
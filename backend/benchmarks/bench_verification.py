@@ -0,0 +1,114 @@
+"""
+Benchmark claim verification (verify_transaction_id) end to end against the local billing stand-in.
+
+Usage (from backend/):
+    python benchmarks/bench_verification.py --lookups 2000 --concurrency 16 --latency-ms 20
+    python benchmarks/bench_verification.py --error-rate 0.05 --dead-primary
+"""
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import bench_utils
+from bench_utils import summarize
+
+
+def run_path(name, transaction_ids, dataset, concurrency, use_cache):
+    from insurance.services.billing import verify_transaction_id
+
+    latencies = []
+    counts = {'correct': 0, 'wrong': 0, 'unavailable': 0}
+
+    def one(transaction_id):
+        started = time.perf_counter()
+        result = verify_transaction_id(transaction_id, use_cache=use_cache)
+        return time.perf_counter() - started, transaction_id, result
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for latency, transaction_id, result in pool.map(one, transaction_ids):
+            latencies.append(latency)
+            if result.get('unavailable'):
+                counts['unavailable'] += 1
+            elif result.get('success', False) == (dataset.get(transaction_id) == 'paid'):
+                counts['correct'] += 1
+            else:
+                counts['wrong'] += 1
+    summary = summarize(name, latencies, time.perf_counter() - started, counts['unavailable'])
+    print(f"   correct: {counts['correct']}  wrong: {counts['wrong']}  unavailable: {counts['unavailable']}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lookups', type=int, default=1000, help='Verifications per path')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--paid', type=int, default=500, help='Paid transactions in the dataset')
+    parser.add_argument('--unpaid', type=int, default=100, help='Unpaid transactions in the dataset')
+    parser.add_argument('--unknown-rate', type=float, default=0.05, help='Fraction of lookups for IDs the API does not know')
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--dead-primary', action='store_true', help='List a closed port before the stand-in to measure failover')
+    parser.add_argument('--race', action='store_true', help='Race all healthy endpoints (BILLING_RACE)')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    from insurance.services.billing_standin import generate_dataset, start_billing_standin
+
+    dataset = generate_dataset(args.paid, args.unpaid, seed=args.seed)
+    server = start_billing_standin(
+        dataset=dataset,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        seed=args.seed
+    )
+    # The shared client reads these the first time it is used
+    urls = [server.url]
+    if args.dead_primary:
+        urls.insert(0, 'http://127.0.0.1:9')
+    os.environ['BILLING_API_URLS'] = ','.join(urls)
+    os.environ['BILLING_RACE'] = 'true' if args.race else 'false'
+    # A process-local cache, so runs start empty and leave nothing in the backend's file cache
+    os.environ['CACHE_BACKEND'] = 'locmem'
+    bench_utils.setup_django()
+
+    print(f"Billing stand-in at {server.url} with {len(dataset)} transactions "
+          f"(latency={args.latency_ms}ms jitter={args.jitter_ms}ms error_rate={args.error_rate} "
+          f"dead_primary={args.dead_primary} race={args.race})")
+
+    rng = random.Random(args.seed)
+    known = list(dataset)
+    transaction_ids = [
+        f'UNKNOWN{rng.randrange(10 ** 6):06d}' if rng.random() < args.unknown_rate else rng.choice(known)
+        for _ in range(args.lookups)
+    ]
+
+    from django.core.cache import cache
+
+    def clear_cached_results():
+        cache.delete_many([f'billing-verify:{transaction_id}' for transaction_id in set(transaction_ids)])
+
+    def run(name, use_cache):
+        requests_before = server.stats['requests']
+        run_path(name, transaction_ids, dataset, args.concurrency, use_cache)
+        print(f"   stand-in requests: {server.stats['requests'] - requests_before}")
+
+    try:
+        clear_cached_results()
+        run('verify (uncached)', use_cache=False)
+        # use_cache=False refreshes the cached results, so empty the cache again for a cold run
+        clear_cached_results()
+        run('verify (cache cold)', use_cache=True)
+        run('verify (cache warm)', use_cache=True)
+        print(f"Stand-in requests: {server.stats['requests']} (errors injected: {server.stats['errors']})")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
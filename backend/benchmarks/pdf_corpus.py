@@ -0,0 +1,252 @@
+"""
+Generate a synthetic corpus of hospital bill PDFs with known ground truth.
+
+Every document records the transaction ID and claim amount printed on it, so an
+extractor can be scored on what the bill says rather than on what an earlier
+extractor returned. Layouts (see LAYOUTS) cover short and long bills, compressed
+streams, scanned (image-only) pages and adversarial arrangements.
+
+Usage (from backend/):
+    python benchmarks/pdf_corpus.py --out /tmp/claim-corpus --count 200
+    python benchmarks/pdf_corpus.py --out /tmp/claim-corpus --count 50 --layouts standard,long_bill --max-pages 200
+"""
+import argparse
+import json
+import os
+import random
+
+from bench_utils import text_stream, write_pdf
+
+LINES_PER_PAGE = 55
+TRANSACTION_ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789'
+ITEMS = [
+    'Ward charges - general ward',
+    'Consultation fee, attending physician',
+    'Laboratory: complete blood count',
+    'Pharmacy: paracetamol 500mg x 20',
+    'Radiology: chest X-ray, two views',
+    'Nursing care, per day',
+    'Medical supplies and consumables',
+    'Physiotherapy session',
+]
+
+
+def _transaction_id(rng):
+    return ''.join(rng.choice(TRANSACTION_ALPHABET) for _ in range(8))
+
+
+def _amount(rng):
+    return round(rng.uniform(50, 50000), 2)
+
+
+def _items(rng, count, dollars=False):
+    """
+    Itemised charges; without dollars no line can match an amount pattern
+    """
+    lines = []
+    for _ in range(count):
+        price = f'{rng.randint(5, 2000)}.{rng.randint(0, 99):02d}'
+        lines.append(f'{rng.choice(ITEMS)}  ${price}' if dollars else f'{rng.choice(ITEMS)}  {price}')
+    return lines
+
+
+def _paginate(lines):
+    return [lines[start:start + LINES_PER_PAGE] for start in range(0, len(lines), LINES_PER_PAGE)] or [[]]
+
+
+def _header(rng):
+    return [
+        'City General Hospital',
+        '12 Harbour Road',
+        f'Invoice date: 2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}',
+    ]
+
+
+def _text_pdf(pages, compress=False):
+    return write_pdf([(text_stream(lines), None) for lines in pages], compress=compress)
+
+
+def standard(rng, pages):
+    """
+    Short bill, fields on the first page under the usual labels
+    """
+    transaction_id, amount = _transaction_id(rng), _amount(rng)
+    lines = _header(rng) + [f'Transaction ID: {transaction_id}', f'Claim Amount: ${amount:,.2f}', '']
+    lines += _items(rng, pages * LINES_PER_PAGE - len(lines))
+    return _text_pdf(_paginate(lines)), transaction_id, amount
+
+
+def label_variants(rng, pages):
+    """
+    Alternative labels hospitals use: TXN / Transaction, Total / Amount, with and without $ and commas
+    """
+    transaction_id, amount = _transaction_id(rng), _amount(rng)
+    id_line = rng.choice([f'TXN: {transaction_id}', f'Transaction: {transaction_id}', f'TRANSACTION ID {transaction_id}'])
+    amount_line = rng.choice([f'Total: ${amount:,.2f}', f'Amount: {amount:.2f}', f'TOTAL {amount:,.2f}'])
+    lines = _header(rng) + [id_line, amount_line, '']
+    lines += _items(rng, pages * LINES_PER_PAGE - len(lines))
+    return _text_pdf(_paginate(lines)), transaction_id, amount
+
+
+def long_bill(rng, pages):
+    """
+    Long itemised bill with the summary (and so both fields) on the last page
+    """
+    transaction_id, amount = _transaction_id(rng), _amount(rng)
+    lines = _header(rng) + _items(rng, (pages - 1) * LINES_PER_PAGE - 3)
+    lines += ['', 'Summary', f'Transaction ID: {transaction_id}', f'Total Amount: ${amount:,.2f}']
+    return _text_pdf(_paginate(lines)), transaction_id, amount
+
+
+def compressed(rng, pages):
+    """
+    Standard bill with FlateDecode content streams, as most PDF producers write them
+    """
+    transaction_id, amount = _transaction_id(rng), _amount(rng)
+    lines = _header(rng) + [f'Transaction ID: {transaction_id}', f'Amount: ${amount:,.2f}', '']
+    lines += _items(rng, pages * LINES_PER_PAGE - len(lines))
+    return _text_pdf(_paginate(lines), compress=True), transaction_id, amount
+
+
+def page_break(rng, pages):
+    """
+    Label at the foot of one page, value at the top of the next
+    """
+    pages = max(pages, 2)
+    transaction_id, amount = _transaction_id(rng), _amount(rng)
+    first = _header(rng) + _items(rng, LINES_PER_PAGE - 4) + ['Transaction ID:']
+    second = [transaction_id, f'Amount: ${amount:,.2f}'] + _items(rng, LINES_PER_PAGE - 2)
+    rest = _paginate(_items(rng, (pages - 2) * LINES_PER_PAGE)) if pages > 2 else []
+    return _text_pdf([first, second] + rest), transaction_id, amount
+
+
+def decoys(rng, pages):
+    """
+    Adversarial: other IDs and dollar figures printed before the real fields
+    """
+    transaction_id, amount = _transaction_id(rng), _amount(rng)
+    lines = _header(rng) + [
+        f'Patient ID: P-{rng.randint(1000, 9999)}',
+        f'Deposit paid: ${rng.randint(10, 500)}.00',
+        f'Amount of saline: {rng.randint(1, 5)} units',
+    ]
+    lines += _items(rng, 10, dollars=True)
+    lines += [f'Transaction ID: {transaction_id}', f'Total: ${amount:,.2f}', '']
+    lines += _items(rng, pages * LINES_PER_PAGE - len(lines), dollars=True)
+    return _text_pdf(_paginate(lines)), transaction_id, amount
+
+
+def two_column(rng, pages):
+    """
+    Adversarial: labels and values drawn as separate text objects, values first,
+    as form generators do; extraction order no longer matches reading order
+    """
+    transaction_id, amount = _transaction_id(rng), _amount(rng)
+    head = text_stream(_header(rng))
+    values = text_stream([transaction_id, f'${amount:,.2f}'], x=300, y=700)
+    labels = text_stream(['Transaction ID:', 'Amount:'], x=50, y=700)
+    items = text_stream(_items(rng, LINES_PER_PAGE - 10), y=660)
+    first = (head + b'\n' + values + b'\n' + labels + b'\n' + items, None)
+    rest = [(text_stream(lines), None) for lines in _paginate(_items(rng, (pages - 1) * LINES_PER_PAGE))] if pages > 1 else []
+    return write_pdf([first] + rest), transaction_id, amount
+
+
+def scanned(rng, pages):
+    """
+    Scanned bill: every page is an image with no text layer (needs OCR to read)
+    """
+    transaction_id, amount = _transaction_id(rng), _amount(rng)
+    width, height = 170, 220  # ~20 dpi greyscale, enough to make the page weigh something
+    drawn = b'q 612 0 0 792 0 0 cm /Im0 Do Q'
+    document = write_pdf(
+        [(drawn, (width, height, rng.getrandbits(width * height * 8).to_bytes(width * height, 'little')))
+         for _ in range(pages)],
+        compress=True
+    )
+    return document, transaction_id, amount
+
+
+# name -> (builder, page counts to draw from)
+LAYOUTS = {
+    'standard': (standard, [1, 1, 1, 2, 3]),
+    'label_variants': (label_variants, [1, 2]),
+    'long_bill': (long_bill, [20, 50, 100, 200]),
+    'compressed': (compressed, [1, 3, 10]),
+    'page_break': (page_break, [2, 3]),
+    'decoys': (decoys, [1, 2]),
+    'two_column': (two_column, [1, 2]),
+    'scanned': (scanned, [1, 2, 5]),
+}
+
+
+def generate_corpus(count, seed=None, layouts=None, max_pages=None):
+    """
+    Yield count documents, cycling through layouts:
+    {'name', 'layout', 'pages', 'size', 'data', 'expected': {'transaction_id', 'amount'}}
+    """
+    rng = random.Random(seed)
+    layouts = list(layouts or LAYOUTS)
+    for index in range(count):
+        layout = layouts[index % len(layouts)]
+        builder, page_counts = LAYOUTS[layout]
+        pages = rng.choice(page_counts)
+        if max_pages:
+            pages = min(pages, max_pages)
+        data, transaction_id, amount = builder(rng, pages)
+        yield {
+            'name': f'{index:05d}-{layout}.pdf',
+            'layout': layout,
+            'pages': pages,
+            'size': len(data),
+            'data': data,
+            'expected': {'transaction_id': transaction_id, 'amount': amount},
+        }
+
+
+def write_corpus(out_dir, documents):
+    """
+    Write the PDFs and a manifest.json with their ground truth; returns the manifest
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = []
+    for document in documents:
+        with open(os.path.join(out_dir, document['name']), 'wb') as pdf_file:
+            pdf_file.write(document['data'])
+        manifest.append({key: value for key, value in document.items() if key != 'data'})
+    with open(os.path.join(out_dir, 'manifest.json'), 'w') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+    return manifest
+
+
+def load_corpus(corpus_dir):
+    """
+    Documents of a corpus written by write_corpus, in the generate_corpus format
+    """
+    with open(os.path.join(corpus_dir, 'manifest.json')) as manifest_file:
+        manifest = json.load(manifest_file)
+    for entry in manifest:
+        with open(os.path.join(corpus_dir, entry['name']), 'rb') as pdf_file:
+            yield {**entry, 'data': pdf_file.read()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--out', required=True, help='Directory for the PDFs and manifest.json')
+    parser.add_argument('--count', type=int, default=200)
+    parser.add_argument('--layouts', help=f"Comma-separated subset of: {', '.join(LAYOUTS)}")
+    parser.add_argument('--max-pages', type=int, help='Cap on pages per document')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    layouts = args.layouts.split(',') if args.layouts else None
+    unknown = set(layouts or []) - set(LAYOUTS)
+    if unknown:
+        parser.error(f"Unknown layouts: {', '.join(sorted(unknown))}")
+
+    manifest = write_corpus(args.out, generate_corpus(args.count, args.seed, layouts, args.max_pages))
+    total = sum(entry['size'] for entry in manifest)
+    print(f"Wrote {len(manifest)} PDFs ({total / 1e6:.1f} MB) and manifest.json to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
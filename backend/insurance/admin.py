@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Buyer, Policy, Claim, HospitalTxnRecord, ClaimDoc, Premium, Admin
+from .models import Buyer, Policy, Claim, HospitalTxnRecord, ClaimDoc, Premium, Admin, StorachaUpload, ClaimJob
 
 @admin.register(Buyer)
 class BuyerAdmin(admin.ModelAdmin):
@@ -162,3 +162,22 @@ class AdminUserAdmin(admin.ModelAdmin):
 admin.site.site_header = "Health Insurance DApp Administration"
 admin.site.site_title = "Health Insurance Admin"
 admin.site.index_title = "Welcome to Health Insurance DApp Administration"
+
+@admin.register(StorachaUpload)
+class StorachaUploadAdmin(admin.ModelAdmin):
+    list_display = ('cid', 'kind', 'status', 'size', 'attempts', 'created_at', 'stored_at')
+    list_filter = ('kind', 'status', 'created_at')
+    search_fields = ('cid',)
+    readonly_fields = ('cid', 'kind', 'size', 'attempts', 'last_error', 'created_at', 'stored_at')
+    exclude = ('content',)
+
+
+@admin.register(ClaimJob)
+class ClaimJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'claim', 'stage', 'attempts', 'created_at', 'finished_at')
+    list_filter = ('stage', 'created_at')
+    search_fields = ('id', 'claim__claim_id')
+    readonly_fields = (
+        'id', 'claim', 'file_name', 'document_path', 'worker', 'attempts', 'error',
+        'created_at', 'updated_at', 'finished_at'
+    )
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class InsuranceConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "insurance"
+
+    def ready(self):
+        # Cache invalidation for buyer history
+        from . import signals  # noqa: F401
@@ -0,0 +1,64 @@
+import time
+
+from django.core.cache import cache
+
+# Each wallet has a version number that is bumped on every change, once the change
+# has committed. Cached payloads are stored under the version they were built from,
+# so an entry built while a save was in flight is never served after that save.
+
+
+def _version_key(wallet_address):
+    return f'buyer-history-version:{wallet_address}'
+
+
+def _new_version():
+    # Time based, so a version key evicted from the cache never comes back with an old number
+    return int(time.time() * 1000)
+
+
+def buyer_history_version(wallet_address):
+    version = cache.get(_version_key(wallet_address))
+    if version is None:
+        version = _new_version()
+        if not cache.add(_version_key(wallet_address), version, None):
+            version = cache.get(_version_key(wallet_address), version)
+    return version
+
+
+def buyer_history_cache_key(wallet_address, version):
+    return f'buyer-history:{wallet_address}:{version}'
+
+
+def invalidate_buyer_history(wallet_address):
+    """
+    Make any cached history for this wallet stale
+    Call after changes that bypass model signals (queryset.update(), bulk_update())
+    """
+    try:
+        cache.incr(_version_key(wallet_address))
+    except ValueError:
+        cache.set(_version_key(wallet_address), _new_version(), None)
+
+
+# Admin dashboard figures (insurance/stats.py); ADMIN_STATS_CACHE_TIMEOUT bounds how stale
+# they get if a change slips past invalidation, e.g. a rebuild racing a commit
+ADMIN_STATS_KEY = 'admin-stats'
+
+
+def invalidate_admin_stats():
+    """
+    Drop the cached dashboard figures
+    Call after changes that bypass model signals, like invalidate_buyer_history
+    """
+    cache.delete(ADMIN_STATS_KEY)
+
+
+def buyer_etag(resource, wallet_address, version=None):
+    """
+    Version tag for a per-wallet resource (history, claims, premiums)
+    Changes whenever the buyer or any of their claims or premiums is saved;
+    pass version when the caller already read it for a cache key
+    """
+    if version is None:
+        version = buyer_history_version(wallet_address)
+    return f'"{resource}-{version}"'
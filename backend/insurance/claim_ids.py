@@ -0,0 +1,81 @@
+import os
+import secrets
+import threading
+import time
+from datetime import datetime, timezone
+
+# Claim IDs look like CLM-20250101120000123-01HZX3K8Q2M4V7T9: the UTC time of
+# creation to the millisecond, then 80 bits in Crockford base32 (ULID style).
+# Both parts are fixed width, so IDs sort by creation time as plain strings,
+# after the older CLM-<second> IDs of the same second.
+#
+# Within a process IDs are strictly increasing: an ID in the same millisecond as
+# the previous one (or after the clock stepped back) reuses its time and adds
+# one to its random part. Across processes and hosts, uniqueness rests on the
+# random part: a clash needs two IDs in the same millisecond drawing the same
+# 80 bits, or one of the neighbouring values they count up through.
+
+PREFIX = 'CLM-'
+RANDOM_BITS = 80
+_RANDOM_CHARS = RANDOM_BITS // 5
+_CROCKFORD = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+
+_lock = threading.Lock()
+_last_ms = 0
+_last_random = 0
+
+
+def _reset_after_fork():
+    # A forked worker must not continue the parent's sequence within the same millisecond
+    global _lock, _last_ms, _last_random
+    _lock = threading.Lock()
+    _last_ms = 0
+    _last_random = 0
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _encode(value):
+    chars = []
+    for _ in range(_RANDOM_CHARS):
+        value, digit = divmod(value, 32)
+        chars.append(_CROCKFORD[digit])
+    return ''.join(reversed(chars))
+
+
+def _format(ms, random_part):
+    seconds, millis = divmod(ms, 1000)
+    stamp = datetime.fromtimestamp(seconds, tz=timezone.utc).strftime('%Y%m%d%H%M%S')
+    return f'{PREFIX}{stamp}{millis:03d}-{_encode(random_part)}'
+
+
+def _next(now_ms):
+    global _last_ms, _last_random
+    if now_ms > _last_ms:
+        _last_ms, _last_random = now_ms, secrets.randbits(RANDOM_BITS)
+    else:
+        _last_random += 1
+        if _last_random >> RANDOM_BITS:
+            # Random part exhausted within one millisecond: borrow the next one
+            _last_ms, _last_random = _last_ms + 1, secrets.randbits(RANDOM_BITS)
+    return _format(_last_ms, _last_random)
+
+
+def new_claim_id():
+    """
+    A unique claim ID that sorts after every ID this process issued before
+    """
+    now_ms = time.time_ns() // 1_000_000
+    with _lock:
+        return _next(now_ms)
+
+
+def new_claim_ids(count):
+    """
+    count unique, increasing claim IDs, e.g. for a batch created in one statement
+    """
+    now_ms = time.time_ns() // 1_000_000
+    with _lock:
+        return [_next(now_ms) for _ in range(count)]
@@ -136,34 +136,19 @@ def handle_premium_paid(event):
             
             # Upload premium data to Storacha
             try:
-                from .services.storacha_node_service import StorachaNodeService
+                from .services.storacha_node_service import (
+                    StorachaNodeService, buyer_upload_data, premium_upload_data
+                )
                 storacha_service = StorachaNodeService()
                 
-                # Prepare buyer data
-                buyer_data = {
-                    'id': str(buyer.id),
-                    'full_name': buyer.full_name,
-                    'email': buyer.email,
-                    'wallet_address': buyer.wallet_address,
-                    'national_id': buyer.national_id
-                }
-                
-                # Prepare premium data
-                premium_data = {
-                    'transaction_hash': premium.transaction_hash,
-                    'amount_eth': str(premium.amount_eth),
-                    'block_timestamp': premium.block_timestamp.isoformat(),
-                    'status': premium.status
-                }
-                
-                # Upload to Storacha
-                cid = storacha_service.upload_premium_data(buyer_data, premium_data)
+                # CID is computed locally; the upload itself runs in the background
+                cid = storacha_service.queue_premium_upload(buyer_upload_data(buyer), premium_upload_data(premium))
                 
                 # Save CID to premium
                 premium.storacha_cid = cid
                 premium.save(update_fields=['storacha_cid'])
                 
-                print(f"[PREMIUM EVENT] Premium data uploaded to Storacha with CID: {cid}")
+                print(f"[PREMIUM EVENT] Premium data queued for Storacha with CID: {cid}")
             except Exception as e:
                 print(f"[PREMIUM EVENT] Error uploading premium to Storacha: {str(e)}")
         else:
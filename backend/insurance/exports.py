@@ -0,0 +1,101 @@
+import csv
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+# Output columns -> queryset .values() lookups (buyer fields come from a join, not extra queries)
+CLAIM_EXPORT_FIELDS = [
+    ('claim_id', 'claim_id'),
+    ('claim_status', 'claim_status'),
+    ('claim_amount', 'claim_amount'),
+    ('claim_description', 'claim_description'),
+    ('hospital_transaction_id', 'hospital_transaction_id'),
+    ('storacha_cid', 'storacha_cid'),
+    ('created_at', 'created_at'),
+    ('verified_at', 'verified_at'),
+    ('accepted_at', 'accepted_at'),
+    ('buyer_id', 'buyer_id'),
+    ('buyer_wallet_address', 'buyer__wallet_address'),
+    ('buyer_full_name', 'buyer__full_name'),
+    ('buyer_email', 'buyer__email'),
+    ('buyer_national_id', 'buyer__national_id'),
+]
+
+PREMIUM_EXPORT_FIELDS = [
+    ('id', 'id'),
+    ('transaction_hash', 'transaction_hash'),
+    ('amount_eth', 'amount_eth'),
+    ('amount_wei', 'amount_wei'),
+    ('block_number', 'block_number'),
+    ('block_timestamp', 'block_timestamp'),
+    ('gas_used', 'gas_used'),
+    ('gas_price', 'gas_price'),
+    ('status', 'status'),
+    ('storacha_cid', 'storacha_cid'),
+    ('created_at', 'created_at'),
+    ('buyer_id', 'buyer_id'),
+    ('buyer_wallet_address', 'buyer__wallet_address'),
+    ('buyer_full_name', 'buyer__full_name'),
+    ('buyer_email', 'buyer__email'),
+    ('buyer_national_id', 'buyer__national_id'),
+]
+
+
+class _Echo:
+    """
+    File-like object whose write() returns the value, so csv.writer can format single rows
+    """
+
+    def write(self, value):
+        return value
+
+
+_json_default = DjangoJSONEncoder().default
+
+
+def _export_value(value):
+    # Same text form as the NDJSON export (ISO datetimes, plain decimals and UUIDs)
+    if value is None:
+        return ''
+    if isinstance(value, (int, float, str)):
+        return value
+    return _json_default(value)
+
+
+def stream_rows(queryset, fields, export_format):
+    """
+    Yield an export of queryset in NDJSON or CSV.
+
+    Rows are read through .iterator() (a server-side cursor on PostgreSQL) in chunks of
+    EXPORT_CHUNK_SIZE and sent in ~64 KiB pieces, so memory stays constant whatever
+    the row count and the first bytes go out as soon as the first chunk arrives.
+    """
+    names = [name for name, _ in fields]
+    lookups = [lookup for _, lookup in fields]
+    rows = queryset.values_list(*lookups).iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+
+    if export_format == 'csv':
+        writer = csv.writer(_Echo())
+        encode = lambda row: writer.writerow([_export_value(value) for value in row])
+        buffer = [writer.writerow(names)]
+    else:
+        encoder = DjangoJSONEncoder(separators=(',', ':'))
+        encode = lambda row: encoder.encode(dict(zip(names, row))) + '\n'
+        buffer = []
+
+    size = sum(len(line) for line in buffer)
+    for row in rows:
+        line = encode(row)
+        buffer.append(line)
+        size += len(line)
+        if size >= 64 * 1024:
+            yield ''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield ''.join(buffer)
@@ -0,0 +1,126 @@
+from datetime import datetime, time, timedelta
+from decimal import Decimal, InvalidOperation
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import Claim, Premium
+
+CLAIM_STATUSES = {choice for choice, _ in Claim.STATUS_CHOICES}
+PREMIUM_STATUSES = {choice for choice, _ in Premium.STATUS_CHOICES}
+
+
+def _parse_bound(value, name, end_of_day=False):
+    """
+    Parse an ISO date or datetime query parameter into an aware datetime.
+    A bare date used as an upper bound means the start of the following day.
+    """
+    # Dates first: parse_datetime also accepts a bare date (as midnight)
+    try:
+        day = parse_date(value)
+        parsed = None if day else parse_datetime(value)
+    except ValueError:
+        day = parsed = None
+    if day is not None:
+        if end_of_day:
+            day += timedelta(days=1)
+        parsed = datetime.combine(day, time.min)
+    elif parsed is None:
+        raise ValueError(f'{name} must be an ISO date or datetime')
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def _is_date(value):
+    try:
+        return parse_date(value) is not None
+    except ValueError:
+        return False
+
+
+def _parse_amount(value, name):
+    try:
+        amount = Decimal(value)
+    except InvalidOperation:
+        amount = None
+    if amount is None or not amount.is_finite():
+        raise ValueError(f'{name} must be a number')
+    return amount
+
+
+def _filter_statuses(queryset, field, value, allowed):
+    statuses = [status.strip() for status in value.split(',') if status.strip()]
+    unknown = set(statuses) - allowed
+    if unknown:
+        raise ValueError(f"Invalid status: {', '.join(sorted(unknown))}")
+    if len(statuses) == 1:
+        return queryset.filter(**{field: statuses[0]})
+    return queryset.filter(**{f'{field}__in': statuses})
+
+
+def _filter_created(queryset, params):
+    created_from = params.get('created_from')
+    if created_from:
+        queryset = queryset.filter(created_at__gte=_parse_bound(created_from, 'created_from'))
+
+    created_to = params.get('created_to')
+    if created_to:
+        if _is_date(created_to):
+            queryset = queryset.filter(created_at__lt=_parse_bound(created_to, 'created_to', end_of_day=True))
+        else:
+            queryset = queryset.filter(created_at__lte=_parse_bound(created_to, 'created_to'))
+    return queryset
+
+
+def filter_claims(queryset, params):
+    """
+    Apply admin claim filters from query parameters, all evaluated in the database:
+
+    - status: one status or a comma-separated list      (claim_status, created_at, id) index
+    - buyer: buyer wallet address                       (buyer, created_at, id) index
+    - created_from / created_to: ISO date or datetime   created_to dates are inclusive
+    - min_amount / max_amount: claim amount range
+    - hospital_transaction_id: exact match              hospital_transaction_id index
+
+    Raises ValueError for invalid values.
+    """
+    statuses = params.get('status')
+    if statuses:
+        queryset = _filter_statuses(queryset, 'claim_status', statuses, CLAIM_STATUSES)
+
+    buyer = params.get('buyer')
+    if buyer:
+        queryset = queryset.filter(buyer__wallet_address=buyer)
+
+    queryset = _filter_created(queryset, params)
+
+    min_amount = params.get('min_amount')
+    if min_amount:
+        queryset = queryset.filter(claim_amount__gte=_parse_amount(min_amount, 'min_amount'))
+
+    max_amount = params.get('max_amount')
+    if max_amount:
+        queryset = queryset.filter(claim_amount__lte=_parse_amount(max_amount, 'max_amount'))
+
+    hospital_transaction_id = params.get('hospital_transaction_id')
+    if hospital_transaction_id:
+        queryset = queryset.filter(hospital_transaction_id=hospital_transaction_id)
+
+    return queryset
+
+
+def filter_premiums(queryset, params):
+    """
+    Premium filters for exports: status (comma-separated), buyer (wallet address),
+    created_from / created_to (ISO date or datetime). Raises ValueError for invalid values.
+    """
+    statuses = params.get('status')
+    if statuses:
+        queryset = _filter_statuses(queryset, 'status', statuses, PREMIUM_STATUSES)
+
+    buyer = params.get('buyer')
+    if buyer:
+        queryset = queryset.filter(buyer__wallet_address=buyer)
+
+    return _filter_created(queryset, params)
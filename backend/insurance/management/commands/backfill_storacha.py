@@ -0,0 +1,178 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from insurance.caching import invalidate_buyer_history
+from insurance.models import Claim, Premium
+from insurance.services.circuit_breaker import CircuitOpenError
+from insurance.services.storacha_node_service import (
+    StorachaNodeService, buyer_upload_data, claim_upload_data, premium_upload_data
+)
+
+
+# name -> (model, payload builder, service upload method)
+TARGETS = {
+    'claims': (Claim, claim_upload_data, 'upload_claim_data'),
+    'premiums': (Premium, premium_upload_data, 'upload_premium_data'),
+}
+
+
+class Command(BaseCommand):
+    help = 'Upload claims and premiums that have no Storacha CID yet (resumable, concurrent)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--only', choices=sorted(TARGETS), help='Backfill only claims or only premiums')
+        parser.add_argument('--batch-size', type=int, default=200, help='Rows fetched per query and per checkpoint')
+        parser.add_argument('--concurrency', type=int, default=4, help='Uploads running at the same time')
+        parser.add_argument('--limit', type=int, default=None, help='Stop after this many rows per model')
+        parser.add_argument(
+            '--checkpoint',
+            type=str,
+            default=os.path.join(settings.BASE_DIR, '.storacha_backfill.json'),
+            help='File recording the last processed row so an interrupted run can resume'
+        )
+        parser.add_argument('--reset', action='store_true', help='Ignore the checkpoint and start from the oldest row')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1 or options['concurrency'] < 1:
+            raise CommandError('--batch-size and --concurrency must be at least 1')
+
+        self.service = StorachaNodeService()
+        self.checkpoint_path = options['checkpoint']
+        self.checkpoint = {} if options['reset'] else self._load_checkpoint()
+
+        names = [options['only']] if options['only'] else sorted(TARGETS)
+        with ThreadPoolExecutor(max_workers=options['concurrency'], thread_name_prefix='storacha-backfill') as pool:
+            for name in names:
+                try:
+                    self._backfill(name, pool, options['batch_size'], options['limit'])
+                except CircuitOpenError as e:
+                    self.stdout.write(self.style.ERROR(f'Storacha unavailable, stopping: {str(e)}'))
+                    self.stdout.write('Progress is checkpointed; run the command again to resume')
+                    return
+
+        self.stdout.write(self.style.SUCCESS('Storacha backfill completed!'))
+
+    def _load_checkpoint(self):
+        try:
+            with open(self.checkpoint_path) as checkpoint_file:
+                return json.load(checkpoint_file)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            raise CommandError(f'Checkpoint file {self.checkpoint_path} is corrupt; use --reset')
+
+    def _save_checkpoint(self):
+        # Write then rename so a crash never leaves a half-written checkpoint
+        temp_path = f'{self.checkpoint_path}.tmp'
+        with open(temp_path, 'w') as checkpoint_file:
+            json.dump(self.checkpoint, checkpoint_file, indent=2)
+        os.replace(temp_path, self.checkpoint_path)
+
+    def _pending_batches(self, model, position, batch_size):
+        """
+        Yield batches of rows without a CID in (created_at, id) order, starting after
+        the checkpointed row. Each batch is its own keyset query, so memory stays flat
+        and no cursor is held open while uploads write back to the table.
+        """
+        queryset = model.objects.filter(storacha_cid='').select_related('buyer').order_by('created_at', 'id')
+        while True:
+            page = queryset
+            if position:
+                page = page.filter(
+                    Q(created_at__gt=position['created_at']) |
+                    Q(created_at=position['created_at'], id__gt=position['id'])
+                )
+            batch = list(page[:batch_size])
+            if not batch:
+                return
+            yield batch
+            position = {'created_at': batch[-1].created_at, 'id': batch[-1].pk}
+
+    @staticmethod
+    def _position(row):
+        return {'created_at': row.created_at.isoformat(), 'id': str(row.pk)}
+
+    def _upload_row(self, upload, build_payload, row):
+        try:
+            cid = upload(buyer_upload_data(row.buyer), build_payload(row))
+            # Update only the CID column so concurrent edits to the row are not overwritten
+            type(row).objects.filter(pk=row.pk, storacha_cid='').update(storacha_cid=cid)
+            # update() skips post_save, so cached buyer views are invalidated here
+            invalidate_buyer_history(row.buyer.wallet_address)
+            return cid
+        finally:
+            close_old_connections()
+
+    def _backfill(self, name, pool, batch_size, limit):
+        model, build_payload, method = TARGETS[name]
+        upload = getattr(self.service, method)
+        state = self.checkpoint.setdefault(name, {'position': None, 'uploaded': 0, 'failed': 0})
+
+        self.stdout.write(f'Backfilling {name}...')
+        started = time.perf_counter()
+        processed = uploaded = failed = 0
+
+        position = state['position']
+        if position:
+            position = {'created_at': parse_datetime(position['created_at']), 'id': position['id']}
+
+        # Set once a row fails: the checkpoint then stays just before that row, so the next
+        # run retries it (rows uploaded after it have a CID by then and are not read again)
+        held = False
+        for batch in self._pending_batches(model, position, batch_size):
+            if limit:
+                batch = batch[:limit - processed]
+            processed += len(batch)
+
+            futures = [(row, pool.submit(self._upload_row, upload, build_payload, row)) for row in batch]
+            batch_uploaded = batch_failed = 0
+            circuit_error = None
+            previous = state['position']
+            for row, future in futures:
+                try:
+                    future.result()
+                    batch_uploaded += 1
+                except CircuitOpenError as e:
+                    circuit_error = e
+                except Exception as e:
+                    batch_failed += 1
+                    self.stderr.write(f'Failed to upload {model.__name__} {row.pk}: {str(e)}')
+                    if not held:
+                        state['position'] = previous
+                        held = True
+                previous = self._position(row)
+            uploaded += batch_uploaded
+            failed += batch_failed
+            state['uploaded'] += batch_uploaded
+            state['failed'] += batch_failed
+
+            if circuit_error:
+                # Leave the position before this batch so rejected rows are retried on resume
+                self._save_checkpoint()
+                raise circuit_error
+
+            if not held:
+                state['position'] = self._position(batch[-1])
+            self._save_checkpoint()
+
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f'  {name}: {processed} processed, {uploaded} uploaded, {failed} failed '
+                f'({processed / elapsed if elapsed else 0:.1f} rows/s)'
+            )
+            if limit and processed >= limit:
+                break
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'{name}: {uploaded} uploaded, {failed} failed in {elapsed:.1f}s '
+            f'({uploaded / elapsed if elapsed else 0:.1f} uploads/s)'
+        ))
@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from insurance.models import ClaimJob
+from insurance.services.claim_pipeline import UNFINISHED_STAGES, resumable_jobs, resume_pending_jobs
+
+
+class Command(BaseCommand):
+    help = (
+        'Run claim jobs left unfinished (e.g. after a server restart) and wait for them. '
+        'Jobs another live process is running are left alone; run this periodically to pick up '
+        'jobs whose process died (their lease lapses CLAIM_JOB_LEASE_SECONDS after their last update)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=500, help='Maximum number of jobs to resume')
+        parser.add_argument('--timeout', type=float, default=600, help='Seconds to wait for the jobs to finish')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        job_ids = list(resumable_jobs().order_by('created_at').values_list('id', flat=True)[:options['limit']])
+        if not job_ids:
+            self.stdout.write(self.style.SUCCESS('No unfinished claim jobs'))
+            return
+
+        queued = resume_pending_jobs(limit=options['limit'])
+        self.stdout.write(f'Resumed {queued} claim job(s)')
+
+        remaining = len(job_ids)
+        while remaining and time.monotonic() - started < options['timeout']:
+            time.sleep(1)
+            remaining = ClaimJob.objects.filter(pk__in=job_ids, stage__in=UNFINISHED_STAGES).count()
+
+        counts = {
+            stage: ClaimJob.objects.filter(pk__in=job_ids, stage=stage).count()
+            for stage in ('completed', 'failed')
+        }
+        message = f"{counts['completed']} completed, {counts['failed']} failed, {remaining} still running"
+        if remaining:
+            self.stdout.write(self.style.WARNING(message))
+        else:
+            self.stdout.write(self.style.SUCCESS(message))
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+
+from insurance.models import StorachaUpload
+from insurance.services.circuit_breaker import CircuitOpenError
+from insurance.services.storacha_node_service import StorachaNodeService
+
+
+class Command(BaseCommand):
+    help = (
+        'Upload pending and failed Storacha records that still have their content. '
+        'Web processes retry their own deferred uploads once the circuit recovers; run this '
+        'periodically (e.g. from cron) for uploads left by processes that have since stopped'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=500, help='Maximum number of uploads to retry')
+
+    def handle(self, *args, **options):
+        service = StorachaNodeService()
+        cids = list(
+            StorachaUpload.objects.filter(status__in=['pending', 'failed'], content__isnull=False)
+            .order_by('created_at').values_list('cid', flat=True)[:options['limit']]
+        )
+        if not cids:
+            self.stdout.write(self.style.SUCCESS('No Storacha uploads to retry'))
+            return
+
+        stored = failed = skipped = 0
+        for cid in cids:
+            # Read one row at a time so only one record's content is in memory
+            upload = StorachaUpload.objects.filter(cid=cid, content__isnull=False).exclude(status='stored').first()
+            if upload is None:
+                # Stored by another process in the meantime
+                skipped += 1
+                continue
+            try:
+                service.store_content(upload.kind, upload.cid, bytes(upload.content))
+                stored += 1
+            except CircuitOpenError as e:
+                self.stdout.write(self.style.WARNING(f'Stopping, {str(e)}'))
+                break
+            except Exception as e:
+                failed += 1
+                self.stdout.write(f'  {cid}: {str(e)}')
+
+        remaining = len(cids) - stored - failed - skipped
+        message = f'{stored} stored, {failed} failed, {remaining} not attempted'
+        if failed or remaining:
+            self.stdout.write(self.style.WARNING(message))
+        else:
+            self.stdout.write(self.style.SUCCESS(message))
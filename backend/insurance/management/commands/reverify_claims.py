@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from insurance.services.reverification import (
+    DEFAULT_BATCH_SIZE, DEFAULT_CONCURRENCY, reverify_unverified_claims
+)
+
+
+class Command(BaseCommand):
+    help = 'Re-check unverified claims against the billing API (e.g. after an outage)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Claims per query and per bulk_update')
+        parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help='Verification calls running at the same time')
+        parser.add_argument('--limit', type=int, default=None, help='Stop after this many claims')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1 or options['concurrency'] < 1:
+            raise CommandError('--batch-size and --concurrency must be at least 1')
+
+        self.stdout.write('Re-verifying unverified claims...')
+        result = reverify_unverified_claims(
+            batch_size=options['batch_size'],
+            concurrency=options['concurrency'],
+            limit=options['limit'],
+            progress=lambda totals: self.stdout.write(
+                f"  {totals['processed']} processed, {totals['verified']} verified, "
+                f"{totals['still_unverified']} still unverified ({totals['claims_per_second']} claims/s)"
+            )
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"{result['verified']} of {result['processed']} claims verified in "
+            f"{result['elapsed_seconds']:.1f}s ({result['claims_per_second']} claims/s)"
+        ))
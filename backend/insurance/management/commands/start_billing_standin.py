@@ -0,0 +1,59 @@
+import json
+
+from django.core.management.base import BaseCommand
+from insurance.services.billing_standin import BillingStandinServer, generate_dataset, load_dataset
+
+class Command(BaseCommand):
+    help = 'Start a local billing API stand-in (verify-transaction endpoint) for testing and benchmarks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', type=str, default='127.0.0.1', help='Interface to bind')
+        parser.add_argument('--port', type=int, default=8080, help='Port to listen on')
+        parser.add_argument('--dataset', type=str, default=None, help='JSON file: {"paid": [ids], "unpaid": [ids]} or {id: status}')
+        parser.add_argument('--paid', type=int, default=1000, help='Generated paid transactions (without --dataset)')
+        parser.add_argument('--unpaid', type=int, default=100, help='Generated unpaid transactions (without --dataset)')
+        parser.add_argument('--write-dataset', type=str, default=None, help='Save the dataset in use to this file')
+        parser.add_argument('--latency-ms', type=float, default=0, help='Fixed latency added to every request')
+        parser.add_argument('--jitter-ms', type=float, default=0, help='Random extra latency (uniform 0..jitter)')
+        parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with 500 (0-1)')
+        parser.add_argument('--seed', type=int, default=None, help='Random seed for the dataset and fault injection')
+
+    def handle(self, *args, **options):
+        if options['dataset']:
+            dataset = load_dataset(options['dataset'])
+        else:
+            dataset = generate_dataset(options['paid'], options['unpaid'], seed=options['seed'])
+
+        if options['write_dataset']:
+            with open(options['write_dataset'], 'w') as dataset_file:
+                json.dump({
+                    status: [transaction_id for transaction_id, value in dataset.items() if value == status]
+                    for status in ('paid', 'unpaid')
+                }, dataset_file, indent=2)
+
+        server = BillingStandinServer(
+            (options['host'], options['port']),
+            dataset=dataset,
+            latency_ms=options['latency_ms'],
+            jitter_ms=options['jitter_ms'],
+            error_rate=options['error_rate'],
+            seed=options['seed']
+        )
+
+        paid = [transaction_id for transaction_id, status in dataset.items() if status == 'paid']
+        self.stdout.write(
+            self.style.SUCCESS(f'Billing stand-in listening on {server.url} ({len(dataset)} transactions, {len(paid)} paid)')
+        )
+        if paid:
+            self.stdout.write(f'Example paid transaction ID: {paid[0]}')
+        self.stdout.write(
+            f'Set BILLING_API_URLS={server.url} to route claim verification here'
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            self.stdout.write(
+                self.style.WARNING('Billing stand-in stopped by user')
+            )
+        finally:
+            server.server_close()
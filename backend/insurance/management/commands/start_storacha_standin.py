@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from insurance.services.storacha_standin import StorachaStandinServer
+
+class Command(BaseCommand):
+    help = 'Start a local Storacha stand-in (upload service + gateway) for testing and benchmarks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', type=str, default='127.0.0.1', help='Interface to bind')
+        parser.add_argument('--port', type=int, default=8787, help='Port to listen on')
+        parser.add_argument('--latency-ms', type=float, default=0, help='Fixed latency added to every request')
+        parser.add_argument('--jitter-ms', type=float, default=0, help='Random extra latency (uniform 0..jitter)')
+        parser.add_argument('--failure-rate', type=float, default=0.0, help='Fraction of requests that fail (0-1)')
+        parser.add_argument('--seed', type=int, default=None, help='Random seed for reproducible fault injection')
+
+    def handle(self, *args, **options):
+        server = StorachaStandinServer(
+            (options['host'], options['port']),
+            latency_ms=options['latency_ms'],
+            jitter_ms=options['jitter_ms'],
+            failure_rate=options['failure_rate'],
+            seed=options['seed']
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Storacha stand-in listening on {server.url}')
+        )
+        self.stdout.write(
+            f'Set STORACHA_STANDIN_URL={server.url} to route backend uploads here'
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            self.stdout.write(
+                self.style.WARNING('Storacha stand-in stopped by user')
+            )
+        finally:
+            server.server_close()
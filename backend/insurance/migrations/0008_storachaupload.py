@@ -0,0 +1,25 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('insurance', '0007_claim_storacha_cid_premium_storacha_cid'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StorachaUpload',
+            fields=[
+                ('cid', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('kind', models.CharField(max_length=20)),
+                ('content', models.BinaryField(blank=True, null=True)),
+                ('size', models.IntegerField(default=0)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('stored', 'Stored'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('attempts', models.IntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('stored_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
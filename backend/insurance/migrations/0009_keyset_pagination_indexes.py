@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('insurance', '0008_storachaupload'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='claim',
+            index=models.Index(fields=['created_at', 'id'], name='claim_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='buyer',
+            index=models.Index(fields=['created_at', 'id'], name='buyer_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('insurance', '0010_claim_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClaimJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('stage', models.CharField(choices=[('queued', 'Queued'), ('extracting', 'Extracting'), ('verifying', 'Verifying'), ('uploading', 'Uploading'), ('completed', 'Completed'), ('failed', 'Failed')], default='queued', max_length=20)),
+                ('document', models.BinaryField(blank=True, null=True)),
+                ('file_name', models.CharField(blank=True, max_length=255)),
+                ('attempts', models.IntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('claim', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='jobs', to='insurance.claim')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['stage', 'created_at'], name='claimjob_stage_created_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('insurance', '0011_claimjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='claim',
+            name='document_hash',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddConstraint(
+            model_name='claim',
+            constraint=models.UniqueConstraint(condition=models.Q(('document_hash', ''), _negated=True), fields=('buyer', 'document_hash'), name='claim_buyer_document_uniq'),
+        ),
+    ]
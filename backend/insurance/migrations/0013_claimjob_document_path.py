@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('insurance', '0012_claim_document_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='claimjob',
+            name='document_path',
+            field=models.CharField(blank=True, max_length=500),
+        ),
+    ]
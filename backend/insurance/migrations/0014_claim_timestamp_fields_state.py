@@ -0,0 +1,50 @@
+from django.db import migrations, models
+
+# 0006 skipped adding accepted_at and verified_at because they already existed in the
+# deployed database, so a fresh database (including the test database) never got them.
+# Record them in the migration state, and create the columns only where they are missing.
+
+TIMESTAMP_FIELDS = ('accepted_at', 'verified_at')
+
+
+def add_missing_columns(apps, schema_editor):
+    Claim = apps.get_model('insurance', 'Claim')
+    table = Claim._meta.db_table
+    with schema_editor.connection.cursor() as cursor:
+        columns = {
+            column.name for column in schema_editor.connection.introspection.get_table_description(cursor, table)
+        }
+    for name in TIMESTAMP_FIELDS:
+        if name not in columns:
+            schema_editor.add_field(Claim, Claim._meta.get_field(name))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('insurance', '0013_claimjob_document_path'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddField(
+                    model_name='claim',
+                    name='accepted_at',
+                    field=models.DateTimeField(blank=True, null=True),
+                ),
+                migrations.AddField(
+                    model_name='claim',
+                    name='verified_at',
+                    field=models.DateTimeField(blank=True, null=True),
+                ),
+            ],
+        ),
+        # Runs against the state above, so the historical model has both fields
+        migrations.RunPython(add_missing_columns, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='claim',
+            name='claim_status',
+            field=models.CharField(choices=[('submitted', 'Submitted'), ('verified', 'Verified'), ('unverified', 'Unverified'), ('accepted', 'Accepted'), ('not_approved', 'Not Approved'), ('rejected', 'Rejected'), ('paid', 'Paid'), ('cancelled', 'Cancelled')], default='submitted', max_length=50),
+        ),
+    ]
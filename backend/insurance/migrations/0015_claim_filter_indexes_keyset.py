@@ -0,0 +1,28 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('insurance', '0014_claim_timestamp_fields_state'),
+    ]
+
+    # The new indexes are built before the old ones are dropped, so the filters always have one
+    operations = [
+        migrations.AddIndex(
+            model_name='claim',
+            index=models.Index(fields=['claim_status', 'created_at', 'id'], name='claim_status_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='claim',
+            index=models.Index(fields=['buyer', 'created_at', 'id'], name='claim_buyer_created_id_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='claim',
+            name='claim_status_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='claim',
+            name='claim_buyer_created_idx',
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('insurance', '0015_claim_filter_indexes_keyset'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='claimjob',
+            name='worker',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
@@ -0,0 +1,36 @@
+import os
+
+from django.conf import settings
+from django.db import migrations
+
+
+def spool_documents(apps, schema_editor):
+    """
+    Write PDFs still stored in ClaimJob.document to CLAIM_UPLOAD_DIR, where jobs read them from
+    """
+    ClaimJob = apps.get_model('insurance', 'ClaimJob')
+    jobs = ClaimJob.objects.filter(document__isnull=False).only('id', 'document', 'document_path')
+    for job in jobs.iterator(chunk_size=20):
+        if not job.document_path:
+            os.makedirs(settings.CLAIM_UPLOAD_DIR, exist_ok=True)
+            path = os.path.join(settings.CLAIM_UPLOAD_DIR, f'{job.id}.pdf')
+            with open(path, 'wb') as destination:
+                destination.write(job.document)
+            job.document_path = path
+        job.document = None
+        job.save(update_fields=['document', 'document_path'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('insurance', '0016_claimjob_worker'),
+    ]
+
+    operations = [
+        migrations.RunPython(spool_documents, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='claimjob',
+            name='document',
+        ),
+    ]
@@ -34,6 +34,12 @@ class Buyer(models.Model):
         from django.contrib.auth.hashers import check_password
         return check_password(raw_password, self.password)
 
+    class Meta:
+        indexes = [
+            # Keyset pagination of admin listings
+            models.Index(fields=['created_at', 'id'], name='buyer_created_id_idx'),
+        ]
+
     def __str__(self):
         return self.full_name
 
@@ -71,10 +77,29 @@ class Claim(models.Model):
     claim_description = models.TextField(blank=True)
     hospital_transaction_id = models.CharField(max_length=200, null=True, blank=True)
     storacha_cid = models.CharField(max_length=100, blank=True)  # Storacha CID for claim data
+    document_hash = models.CharField(max_length=64, blank=True)  # SHA-256 of the uploaded bill
     created_at = models.DateTimeField(auto_now_add=True)
     verified_at = models.DateTimeField(null=True, blank=True)
     accepted_at = models.DateTimeField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # Keyset pagination of admin listings
+            models.Index(fields=['created_at', 'id'], name='claim_created_id_idx'),
+            # Admin claim filters; id last so a filtered page is read in keyset order
+            models.Index(fields=['claim_status', 'created_at', 'id'], name='claim_status_created_id_idx'),
+            models.Index(fields=['buyer', 'created_at', 'id'], name='claim_buyer_created_id_idx'),
+            models.Index(fields=['hospital_transaction_id'], name='claim_hospital_txn_idx'),
+        ]
+        constraints = [
+            # One claim per bill per buyer; also stops concurrent double submissions
+            models.UniqueConstraint(
+                fields=['buyer', 'document_hash'],
+                condition=~models.Q(document_hash=''),
+                name='claim_buyer_document_uniq'
+            ),
+        ]
+
     def __str__(self):
         return self.claim_id
 
@@ -157,3 +182,66 @@ class Premium(models.Model):
 
     def __str__(self):
         return f"Premium {self.amount_eth} ETH by {self.buyer.full_name}"
+
+
+class StorachaUpload(models.Model):
+    """
+    Content-addressed record of data sent to Storacha.
+    The CID is computed locally before upload, so rows are written immediately and
+    the upload happens later; uploads whose CID is already stored are skipped.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('stored', 'Stored'),
+        ('failed', 'Failed'),
+    ]
+
+    cid = models.CharField(max_length=100, primary_key=True)
+    kind = models.CharField(max_length=20)  # 'claim' or 'premium'
+    content = models.BinaryField(null=True, blank=True)  # encoded record, cleared once stored
+    size = models.IntegerField(default=0)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.IntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    stored_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.kind} {self.cid} ({self.status})"
+
+
+class ClaimJob(models.Model):
+    """
+    Background processing of a submitted claim document.
+    submit_claim saves the claim and the PDF, then the job moves through
+    extracting -> verifying -> uploading -> completed (or failed) off the request thread.
+    """
+    STAGE_CHOICES = [
+        ('queued', 'Queued'),
+        ('extracting', 'Extracting'),
+        ('verifying', 'Verifying'),
+        ('uploading', 'Uploading'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    claim = models.ForeignKey(Claim, on_delete=models.SET_NULL, null=True, blank=True, related_name='jobs')
+    stage = models.CharField(max_length=20, choices=STAGE_CHOICES, default='queued')
+    document_path = models.CharField(max_length=500, blank=True)  # uploaded PDF in CLAIM_UPLOAD_DIR, removed once processed
+    file_name = models.CharField(max_length=255, blank=True)
+    attempts = models.IntegerField(default=0)
+    # Process running the job; its lease lapses CLAIM_JOB_LEASE_SECONDS after updated_at
+    worker = models.CharField(max_length=64, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['stage', 'created_at'], name='claimjob_stage_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"Job {self.id} ({self.stage})"
@@ -0,0 +1,128 @@
+import base64
+import json
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+def encode_cursor(created_at, pk):
+    """
+    Opaque cursor pointing at the last row of a page
+    """
+    payload = json.dumps({'c': created_at.isoformat() if created_at else None, 'i': str(pk)})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Returns (created_at or None, pk); raises ValueError for malformed cursors
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        created_at = parse_datetime(payload['c']) if payload['c'] else None
+        return created_at, payload['i']
+    except (TypeError, KeyError, ValueError, UnicodeDecodeError):
+        raise ValueError('Invalid cursor')
+
+
+def get_page_size(request):
+    """
+    ?page_size= from the request, bounded by ADMIN_MAX_PAGE_SIZE
+    """
+    value = request.query_params.get('page_size')
+    if not value:
+        return settings.ADMIN_PAGE_SIZE
+    try:
+        page_size = int(value)
+    except ValueError:
+        page_size = 0
+    if page_size < 1:
+        raise ValueError('page_size must be a positive integer')
+    return min(page_size, settings.ADMIN_MAX_PAGE_SIZE)
+
+
+def _created_segment(queryset, newest_first, created_at, pk):
+    """
+    Rows with a created_at, after the cursor. created_at <= / >= the cursor is the index
+    range condition; the OR only breaks ties on id within it.
+    """
+    direction = '-' if newest_first else ''
+    after = 'lt' if newest_first else 'gt'
+    queryset = queryset.order_by(f'{direction}created_at', f'{direction}id')
+    if created_at is not None:
+        queryset = queryset.filter(**{f'created_at__{after}e': created_at}).filter(
+            Q(**{f'created_at__{after}': created_at}) | Q(**{f'id__{after}': pk})
+        )
+    return queryset
+
+
+def _null_segment(queryset, newest_first, pk):
+    """
+    Rows without a created_at, ordered by id: created_at IS NULL is an equality on the
+    index's first column, so this is a range scan on id within it
+    """
+    direction = '-' if newest_first else ''
+    queryset = queryset.filter(created_at__isnull=True).order_by(f'{direction}id')
+    if pk is not None:
+        queryset = queryset.filter(**{f'id__{"lt" if newest_first else "gt"}': pk})
+    return queryset
+
+
+def keyset_page(queryset, request, serialize):
+    """
+    Page of queryset keyed on (created_at, id), newest first (?order=oldest reverses it).
+
+    The cursor holds the last row's (created_at, id), and each page is read in the order
+    of the (created_at, id) index starting from it, so it is an index range scan no matter
+    how deep it is. Rows are streamed with .iterator(), so only one page is held in memory.
+
+    Where created_at is nullable (Buyer), rows without one come last, in either order. They
+    are read as a separate trailing segment rather than ORed into every page, which would
+    stop the planner from using the range.
+
+    Returns {'results': [...], 'next_cursor': str or None, 'page_size': int}
+    Raises ValueError for a bad cursor, order or page_size.
+    """
+    page_size = get_page_size(request)
+    order = request.query_params.get('order', 'newest')
+    if order not in ('newest', 'oldest'):
+        raise ValueError('order must be "newest" or "oldest"')
+    newest_first = order == 'newest'
+    nullable = queryset.model._meta.get_field('created_at').null
+
+    created_at, pk = None, None
+    cursor = request.query_params.get('cursor')
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        if created_at is None and not nullable:
+            raise ValueError('Invalid cursor')
+
+    segments = []
+    if not cursor or created_at is not None:
+        created = queryset.filter(created_at__isnull=False) if nullable else queryset
+        segments.append(_created_segment(created, newest_first, created_at, pk))
+    if nullable:
+        # Past the last dated row the null segment starts from its beginning
+        segments.append(_null_segment(queryset, newest_first, pk if cursor and created_at is None else None))
+
+    results = []
+    last = None
+    has_more = False
+    # One extra row tells us whether another page exists
+    for segment in segments:
+        limit = page_size + 1 - len(results)
+        for row in segment[:limit].iterator(chunk_size=limit):
+            if len(results) == page_size:
+                has_more = True
+                break
+            results.append(serialize(row))
+            last = row
+        if has_more:
+            break
+
+    return {
+        'results': results,
+        'next_cursor': encode_cursor(last.created_at, last.pk) if has_more else None,
+        'page_size': page_size
+    }
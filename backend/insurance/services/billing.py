@@ -0,0 +1,248 @@
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import requests
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+
+# Billing API base URLs in order of preference
+DEFAULT_BILLING_URLS = 'http://127.0.0.1:8080,http://127.0.0.1:8000'
+VERIFY_PATH = '/billing/api/verify-transaction/{transaction_id}/'
+
+# Seconds a verification result is reused: paid transactions rarely change, unpaid ones
+# may be paid shortly, and an unreachable API should be asked again almost at once
+POSITIVE_CACHE_TIMEOUT = int(os.getenv('BILLING_CACHE_TIMEOUT', '3600'))
+NEGATIVE_CACHE_TIMEOUT = int(os.getenv('BILLING_NEGATIVE_CACHE_TIMEOUT', '60'))
+UNAVAILABLE_CACHE_TIMEOUT = int(os.getenv('BILLING_UNAVAILABLE_CACHE_TIMEOUT', '5'))
+
+
+class BillingUnavailable(Exception):
+    pass
+
+
+class BillingClient:
+    """
+    Verifies hospital transactions against the billing API over a keep-alive connection pool.
+
+    - The endpoint that answered last is tried first, so a dead primary costs nothing once noticed
+    - An endpoint that fails to connect or returns 5xx is skipped for retry_after seconds
+    - Connects time out after connect_timeout (a closed port fails in about one RTT), reads after read_timeout
+    - With race=True every healthy endpoint is asked at once and the first answer wins
+    """
+
+    def __init__(self, base_urls=None, connect_timeout=None, read_timeout=None, retry_after=None, race=None, pool_size=None):
+        if base_urls is None:
+            base_urls = os.getenv('BILLING_API_URLS', DEFAULT_BILLING_URLS).split(',')
+        self.base_urls = [url.strip().rstrip('/') for url in base_urls if url.strip()]
+        self.connect_timeout = connect_timeout if connect_timeout is not None else float(os.getenv('BILLING_CONNECT_TIMEOUT', '0.5'))
+        self.read_timeout = read_timeout if read_timeout is not None else float(os.getenv('BILLING_READ_TIMEOUT', '10'))
+        self.retry_after = retry_after if retry_after is not None else float(os.getenv('BILLING_RETRY_AFTER', '30'))
+        self.race = race if race is not None else os.getenv('BILLING_RACE', 'false').lower() == 'true'
+        self.pool_size = pool_size or int(os.getenv('BILLING_POOL_SIZE', '16'))
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=len(self.base_urls) or 1, pool_maxsize=self.pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._race_executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix='billing-race')
+
+        self._lock = threading.Lock()
+        self._preferred = self.base_urls[0] if self.base_urls else None
+        # base_url -> monotonic time before which the endpoint is skipped
+        self._down_until = {}
+        self._last_error = {}
+
+    def _ordered_endpoints(self):
+        """
+        Healthy endpoints, preferred first; if none are healthy, all of them
+        """
+        now = time.monotonic()
+        with self._lock:
+            ordered = sorted(self.base_urls, key=lambda url: url != self._preferred)
+            healthy = [url for url in ordered if self._down_until.get(url, 0) <= now]
+        return healthy or ordered
+
+    def _mark_up(self, base_url):
+        with self._lock:
+            self._preferred = base_url
+            self._down_until.pop(base_url, None)
+            self._last_error.pop(base_url, None)
+
+    def _mark_down(self, base_url, error):
+        with self._lock:
+            self._down_until[base_url] = time.monotonic() + self.retry_after
+            self._last_error[base_url] = error
+            if self._preferred == base_url:
+                now = time.monotonic()
+                others = [url for url in self.base_urls if self._down_until.get(url, 0) <= now]
+                self._preferred = others[0] if others else base_url
+
+    def _get(self, base_url, transaction_id):
+        url = base_url + VERIFY_PATH.format(transaction_id=transaction_id)
+        try:
+            response = self.session.get(url, timeout=(self.connect_timeout, self.read_timeout))
+        except requests.exceptions.RequestException as e:
+            self._mark_down(base_url, str(e))
+            raise BillingUnavailable(f'{base_url}: {str(e)}')
+        if response.status_code >= 500:
+            self._mark_down(base_url, f'status code {response.status_code}')
+            raise BillingUnavailable(f'{base_url}: API returned status code {response.status_code}')
+        self._mark_up(base_url)
+        return response
+
+    def _first_response(self, transaction_id):
+        endpoints = self._ordered_endpoints()
+        if not endpoints:
+            raise BillingUnavailable('No billing API endpoints configured')
+
+        errors = []
+        if not self.race or len(endpoints) == 1:
+            for base_url in endpoints:
+                try:
+                    return self._get(base_url, transaction_id)
+                except BillingUnavailable as e:
+                    errors.append(str(e))
+            raise BillingUnavailable('; '.join(errors))
+
+        pending = {self._race_executor.submit(self._get, base_url, transaction_id) for base_url in endpoints}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    # Slower duplicates are left to finish on their own
+                    return future.result()
+                except BillingUnavailable as e:
+                    errors.append(str(e))
+        raise BillingUnavailable('; '.join(errors))
+
+    def verify(self, transaction_id):
+        """
+        {'success': bool, 'data': {...}} for an answer from the API, {'success': False, 'error': ...} otherwise
+        """
+        try:
+            response = self._first_response(transaction_id)
+        except BillingUnavailable as e:
+            return {
+                'success': False,
+                'unavailable': True,
+                'error': f'API request failed on all endpoints: {str(e)}'
+            }
+
+        if response.status_code != 200:
+            return {
+                'success': False,
+                'error': f'API returned status code {response.status_code}'
+            }
+
+        data = response.json()
+        # Check if transaction is successful based on status field
+        # Handle different possible success indicators
+        is_success = (
+            data.get('status') == 'paid' or
+            data.get('success') == True or
+            data.get('status') == 'success'
+        )
+        return {
+            'success': is_success,
+            'data': data
+        }
+
+    def health(self):
+        """
+        Per-endpoint health for monitoring
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {
+                'preferred': self._preferred,
+                'race': self.race,
+                'endpoints': [
+                    {
+                        'url': url,
+                        'healthy': self._down_until.get(url, 0) <= now,
+                        'retry_in': round(max(0.0, self._down_until.get(url, 0) - now), 1),
+                        'last_error': self._last_error.get(url)
+                    }
+                    for url in self.base_urls
+                ]
+            }
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_billing_client():
+    """
+    Shared billing client so connections and endpoint health are reused across requests
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = BillingClient()
+        return _client
+
+
+# transaction_id -> Future of the lookup in flight, shared by concurrent callers
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+
+def _cache_timeout(result):
+    if result.get('success'):
+        return POSITIVE_CACHE_TIMEOUT
+    if result.get('unavailable'):
+        return UNAVAILABLE_CACHE_TIMEOUT
+    return NEGATIVE_CACHE_TIMEOUT
+
+
+def _verify_uncached(transaction_id):
+    try:
+        return get_billing_client().verify(transaction_id)
+    except Exception as e:
+        return {
+            'success': False,
+            'unavailable': True,
+            'error': f'Unexpected error: {str(e)}'
+        }
+
+
+def verify_transaction_id(transaction_id, use_cache=True):
+    """
+    Verify transaction ID against billing API
+    Results are cached per transaction ID (see *_CACHE_TIMEOUT), and concurrent
+    lookups of the same ID share a single HTTP call.
+    use_cache=False always asks the API and replaces the cached result, so an
+    explicit re-verification is not answered by a stale "unpaid" entry
+    """
+    cache_key = f'billing-verify:{transaction_id}'
+    if not use_cache:
+        result = _verify_uncached(transaction_id)
+        cache.set(cache_key, result, _cache_timeout(result))
+        return result
+
+    result = cache.get(cache_key)
+    if result is not None:
+        return result
+
+    with _in_flight_lock:
+        future = _in_flight.get(transaction_id)
+        leader = future is None
+        if leader:
+            future = _in_flight[transaction_id] = Future()
+    if not leader:
+        return future.result()
+
+    try:
+        result = _verify_uncached(transaction_id)
+        cache.set(cache_key, result, _cache_timeout(result))
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _in_flight_lock:
+            _in_flight.pop(transaction_id, None)
@@ -0,0 +1,140 @@
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .billing import VERIFY_PATH
+
+VERIFY_PREFIX = VERIFY_PATH.split('{', 1)[0]
+
+
+def generate_dataset(paid=1000, unpaid=100, seed=None):
+    """
+    Random transaction IDs in the format hospitals use (e.g. WM9pe6ds)
+    Returns {transaction_id: 'paid' | 'unpaid'}
+    """
+    rng = random.Random(seed)
+    alphabet = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789'
+    dataset = {}
+    for status, count in (('paid', paid), ('unpaid', unpaid)):
+        while count:
+            transaction_id = ''.join(rng.choice(alphabet) for _ in range(8))
+            if transaction_id not in dataset:
+                dataset[transaction_id] = status
+                count -= 1
+    return dataset
+
+
+def load_dataset(path):
+    """
+    Read a dataset file: either {"paid": [ids], "unpaid": [ids]} or {id: status}
+    """
+    with open(path) as dataset_file:
+        data = json.load(dataset_file)
+    if set(data) <= {'paid', 'unpaid'} and all(isinstance(ids, list) for ids in data.values()):
+        return {transaction_id: status for status, ids in data.items() for transaction_id in ids}
+    return dict(data)
+
+
+class BillingStandinServer(ThreadingHTTPServer):
+    """
+    Local stand-in for the hospital billing API (GET /billing/api/verify-transaction/<id>/).
+
+    Known IDs answer 200 with their status ('paid' or 'unpaid'), unknown IDs 404.
+    Latency and random 500 errors can be injected to exercise timeouts,
+    endpoint failover and negative caching.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, dataset=None, latency_ms=0, jitter_ms=0, error_rate=0.0, seed=None):
+        super().__init__(address, BillingStandinHandler)
+        self.dataset = dataset if dataset is not None else {}
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'paid': 0, 'unpaid': 0, 'not_found': 0, 'errors': 0}
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def inject_faults(self):
+        """
+        Sleep for the configured latency and decide whether this request should fail
+        """
+        with self.lock:
+            self.stats['requests'] += 1
+            delay = self.latency_ms + self.random.uniform(0, self.jitter_ms)
+            fail = self.random.random() < self.error_rate
+            if fail:
+                self.stats['errors'] += 1
+        if delay:
+            time.sleep(delay / 1000)
+        return fail
+
+    def lookup(self, transaction_id):
+        status = self.dataset.get(transaction_id)
+        with self.lock:
+            self.stats[status or 'not_found'] += 1
+        return status
+
+
+class BillingStandinHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without TCP_NODELAY the client's
+    # delayed ACK adds ~40 ms to every keep-alive response and hides the real latency
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        # Keep benchmark output readable
+        pass
+
+    def _send_json(self, payload, status_code=200):
+        body = json.dumps(payload).encode()
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/health':
+            with self.server.lock:
+                stats = dict(self.server.stats)
+            return self._send_json({'status': 'ok', 'transactions': len(self.server.dataset), **stats})
+
+        path = self.path.split('?', 1)[0]
+        if not path.startswith(VERIFY_PREFIX):
+            return self._send_json({'error': 'Not found'}, 404)
+        transaction_id = path[len(VERIFY_PREFIX):].strip('/')
+
+        if self.server.inject_faults():
+            return self._send_json({'error': 'Injected billing failure'}, 500)
+
+        status = self.server.lookup(transaction_id)
+        if status is None:
+            return self._send_json({
+                'status': 'not_found',
+                'message': 'Transaction not found',
+                'transaction_id': transaction_id
+            }, 404)
+        return self._send_json({
+            'status': status,
+            'message': 'Transaction verified successfully' if status == 'paid' else 'Transaction not paid',
+            'transaction_id': transaction_id
+        })
+
+
+def start_billing_standin(host='127.0.0.1', port=0, **options):
+    """
+    Start the stand-in in a background thread and return the running server
+    """
+    server = BillingStandinServer((host, port), **options)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
@@ -0,0 +1,136 @@
+import threading
+import time
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of calling a dependency while its circuit is open
+    """
+
+    def __init__(self, name, retry_after):
+        super().__init__(f"{name} circuit is open, retry in {retry_after:.1f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker.
+
+    - closed: calls go through; failure_threshold consecutive failures open the circuit
+    - open: calls fail immediately with CircuitOpenError for recovery_timeout seconds
+    - half_open: up to half_open_max_calls probe calls go through; a success closes
+      the circuit, a failure opens it again
+
+    on_open and on_close are called (outside the lock) each time the circuit opens or closes.
+    """
+
+    def __init__(self, name, failure_threshold=5, recovery_timeout=30.0, half_open_max_calls=1,
+                 on_close=None, on_open=None):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.on_close = on_close
+        self.on_open = on_open
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._probes = 0
+        self._stats = {'calls': 0, 'successes': 0, 'failures': 0, 'rejected': 0, 'opened': 0}
+        self._last_error = ''
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        # Open circuits move to half-open once the recovery timeout has passed
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._state = HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def _retry_after(self):
+        if self._state != OPEN:
+            return 0.0
+        return max(self.recovery_timeout - (time.monotonic() - self._opened_at), 0.0)
+
+    def before_call(self):
+        """
+        Reserve a call, raising CircuitOpenError if the circuit does not allow it
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == OPEN or (state == HALF_OPEN and self._probes >= self.half_open_max_calls):
+                self._stats['rejected'] += 1
+                raise CircuitOpenError(self.name, self._retry_after() or self.recovery_timeout)
+            if state == HALF_OPEN:
+                self._probes += 1
+            self._stats['calls'] += 1
+
+    def record_success(self):
+        with self._lock:
+            closed = self._state != CLOSED
+            self._state = CLOSED
+            self._failures = 0
+            self._probes = 0
+            self._stats['successes'] += 1
+        if closed:
+            print(f"✅ {self.name} circuit closed")
+            if self.on_close:
+                self.on_close()
+
+    def record_failure(self, error=None):
+        opened = False
+        with self._lock:
+            self._failures += 1
+            self._stats['failures'] += 1
+            self._last_error = str(error) if error else ''
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    opened = True
+                    self._stats['opened'] += 1
+                    print(f"⚠️ {self.name} circuit opened after {self._failures} failure(s): {self._last_error}")
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self._probes = 0
+        if opened and self.on_open:
+            self.on_open()
+
+    def call(self, func, *args, **kwargs):
+        """
+        Run func through the breaker
+        """
+        self.before_call()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            self.record_failure(e)
+            raise
+        self.record_success()
+        return result
+
+    def snapshot(self):
+        """
+        Current state and counters for monitoring
+        """
+        with self._lock:
+            state = self._current_state()
+            return {
+                'name': self.name,
+                'state': state,
+                'consecutive_failures': self._failures,
+                'failure_threshold': self.failure_threshold,
+                'recovery_timeout': self.recovery_timeout,
+                'retry_after': round(self._retry_after(), 2),
+                'last_error': self._last_error,
+                **self._stats
+            }
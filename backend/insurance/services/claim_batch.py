@@ -0,0 +1,292 @@
+import json
+import os
+import posixpath
+import uuid
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from ..caching import invalidate_admin_stats, invalidate_buyer_history
+from ..claim_ids import new_claim_ids
+from ..uploads import content_hash, discard_upload, spool_stream, store_upload
+from .billing import verify_transaction_id
+from .claim_pipeline import extract_document, queue_claim_record
+from .pdf_workers import DEFAULT_WORKERS as EXTRACT_WORKERS, PdfRejected
+
+VERIFY_CONCURRENCY = int(os.getenv('CLAIM_BATCH_VERIFY_CONCURRENCY', '8'))
+# Optional file in a batch zip: {"<file name>": "<buyer wallet address>", ...}
+MANIFEST_NAME = 'manifest.json'
+MAX_MANIFEST_BYTES = 1024 * 1024
+
+
+class BatchError(Exception):
+    """
+    The batch as a whole cannot be processed (too many files, unreadable zip, ...)
+    """
+    pass
+
+
+def _new_item(index, file_name, buyer_address):
+    return {
+        'index': index,
+        'file_name': file_name,
+        'buyer_address': buyer_address,
+        'path': None,
+        'document_hash': None,
+        'status': None,  # created, duplicate or failed once settled
+        'error': None,
+        'claim': None,
+    }
+
+
+def _fail(item, error):
+    item['status'] = 'failed'
+    item['error'] = error
+
+
+def _pending(items):
+    return [item for item in items if item['status'] is None]
+
+
+def _archive_members(archive, max_items, max_bytes):
+    """
+    The files in a zip worth reading, plus the buyers listed in its manifest.json
+    """
+    try:
+        archive_file = zipfile.ZipFile(archive)
+    except zipfile.BadZipFile:
+        raise BatchError('archive is not a valid zip file')
+
+    members = []
+    buyers = {}
+    for info in archive_file.infolist():
+        name = info.filename
+        base_name = posixpath.basename(name)
+        # Directories and macOS resource forks (__MACOSX/, ._name) are not claims
+        if info.is_dir() or name.startswith('__MACOSX/') or base_name.startswith('._'):
+            continue
+        if base_name == MANIFEST_NAME:
+            if info.file_size > MAX_MANIFEST_BYTES:
+                raise BatchError(f'{MANIFEST_NAME} is too large')
+            try:
+                buyers = json.loads(archive_file.read(info))
+            except ValueError:
+                raise BatchError(f'{MANIFEST_NAME} is not valid JSON')
+            if not isinstance(buyers, dict):
+                raise BatchError(f'{MANIFEST_NAME} must map file names to buyer addresses')
+            continue
+        members.append(info)
+
+    if len(members) > max_items:
+        raise BatchError(f'archive has {len(members)} files (limit {max_items})')
+    # Sizes are checked before anything is inflated; zipfile never reads past them
+    if sum(info.file_size for info in members) > max_bytes:
+        raise BatchError(f'archive expands to more than {max_bytes} bytes')
+    return archive_file, members, buyers
+
+
+def collect_batch_items(files, archive, buyers, default_buyer, max_items, max_bytes):
+    """
+    Spool uploaded PDFs and the PDFs of a zip archive to CLAIM_UPLOAD_DIR, hashing them
+    on the way. buyers maps a file name to its buyer's wallet address (a manifest.json in
+    the archive adds to it); default_buyer is used for files it does not list.
+    Raises BatchError.
+    """
+    items = []
+
+    def buyer_for(*names):
+        for name in names:
+            if name in buyers:
+                return buyers[name]
+        return default_buyer
+
+    def spool_name():
+        return f'batch-{uuid.uuid4()}.pdf'
+
+    try:
+        archive_file, members = None, []
+        if archive is not None:
+            archive_file, members, archive_buyers = _archive_members(archive, max_items, max_bytes)
+            buyers = {**archive_buyers, **buyers}
+        if len(files) + len(members) > max_items:
+            raise BatchError(f'batch has {len(files) + len(members)} files (limit {max_items})')
+
+        for file in files:
+            item = _new_item(len(items), file.name, buyer_for(file.name))
+            items.append(item)
+            if not file.name.lower().endswith('.pdf'):
+                _fail(item, 'Only PDF files are allowed')
+                continue
+            item['document_hash'] = content_hash(file)
+            item['path'] = store_upload(file, spool_name())
+
+        for info in members:
+            base_name = posixpath.basename(info.filename)
+            item = _new_item(len(items), info.filename, buyer_for(info.filename, base_name))
+            items.append(item)
+            if not base_name.lower().endswith('.pdf'):
+                _fail(item, 'Only PDF files are allowed')
+                continue
+            try:
+                with archive_file.open(info) as member:
+                    item['path'], item['document_hash'], _ = spool_stream(member, spool_name())
+            except (zipfile.BadZipFile, NotImplementedError, RuntimeError) as e:
+                # Corrupt, encrypted or unsupported compression
+                _fail(item, f'Could not read file from archive: {str(e)}')
+        return items
+    except BaseException:
+        for item in items:
+            discard_upload(item['path'])
+        raise
+
+
+def _resolve_buyers(items):
+    from ..models import Buyer
+    pending = _pending(items)
+    addresses = {item['buyer_address'] for item in pending if item['buyer_address']}
+    buyers = {buyer.wallet_address: buyer for buyer in Buyer.objects.filter(wallet_address__in=addresses)}
+    for item in pending:
+        if not item['buyer_address']:
+            _fail(item, 'No buyer_address given for this file')
+        elif item['buyer_address'] not in buyers:
+            _fail(item, 'Buyer not found')
+        else:
+            item['buyer'] = buyers[item['buyer_address']]
+
+
+def _settle_duplicates(items):
+    """
+    Bills the buyer already submitted return the existing claim, as submit_claim does;
+    a bill repeated within the batch resolves to its first occurrence
+    """
+    from ..models import Claim
+    pending = _pending(items)
+    existing = {
+        (claim.buyer_id, claim.document_hash): claim
+        for claim in Claim.objects.filter(document_hash__in={item['document_hash'] for item in pending})
+    }
+    first = {}
+    for item in pending:
+        key = (item['buyer'].pk, item['document_hash'])
+        if key in existing:
+            item['status'] = 'duplicate'
+            item['claim'] = existing[key]
+        elif key in first:
+            item['status'] = 'duplicate'
+            item['duplicate_of'] = first[key]
+        else:
+            first[key] = item
+
+
+def _extract_one(item):
+    try:
+        claim_data = extract_document(item['path'], item['document_hash'])
+    except PdfRejected as e:
+        _fail(item, f'Could not process PDF file: {str(e)}')
+        return
+    if not claim_data.get('transaction_id'):
+        _fail(item, 'Could not extract transaction ID from PDF file')
+        return
+    item['transaction_id'] = claim_data['transaction_id']
+    item['amount'] = claim_data.get('amount')
+
+
+def _verify_all(items, concurrency):
+    pending = _pending(items)
+    transaction_ids = list({item['transaction_id'] for item in pending})
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='claim-batch-verify') as pool:
+        results = dict(zip(transaction_ids, pool.map(verify_transaction_id, transaction_ids)))
+    for item in pending:
+        item['verified'] = results[item['transaction_id']].get('success', False)
+
+
+def _create_claims(items, description):
+    from ..models import Claim
+    now = timezone.now()
+    pending = _pending(items)
+    for item, claim_id in zip(pending, new_claim_ids(len(pending))):
+        item['draft'] = Claim(
+            claim_id=claim_id,
+            buyer=item['buyer'],
+            # As stored, so results for new and existing claims read the same
+            claim_amount=Decimal(str(item['amount'] or 0)).quantize(Decimal('0.01')),
+            claim_description=description,
+            hospital_transaction_id=item['transaction_id'],
+            claim_status='verified' if item['verified'] else 'unverified',
+            verified_at=now if item['verified'] else None,
+            document_hash=item['document_hash']
+        )
+
+    try:
+        with transaction.atomic():
+            Claim.objects.bulk_create([item['draft'] for item in pending])
+    except IntegrityError:
+        # A concurrent submission of one of these bills got in first: settle those, insert the rest
+        _settle_duplicates(items)
+        pending = _pending(items)
+        with transaction.atomic():
+            Claim.objects.bulk_create([item['draft'] for item in pending])
+
+    for item in pending:
+        item['status'] = 'created'
+        item['claim'] = item['draft']
+    return [item['claim'] for item in pending]
+
+
+def _result(item):
+    source = item.get('duplicate_of') or item
+    result = {
+        'index': item['index'],
+        'file_name': item['file_name'],
+        'buyer_address': item['buyer_address'],
+        'status': item['status'] if source is item or source['status'] == 'created' else source['status'],
+        'error': source['error'],
+    }
+    claim = source['claim']
+    if claim is not None:
+        result.update({
+            'claim_id': claim.claim_id,
+            'transaction_id': claim.hospital_transaction_id,
+            'claim_amount': str(claim.claim_amount),
+            'verification_status': claim.claim_status,
+            'storacha_cid': claim.storacha_cid
+        })
+    return result
+
+
+def process_claim_batch(items, description, verify_concurrency=None):
+    """
+    Turn collected batch items into claims:
+    one buyer query and one duplicate query for the whole batch, extraction in parallel on
+    the PDF worker pool, verification with concurrent (pooled, cached) billing requests,
+    and every new claim inserted with a single bulk_create.
+
+    Returns one result per item, in order: {'index', 'file_name', 'buyer_address',
+    'status': 'created' | 'duplicate' | 'failed', 'error', and the claim fields when there is a claim}
+    """
+    try:
+        _resolve_buyers(items)
+        _settle_duplicates(items)
+
+        with ThreadPoolExecutor(max_workers=EXTRACT_WORKERS, thread_name_prefix='claim-batch-extract') as pool:
+            list(pool.map(_extract_one, _pending(items)))
+        _verify_all(items, verify_concurrency or VERIFY_CONCURRENCY)
+
+        created = _create_claims(items, description)
+        # Storacha records are queued like single submissions; their CIDs are saved in one update
+        for claim in created:
+            queue_claim_record(claim, save=False)
+        from ..models import Claim
+        Claim.objects.bulk_update([claim for claim in created if claim.storacha_cid], ['storacha_cid'])
+        # bulk_create and bulk_update skip post_save, so cached buyer views are invalidated here
+        for wallet_address in {claim.buyer.wallet_address for claim in created}:
+            invalidate_buyer_history(wallet_address)
+        if created:
+            invalidate_admin_stats()
+    finally:
+        for item in items:
+            discard_upload(item['path'])
+    return [_result(item) for item in items]
@@ -0,0 +1,136 @@
+import io
+import mmap
+import os
+import re
+
+import PyPDF2
+
+# Patterns in priority order: the first pattern that matches anywhere in the document wins,
+# and for each pattern its first match in the document is used
+TRANSACTION_ID_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE) for pattern in (
+        r'Transaction\s*ID[:\s]*([A-Za-z0-9\-_]+)',
+        r'TXN[:\s]*([A-Za-z0-9\-_]+)',
+        r'Transaction[:\s]*([A-Za-z0-9\-_]+)',
+        r'ID[:\s]*([A-Za-z0-9\-_]+)'
+    )
+]
+
+AMOUNT_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE) for pattern in (
+        r'Amount[:\s]*\$?([0-9,]+\.?[0-9]*)',
+        r'Total[:\s]*\$?([0-9,]+\.?[0-9]*)',
+        r'Claim\s*Amount[:\s]*\$?([0-9,]+\.?[0-9]*)',
+        r'\$([0-9,]+\.?[0-9]*)'
+    )
+]
+
+# Characters of the previous page searched again with the next one, so a label and
+# value split across a page break (as the old concatenated text allowed) still match
+PAGE_OVERLAP = 64
+
+
+class DocumentTooLarge(Exception):
+    pass
+
+
+def _parse_amount(value):
+    try:
+        return float(value.replace(',', ''))  # Remove commas
+    except ValueError:
+        return None
+
+
+def _parse_transaction_id(value):
+    return value
+
+
+class _Field:
+    """
+    Tracks the first match of each pattern for one field while pages are scanned
+    """
+
+    def __init__(self, patterns, parse):
+        self.patterns = patterns
+        self.parse = parse
+        # pattern index -> parsed value of its first match (None when it did not parse)
+        self.first_matches = {}
+
+    def scan(self, text):
+        for index, pattern in enumerate(self.patterns):
+            if index in self.first_matches:
+                continue
+            match = pattern.search(text)
+            if match:
+                self.first_matches[index] = self.parse(match.group(1))
+
+    def result(self, final):
+        """
+        Value of the highest-priority pattern, or (None, False) while a
+        higher-priority pattern could still match on a later page
+        """
+        for index in range(len(self.patterns)):
+            if index not in self.first_matches:
+                if not final:
+                    return None, False
+                continue
+            value = self.first_matches[index]
+            if value is not None:
+                return value, True
+        return None, final
+
+
+def extract_claim_data_from_pdf(file, fields=('transaction_id', 'amount'), max_pages=None):
+    """
+    Extract claim data (transaction ID and amount) from PDF file content
+
+    Pages are read one at a time with precompiled patterns, and reading stops as
+    soon as every requested field is settled (for a typical bill, on the first page).
+    Raises DocumentTooLarge if the PDF has more than max_pages pages.
+    Returns {'transaction_id': str or None, 'amount': float or None}
+    """
+    result = {'transaction_id': None, 'amount': None}
+    try:
+        # Reset file pointer to beginning
+        file.seek(0)
+
+        trackers = {}
+        if 'transaction_id' in fields:
+            trackers['transaction_id'] = _Field(TRANSACTION_ID_PATTERNS, _parse_transaction_id)
+        if 'amount' in fields:
+            trackers['amount'] = _Field(AMOUNT_PATTERNS, _parse_amount)
+
+        pdf_reader = PyPDF2.PdfReader(file)
+        if max_pages is not None and len(pdf_reader.pages) > max_pages:
+            raise DocumentTooLarge(f'PDF has {len(pdf_reader.pages)} pages (limit {max_pages})')
+        carry = ''
+        for page in pdf_reader.pages:
+            text = carry + (page.extract_text() or '')
+            for tracker in trackers.values():
+                tracker.scan(text)
+            if all(tracker.result(final=False)[1] for tracker in trackers.values()):
+                break
+            carry = text[-PAGE_OVERLAP:]
+
+        for name, tracker in trackers.items():
+            result[name] = tracker.result(final=True)[0]
+        return result
+    except DocumentTooLarge:
+        raise
+    except Exception as e:
+        print(f"Error extracting claim data from PDF: {str(e)}")
+        return result
+
+
+
+def extract_claim_data_from_file(path, fields=('transaction_id', 'amount'), max_pages=None):
+    """
+    extract_claim_data_from_pdf for a PDF on disk, read through a memory map: its pages
+    come from the shared page cache instead of a private copy in each process
+    """
+    with open(path, 'rb') as pdf_file:
+        if os.fstat(pdf_file.fileno()).st_size == 0:
+            # mmap cannot map an empty file
+            return extract_claim_data_from_pdf(io.BytesIO(), fields, max_pages)
+        with mmap.mmap(pdf_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return extract_claim_data_from_pdf(mapped, fields, max_pages)
@@ -0,0 +1,296 @@
+import os
+import secrets
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.db.models import Q
+from django.utils import timezone
+from ..uploads import discard_upload
+from .billing import verify_transaction_id
+from .pdf_workers import DEFAULT_WORKERS as EXTRACT_WORKERS, PdfRejected, get_pdf_pool
+from .storacha_node_service import StorachaNodeService, buyer_upload_data, claim_upload_data
+
+# Each stage has its own pool: PDF parsing is CPU bound, verification and
+# uploads mostly wait on the network, so they are sized independently.
+# Extract threads only hand documents to the PDF worker processes (one thread per worker).
+_extract_executor = ThreadPoolExecutor(
+    max_workers=EXTRACT_WORKERS,
+    thread_name_prefix='claim-extract'
+)
+_verify_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('CLAIM_VERIFY_WORKERS', '4')),
+    thread_name_prefix='claim-verify'
+)
+_active_jobs = set()
+_active_jobs_lock = threading.Lock()
+
+# Extraction results are reused for identical uploads (keyed by content hash); rejections
+# (too large, too slow) for a shorter time, so a repeated bad upload is not parsed again
+EXTRACTION_CACHE_TIMEOUT = int(os.getenv('PDF_EXTRACT_CACHE_TIMEOUT', '86400'))
+REJECTION_CACHE_TIMEOUT = int(os.getenv('PDF_REJECT_CACHE_TIMEOUT', '600'))
+
+# Stages a job can be resumed from
+UNFINISHED_STAGES = ('queued', 'extracting', 'verifying', 'uploading')
+
+# A job belongs to the process that claimed it (ClaimJob.worker) until it finishes, or until
+# its updated_at is older than this: every stage change renews the lease, so it only lapses
+# when the process died or hung. Must exceed the longest stage, including queueing for a worker.
+LEASE_SECONDS = int(os.getenv('CLAIM_JOB_LEASE_SECONDS', '300'))
+
+_worker = None
+
+
+class LeaseLost(Exception):
+    """
+    Another process took the job over after this one's lease lapsed
+    """
+    pass
+
+
+def worker_id():
+    """
+    host:pid:token of this process; recomputed after a fork, so forked web workers differ
+    """
+    global _worker
+    if _worker is None or _worker[0] != os.getpid():
+        _worker = (os.getpid(), f'{socket.gethostname()[:40]}:{os.getpid()}:{secrets.token_hex(4)}')
+    return _worker[1]
+
+
+def resumable_jobs():
+    """
+    Unfinished jobs no live process holds: never claimed, or with a lapsed lease
+    """
+    from ..models import ClaimJob
+    stale_before = timezone.now() - timedelta(seconds=LEASE_SECONDS)
+    return ClaimJob.objects.filter(stage__in=UNFINISHED_STAGES).filter(
+        Q(worker='') | Q(updated_at__lt=stale_before)
+    )
+
+
+def _claim(job_id):
+    """
+    Take the job's lease with one conditional UPDATE, so of several processes starting
+    the same job only one gets it. Returns the job's stage, or None if it was not taken.
+    """
+    from ..models import ClaimJob
+    now = timezone.now()
+    claimed = ClaimJob.objects.filter(pk=job_id, stage__in=UNFINISHED_STAGES).filter(
+        Q(worker='') | Q(worker=worker_id()) | Q(updated_at__lt=now - timedelta(seconds=LEASE_SECONDS))
+    ).update(worker=worker_id(), updated_at=now)
+    if not claimed:
+        return None
+    return ClaimJob.objects.filter(pk=job_id).values_list('stage', flat=True).first()
+
+
+def start_job(job_id):
+    """
+    Schedule a job from whatever stage it is in; no-op if it is already running here
+    or another live process holds it
+    """
+    with _active_jobs_lock:
+        if job_id in _active_jobs:
+            return False
+        _active_jobs.add(job_id)
+
+    stage = _claim(job_id)
+    if stage in ('queued', 'extracting'):
+        _extract_executor.submit(_run_stage, _extract, job_id)
+    elif stage in ('verifying', 'uploading'):
+        _verify_executor.submit(_run_stage, _verify_and_upload, job_id)
+    else:
+        _release(job_id)
+        return False
+    return True
+
+
+def resume_pending_jobs(limit=500):
+    """
+    Restart jobs left unfinished (e.g. by a server restart) whose lease has lapsed, oldest first
+    """
+    try:
+        job_ids = resumable_jobs().order_by('created_at').values_list('id', flat=True)[:limit]
+        return sum(1 for job_id in job_ids if start_job(job_id))
+    finally:
+        close_old_connections()
+
+
+def _release(job_id):
+    with _active_jobs_lock:
+        _active_jobs.discard(job_id)
+
+
+def _run_stage(stage, job_id):
+    from ..models import ClaimJob
+    next_stage = None
+    try:
+        job = ClaimJob.objects.select_related('claim__buyer').filter(pk=job_id, worker=worker_id()).first()
+        if job is None:
+            raise LeaseLost(job_id)
+        next_stage = stage(job)
+    except LeaseLost:
+        print(f"Claim job {job_id} was taken over by another worker")
+    except Exception as e:
+        print(f"Claim job {job_id} failed: {str(e)}")
+        try:
+            _abandon(job_id, str(e))
+        except Exception as cleanup_error:
+            print(f"Could not mark claim job {job_id} as failed: {str(cleanup_error)}")
+    finally:
+        close_old_connections()
+        if next_stage:
+            # Hand over to the next pool without releasing, so the job is never scheduled twice
+            _verify_executor.submit(_run_stage, next_stage, job_id)
+        else:
+            _release(job_id)
+
+
+def _abandon(job_id, error):
+    """
+    Fail a job after an unexpected error (worker pool, database, ...). Its PDF is removed, and
+    a claim that never got a verification result is deleted, so the bill can be submitted again
+    """
+    from ..models import Claim, ClaimJob
+    job = ClaimJob.objects.filter(pk=job_id, worker=worker_id()).first()
+    if job is None:
+        return
+    discard_upload(job.document_path)
+    if job.claim_id:
+        Claim.objects.filter(pk=job.claim_id, claim_status='submitted').delete()
+    now = timezone.now()
+    ClaimJob.objects.filter(pk=job_id, worker=worker_id()).update(
+        stage='failed', error=error, document_path='', worker='', finished_at=now, updated_at=now
+    )
+
+
+def _set_stage(job, stage, **fields):
+    """
+    Move the job on and renew its lease; raises LeaseLost if another process holds it now
+    """
+    from ..models import ClaimJob
+    if stage in ('completed', 'failed'):
+        fields['worker'] = ''
+    job.stage = stage
+    job.updated_at = timezone.now()
+    for name, value in fields.items():
+        setattr(job, name, value)
+    updated = ClaimJob.objects.filter(pk=job.pk, worker=worker_id()).update(
+        stage=stage, updated_at=job.updated_at, **fields
+    )
+    if not updated:
+        raise LeaseLost(job.pk)
+
+
+def _fail(job, error):
+    discard_upload(job.document_path)
+    _set_stage(job, 'failed', error=error, document_path='', finished_at=timezone.now())
+
+
+def extract_document(document, document_hash):
+    """
+    Transaction ID and amount of a PDF, parsed at most once per distinct content
+    """
+    if not document_hash:
+        return get_pdf_pool().extract(document)
+
+    cache_key = f'pdf-extract:{document_hash}'
+    cached = cache.get(cache_key)
+    if cached is not None:
+        if 'rejected' in cached:
+            raise PdfRejected(cached['rejected'])
+        return cached
+    try:
+        claim_data = get_pdf_pool().extract(document)
+    except PdfRejected as e:
+        cache.set(cache_key, {'rejected': str(e)}, REJECTION_CACHE_TIMEOUT)
+        raise
+    cache.set(cache_key, claim_data, EXTRACTION_CACHE_TIMEOUT)
+    return claim_data
+
+
+def _extract(job):
+    """
+    Stage 1: read the transaction ID and amount from the stored PDF
+    """
+    claim = job.claim
+    if claim is None:
+        _fail(job, 'Claim no longer exists')
+        return None
+
+    if not job.document_path or not os.path.exists(job.document_path):
+        claim.delete()
+        job.claim = None
+        _fail(job, 'Uploaded PDF file is no longer available')
+        return None
+
+    _set_stage(job, 'extracting', attempts=job.attempts + 1)
+    try:
+        # Parsed in a worker process, under its time, memory and page limits
+        claim_data = extract_document(job.document_path, claim.document_hash)
+    except PdfRejected as e:
+        claim.delete()
+        job.claim = None
+        _fail(job, f'Could not process PDF file: {str(e)}')
+        return None
+
+    transaction_id = claim_data.get('transaction_id')
+    if not transaction_id:
+        # Same outcome as the synchronous path: no claim without a transaction ID
+        claim.delete()
+        job.claim = None
+        _fail(job, 'Could not extract transaction ID from PDF file')
+        return None
+
+    claim.hospital_transaction_id = transaction_id
+    update_fields = ['hospital_transaction_id']
+    if claim_data.get('amount') is not None:
+        claim.claim_amount = claim_data['amount']
+        update_fields.append('claim_amount')
+    claim.save(update_fields=update_fields)
+
+    # The PDF is not needed past extraction
+    discard_upload(job.document_path)
+    _set_stage(job, 'verifying', document_path='')
+    return _verify_and_upload
+
+
+def queue_claim_record(claim, save=True):
+    """
+    Queue the claim record for Storacha and set its CID (computed locally, uploaded on the
+    Storacha pool); save=False leaves storing storacha_cid to the caller, e.g. a bulk_update
+    """
+    try:
+        claim.storacha_cid = StorachaNodeService().queue_claim_upload(
+            buyer_upload_data(claim.buyer), claim_upload_data(claim)
+        )
+        if save:
+            claim.save(update_fields=['storacha_cid'])
+    except Exception as e:
+        print(f"Error queueing claim upload to Storacha: {str(e)}")
+        # Continue anyway - the claim was processed; backfill_storacha uploads it later
+
+
+def _verify_and_upload(job):
+    """
+    Stages 2 and 3: check the transaction with the billing API, then queue the Storacha upload
+    """
+    claim = job.claim
+    if claim is None:
+        _fail(job, 'Claim no longer exists')
+        return None
+
+    if job.stage == 'verifying':
+        verification_result = verify_transaction_id(claim.hospital_transaction_id)
+        claim.claim_status = 'verified' if verification_result.get('success', False) else 'unverified'
+        if claim.claim_status == 'verified':
+            claim.verified_at = timezone.now()
+        claim.save(update_fields=['claim_status', 'verified_at'])
+        _set_stage(job, 'uploading')
+
+    queue_claim_record(claim)
+
+    _set_stage(job, 'completed', finished_at=timezone.now())
+    return None
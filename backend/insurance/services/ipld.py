@@ -0,0 +1,189 @@
+import struct
+
+from .storacha_cid import _varint, cid_bytes, cid_to_string, cid_from_string
+
+DAG_CBOR_CODEC = 0x71
+CID_TAG = 42
+
+
+class Link(str):
+    """
+    CID string that is encoded as an IPLD link (CBOR tag 42) rather than text
+    """
+
+
+def _head(major, value):
+    if value < 24:
+        return bytes([(major << 5) | value])
+    if value < 0x100:
+        return bytes([(major << 5) | 24, value])
+    if value < 0x10000:
+        return bytes([(major << 5) | 25]) + struct.pack('>H', value)
+    if value < 0x100000000:
+        return bytes([(major << 5) | 26]) + struct.pack('>I', value)
+    return bytes([(major << 5) | 27]) + struct.pack('>Q', value)
+
+
+def _encode(value, out):
+    if value is None:
+        out.append(b'\xf6')
+    elif value is True:
+        out.append(b'\xf5')
+    elif value is False:
+        out.append(b'\xf4')
+    elif isinstance(value, Link):
+        raw = b'\x00' + cid_from_string(value)
+        out.append(_head(6, CID_TAG) + _head(2, len(raw)) + raw)
+    elif isinstance(value, int):
+        if value >= 0:
+            out.append(_head(0, value))
+        else:
+            out.append(_head(1, -1 - value))
+    elif isinstance(value, float):
+        # DAG-CBOR always uses 64-bit floats
+        out.append(b'\xfb' + struct.pack('>d', value))
+    elif isinstance(value, str):
+        data = value.encode('utf-8')
+        out.append(_head(3, len(data)) + data)
+    elif isinstance(value, (bytes, bytearray)):
+        out.append(_head(2, len(value)) + bytes(value))
+    elif isinstance(value, (list, tuple)):
+        out.append(_head(4, len(value)))
+        for item in value:
+            _encode(item, out)
+    elif isinstance(value, dict):
+        # Canonical key order: shorter keys first, then bytewise
+        items = sorted(((key.encode('utf-8'), item) for key, item in value.items()),
+                       key=lambda pair: (len(pair[0]), pair[0]))
+        out.append(_head(5, len(items)))
+        for key, item in items:
+            out.append(_head(3, len(key)) + key)
+            _encode(item, out)
+    else:
+        raise TypeError(f"Cannot encode {type(value).__name__} as DAG-CBOR")
+
+
+def encode(value):
+    """
+    Encode a Python value as canonical DAG-CBOR bytes
+    """
+    out = []
+    _encode(value, out)
+    return b''.join(out)
+
+
+def _decode(data, pos):
+    initial = data[pos]
+    major, info = initial >> 5, initial & 0x1F
+    pos += 1
+    if major == 7:
+        if info == 20:
+            return False, pos
+        if info == 21:
+            return True, pos
+        if info == 22:
+            return None, pos
+        if info == 27:
+            return struct.unpack('>d', data[pos:pos + 8])[0], pos + 8
+        raise ValueError(f"Unsupported CBOR simple value {info}")
+
+    if info < 24:
+        value = info
+    elif info in (24, 25, 26, 27):
+        size = 1 << (info - 24)
+        value = int.from_bytes(data[pos:pos + size], 'big')
+        pos += size
+    else:
+        raise ValueError("Indefinite-length CBOR is not valid DAG-CBOR")
+
+    if major == 0:
+        return value, pos
+    if major == 1:
+        return -1 - value, pos
+    if major == 2:
+        return bytes(data[pos:pos + value]), pos + value
+    if major == 3:
+        return data[pos:pos + value].decode('utf-8'), pos + value
+    if major == 4:
+        items = []
+        for _ in range(value):
+            item, pos = _decode(data, pos)
+            items.append(item)
+        return items, pos
+    if major == 5:
+        result = {}
+        for _ in range(value):
+            key, pos = _decode(data, pos)
+            result[key], pos = _decode(data, pos)
+        return result, pos
+    if major == 6 and value == CID_TAG:
+        raw, pos = _decode(data, pos)
+        return Link(cid_to_string(raw[1:])), pos
+    raise ValueError(f"Unsupported CBOR major type {major}")
+
+
+def decode(data):
+    """
+    Decode DAG-CBOR bytes; links come back as Link (CID string)
+    """
+    value, pos = _decode(memoryview(data).tobytes() if isinstance(data, memoryview) else data, 0)
+    if pos != len(data):
+        raise ValueError("Trailing bytes after DAG-CBOR value")
+    return value
+
+
+def encode_block(value):
+    """
+    Encode a value as a DAG-CBOR block
+    Returns (cid, block_bytes)
+    """
+    block = encode(value)
+    return cid_to_string(cid_bytes(DAG_CBOR_CODEC, block)), block
+
+
+def encode_car(root, blocks):
+    """
+    Build a CARv1 file with a single root from [(cid, block_bytes), ...]
+    """
+    header = encode({'roots': [Link(root)], 'version': 1})
+    parts = [_varint(len(header)), header]
+    for cid, block in blocks:
+        raw_cid = cid_from_string(cid)
+        parts.append(_varint(len(raw_cid) + len(block)))
+        parts.append(raw_cid)
+        parts.append(block)
+    return b''.join(parts)
+
+
+def _read_varint(data, pos):
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+
+def decode_car(data):
+    """
+    Parse a CARv1 file
+    Returns (roots, [(cid, block_bytes), ...])
+    """
+    length, pos = _read_varint(data, 0)
+    header = decode(data[pos:pos + length])
+    pos += length
+    blocks = []
+    while pos < len(data):
+        length, pos = _read_varint(data, pos)
+        end = pos + length
+        # CIDv1: version, codec, then multihash code + digest length
+        _, cid_end = _read_varint(data, pos)
+        _, cid_end = _read_varint(data, cid_end)
+        _, cid_end = _read_varint(data, cid_end)
+        digest_length, cid_end = _read_varint(data, cid_end)
+        cid_end += digest_length
+        blocks.append((cid_to_string(data[pos:cid_end]), data[cid_end:end]))
+        pos = end
+    return [str(root) for root in header['roots']], blocks
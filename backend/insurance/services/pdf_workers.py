@@ -0,0 +1,215 @@
+import io
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+
+from .claim_extraction import DocumentTooLarge, extract_claim_data_from_file, extract_claim_data_from_pdf
+
+DEFAULT_WORKERS = int(os.getenv('CLAIM_EXTRACT_WORKERS', str(os.cpu_count() or 2)))
+# Wall-clock seconds one document may take before its worker is killed
+DEFAULT_TIMEOUT = float(os.getenv('CLAIM_EXTRACT_TIMEOUT', '20'))
+# Resident memory (MB) a worker may reach while parsing before it is killed
+DEFAULT_MAX_RSS_MB = int(os.getenv('CLAIM_EXTRACT_MAX_RSS_MB', '512'))
+DEFAULT_MAX_PAGES = int(os.getenv('CLAIM_EXTRACT_MAX_PAGES', '500'))
+# Documents a worker parses before it is replaced, so leaks and fragmentation do not build up
+DEFAULT_MAX_TASKS = int(os.getenv('CLAIM_EXTRACT_MAX_TASKS', '200'))
+
+# How often a busy worker is checked against the time and memory limits
+POLL_INTERVAL = 0.05
+
+
+class PdfRejected(Exception):
+    """
+    The document could not be parsed within the limits (time, memory, pages) or crashed its worker
+    """
+    pass
+
+
+def _rss_mb(pid):
+    """
+    Current resident memory of a process in MB, or None where /proc is not available
+    """
+    try:
+        with open(f'/proc/{pid}/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _worker_main(connection, max_pages):
+    """
+    Worker process loop: parse documents sent over the pipe until told to stop
+    """
+    # Ctrl+C is for the parent; it stops workers itself
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    while True:
+        try:
+            message = connection.recv()
+        except (EOFError, OSError):
+            return
+        if message is None:
+            return
+        document, fields = message
+        try:
+            if isinstance(document, str):
+                result = extract_claim_data_from_file(document, fields, max_pages=max_pages)
+            else:
+                result = extract_claim_data_from_pdf(io.BytesIO(document), fields, max_pages=max_pages)
+            connection.send(('ok', result))
+        except DocumentTooLarge as e:
+            connection.send(('rejected', str(e)))
+        except OSError as e:
+            connection.send(('rejected', f'Could not read document: {str(e)}'))
+
+
+class _Worker:
+    def __init__(self, context, max_pages):
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main, args=(child_connection, max_pages), name='claim-pdf-worker', daemon=True
+        )
+        self.process.start()
+        child_connection.close()
+        self.tasks = 0
+
+    def alive(self):
+        return self.process.is_alive()
+
+    def stop(self, kill=False):
+        try:
+            if kill:
+                self.process.kill()
+            else:
+                self.connection.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=1 if not kill else 5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(timeout=5)
+        self.connection.close()
+
+
+class PdfExtractionPool:
+    """
+    Parses claim PDFs in separate worker processes, so parsing uses every core instead of
+    contending for the GIL, and a pathological upload cannot stall the API process.
+
+    - A document that runs longer than timeout seconds, or pushes its worker past
+      max_rss_mb of resident memory, gets its worker killed and raises PdfRejected
+    - Documents with more than max_pages pages are rejected before their text is read
+    - Killed workers are replaced on next use; healthy ones are recycled after max_tasks documents
+    """
+
+    def __init__(self, workers=None, timeout=None, max_rss_mb=None, max_pages=None, max_tasks=None):
+        self.workers = workers or DEFAULT_WORKERS
+        self.timeout = timeout if timeout is not None else DEFAULT_TIMEOUT
+        self.max_rss_mb = max_rss_mb if max_rss_mb is not None else DEFAULT_MAX_RSS_MB
+        self.max_pages = max_pages if max_pages is not None else DEFAULT_MAX_PAGES
+        self.max_tasks = max_tasks if max_tasks is not None else DEFAULT_MAX_TASKS
+
+        # Workers are started from a clean interpreter: forking a threaded Django process is unsafe
+        self._context = multiprocessing.get_context('spawn')
+        # One slot per worker; None means the worker has not been started (or was retired)
+        self._slots = queue.Queue()
+        for _ in range(self.workers):
+            self._slots.put(None)
+        self._lock = threading.Lock()
+        self._closed = False
+        self.stats = {'documents': 0, 'rejected': 0, 'timeouts': 0, 'memory_kills': 0, 'crashes': 0, 'recycled': 0}
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def extract(self, document, fields=('transaction_id', 'amount')):
+        """
+        Same result as extract_claim_data_from_pdf, parsed in a worker process.
+        document is the PDF's bytes or the path of a PDF file, which the worker memory-maps.
+        Blocks while every worker is busy. Raises PdfRejected.
+        """
+        if self._closed:
+            raise RuntimeError('PDF extraction pool is shut down')
+        worker = self._slots.get()
+        try:
+            if worker is None or not worker.alive():
+                worker = _Worker(self._context, self.max_pages)
+            if not isinstance(document, str):
+                document = bytes(document)
+            worker, status, payload = self._run(worker, document, tuple(fields))
+        finally:
+            # A worker killed inside _run is dead and gets replaced on next use
+            self._slots.put(worker)
+        if status == 'rejected':
+            self._count('rejected')
+            raise PdfRejected(payload)
+        return payload
+
+    def _run(self, worker, document, fields):
+        """
+        Returns (worker to put back, status, payload); the worker is None once it has been retired
+        """
+        try:
+            worker.connection.send((document, fields))
+        except (OSError, ValueError):
+            worker.stop(kill=True)
+            self._count('crashes')
+            raise PdfRejected('PDF worker exited unexpectedly')
+
+        deadline = time.monotonic() + self.timeout
+        while not worker.connection.poll(POLL_INTERVAL):
+            if not worker.alive():
+                worker.stop(kill=True)
+                self._count('crashes')
+                raise PdfRejected('PDF worker exited while parsing the document')
+            if time.monotonic() > deadline:
+                worker.stop(kill=True)
+                self._count('timeouts')
+                raise PdfRejected(f'PDF parsing took longer than {self.timeout:g} seconds')
+            rss = _rss_mb(worker.process.pid)
+            if rss is not None and rss > self.max_rss_mb:
+                worker.stop(kill=True)
+                self._count('memory_kills')
+                raise PdfRejected(f'PDF parsing used more than {self.max_rss_mb} MB of memory')
+
+        try:
+            status, payload = worker.connection.recv()
+        except (EOFError, OSError):
+            worker.stop(kill=True)
+            self._count('crashes')
+            raise PdfRejected('PDF worker exited while parsing the document')
+
+        worker.tasks += 1
+        self._count('documents')
+        rss = _rss_mb(worker.process.pid)
+        if worker.tasks >= self.max_tasks or (rss is not None and rss > self.max_rss_mb):
+            # Too old, or kept memory from a document parsed between checks: start a fresh one next time
+            worker.stop()
+            self._count('recycled')
+            worker = None
+        return worker, status, payload
+
+    def shutdown(self):
+        self._closed = True
+        for _ in range(self.workers):
+            worker = self._slots.get()
+            if worker is not None:
+                worker.stop()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pdf_pool():
+    """
+    Shared worker pool for claim PDF extraction
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = PdfExtractionPool()
+        return _pool
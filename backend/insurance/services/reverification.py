@@ -0,0 +1,186 @@
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import cache
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from ..caching import invalidate_admin_stats, invalidate_buyer_history
+from .billing import verify_transaction_id
+
+DEFAULT_BATCH_SIZE = int(os.getenv('REVERIFY_BATCH_SIZE', '200'))
+DEFAULT_CONCURRENCY = int(os.getenv('REVERIFY_CONCURRENCY', '8'))
+
+# Runs queued by admin/reverify-claims/ execute here, one at a time, off the request thread.
+# Their progress lives in the cache, so any web process can report it.
+RUN_CACHE_TIMEOUT = int(os.getenv('REVERIFY_RUN_CACHE_TIMEOUT', str(24 * 3600)))
+# The active-run marker is renewed after every batch; a run whose process died frees it after this
+RUN_LOCK_TIMEOUT = int(os.getenv('REVERIFY_RUN_LOCK_TIMEOUT', '600'))
+ACTIVE_RUN_KEY = 'reverify-run:active'
+_run_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='claim-reverify-run')
+
+
+def _unverified_batches(batch_size, limit=None):
+    """
+    Yield batches of unverified claims in (created_at, id) order. Each batch is its
+    own keyset query, so memory stays flat and rows left unverified are not seen twice.
+    """
+    from ..models import Claim
+    queryset = (
+        Claim.objects.filter(claim_status='unverified')
+        .exclude(hospital_transaction_id__isnull=True).exclude(hospital_transaction_id='')
+        .select_related('buyer').order_by('created_at', 'id')
+    )
+    position = None
+    seen = 0
+    while limit is None or seen < limit:
+        page = queryset
+        if position:
+            page = page.filter(
+                Q(created_at__gt=position[0]) | Q(created_at=position[0], id__gt=position[1])
+            )
+        size = batch_size if limit is None else min(batch_size, limit - seen)
+        batch = list(page[:size])
+        if not batch:
+            return
+        seen += len(batch)
+        yield batch
+        position = (batch[-1].created_at, batch[-1].pk)
+
+
+def _check(claim):
+    try:
+        # Skip the result cache (these claims were cached as unverified or unreachable) and refresh it
+        return verify_transaction_id(claim.hospital_transaction_id, use_cache=False).get('success', False)
+    except Exception:
+        return False
+
+
+def _apply(batch, results):
+    """
+    Write one batch with a single bulk_update, skipping claims whose status changed meanwhile
+    """
+    from ..models import Claim
+    passed = [claim for claim, success in zip(batch, results) if success]
+    if not passed:
+        return 0
+
+    now = timezone.now()
+    with transaction.atomic():
+        still_unverified = set(
+            Claim.objects.select_for_update()
+            .filter(pk__in=[claim.pk for claim in passed], claim_status='unverified')
+            .values_list('pk', flat=True)
+        )
+        updated = [claim for claim in passed if claim.pk in still_unverified]
+        for claim in updated:
+            claim.claim_status = 'verified'
+            claim.verified_at = now
+        Claim.objects.bulk_update(updated, ['claim_status', 'verified_at'])
+
+    # bulk_update skips post_save, so cached buyer views are invalidated here
+    for wallet_address in {claim.buyer.wallet_address for claim in updated}:
+        invalidate_buyer_history(wallet_address)
+    if updated:
+        invalidate_admin_stats()
+    return len(updated)
+
+
+def reverify_unverified_claims(batch_size=None, concurrency=None, limit=None, progress=None):
+    """
+    Re-check unverified claims against the billing API, e.g. after an outage.
+
+    Claims are verified concurrently (concurrency threads) and each batch is written
+    with one bulk_update that sets claim_status='verified' and verified_at.
+    progress, if given, is called with the running totals after every batch.
+
+    Returns {'processed', 'verified', 'still_unverified', 'elapsed_seconds', 'claims_per_second'}
+    """
+    batch_size = batch_size or DEFAULT_BATCH_SIZE
+    concurrency = concurrency or DEFAULT_CONCURRENCY
+    started = time.perf_counter()
+    totals = {'processed': 0, 'verified': 0, 'still_unverified': 0}
+
+    def report():
+        elapsed = time.perf_counter() - started
+        return {
+            **totals,
+            'elapsed_seconds': round(elapsed, 3),
+            'claims_per_second': round(totals['processed'] / elapsed, 1) if elapsed else 0.0
+        }
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='claim-reverify') as pool:
+        for batch in _unverified_batches(batch_size, limit):
+            results = list(pool.map(_check, batch))
+            verified = _apply(batch, results)
+            totals['processed'] += len(batch)
+            totals['verified'] += verified
+            totals['still_unverified'] += len(batch) - verified
+            if progress:
+                progress(report())
+    return report()
+
+
+def _run_key(run_id):
+    return f'reverify-run:{run_id}'
+
+
+def get_reverification_run(run_id):
+    """
+    Progress of a queued run: {'run_id', 'status': queued | running | completed | failed,
+    'options', 'error', and the totals reverify_unverified_claims reports}, or None
+    """
+    return cache.get(_run_key(run_id))
+
+
+def _save_run(run, **fields):
+    run.update(fields)
+    cache.set(_run_key(run['run_id']), run, RUN_CACHE_TIMEOUT)
+    cache.touch(ACTIVE_RUN_KEY, RUN_LOCK_TIMEOUT)
+
+
+def _execute_run(run):
+    try:
+        _save_run(run, status='running')
+        result = reverify_unverified_claims(
+            **run['options'], progress=lambda totals: _save_run(run, **totals)
+        )
+        _save_run(run, status='completed', **result)
+    except Exception as e:
+        _save_run(run, status='failed', error=str(e))
+    finally:
+        if cache.get(ACTIVE_RUN_KEY) == run['run_id']:
+            cache.delete(ACTIVE_RUN_KEY)
+        close_old_connections()
+
+
+def start_reverification(**options):
+    """
+    Queue reverify_unverified_claims(**options) on a background thread.
+    Only one run is active at a time; returns (run, started), where run is the
+    already active one and started is False if a run is in progress
+    """
+    run_id = str(uuid.uuid4())
+    if not cache.add(ACTIVE_RUN_KEY, run_id, RUN_LOCK_TIMEOUT):
+        active = get_reverification_run(cache.get(ACTIVE_RUN_KEY))
+        if active is not None:
+            return active, False
+        # The marker expired or its run was evicted in between: take over
+        cache.set(ACTIVE_RUN_KEY, run_id, RUN_LOCK_TIMEOUT)
+
+    run = {
+        'run_id': run_id,
+        'status': 'queued',
+        'options': options,
+        'error': None,
+        'processed': 0,
+        'verified': 0,
+        'still_unverified': 0
+    }
+    cache.set(_run_key(run_id), run, RUN_CACHE_TIMEOUT)
+    # The thread updates its own copy, so the caller's dict does not change under it
+    _run_executor.submit(_execute_run, dict(run))
+    return run, True
@@ -0,0 +1,197 @@
+import base64
+import hashlib
+
+# Multicodec codes used by Storacha uploads
+RAW_CODEC = 0x55
+DAG_PB_CODEC = 0x70
+SHA2_256 = 0x12
+
+# Same settings as @storacha/upload-client: 1 MiB raw leaves, balanced layout with 1024 links per node
+CHUNK_SIZE = 1024 * 1024
+LAYOUT_WIDTH = 1024
+
+
+def _varint(value):
+    """
+    Encode an unsigned integer as a protobuf/multiformats varint
+    """
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def cid_bytes(codec, data):
+    """
+    Build binary CIDv1 (sha2-256) for a block
+    """
+    digest = hashlib.sha256(data).digest()
+    return _varint(1) + _varint(codec) + bytes([SHA2_256, len(digest)]) + digest
+
+
+def cid_to_string(raw_cid):
+    """
+    Encode binary CID as base32 multibase string (bafy... / bafk...)
+    """
+    return 'b' + base64.b32encode(raw_cid).decode('ascii').lower().rstrip('=')
+
+
+def cid_from_string(cid):
+    """
+    Decode base32 multibase CID string to binary CID
+    """
+    if not cid or cid[0] != 'b':
+        raise ValueError(f"Unsupported CID encoding: {cid}")
+    body = cid[1:].upper()
+    return base64.b32decode(body + '=' * (-len(body) % 8))
+
+
+def cid_codec(cid):
+    """
+    Multicodec of a CIDv1 string (RAW_CODEC, DAG_PB_CODEC, ...)
+    """
+    raw_cid = cid_from_string(cid)
+    pos = 1  # skip version varint (always 1)
+    codec = shift = 0
+    while True:
+        byte = raw_cid[pos]
+        pos += 1
+        codec |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return codec
+        shift += 7
+
+
+def content_matches_cid(cid, data):
+    """
+    Check fetched content against its CID: UnixFS files are re-encoded,
+    single blocks (raw, dag-cbor) are hashed directly
+    """
+    codec = cid_codec(cid)
+    if codec == DAG_PB_CODEC:
+        return compute_cid(data) == cid
+    return cid_to_string(cid_bytes(codec, data)) == cid
+
+
+def _pb_field(number, wire_type):
+    return _varint((number << 3) | wire_type)
+
+
+def _pb_bytes(number, value):
+    return _pb_field(number, 2) + _varint(len(value)) + value
+
+
+def _encode_file_node(links):
+    """
+    Encode a dag-pb UnixFS file node linking to (cid, dag_size, content_size) children
+    """
+    # UnixFS Data message: Type=File, filesize, blocksizes
+    unixfs = _pb_field(1, 0) + _varint(2)
+    unixfs += _pb_field(3, 0) + _varint(sum(link[2] for link in links))
+    for link in links:
+        unixfs += _pb_field(4, 0) + _varint(link[2])
+
+    # dag-pb canonical form writes Links before Data
+    node = b''
+    for link_cid, dag_size, _ in links:
+        pb_link = _pb_bytes(1, link_cid) + _pb_bytes(2, b'') + _pb_field(3, 0) + _varint(dag_size)
+        node += _pb_bytes(2, pb_link)
+    node += _pb_bytes(1, unixfs)
+    return node
+
+
+class UnixFSFileEncoder:
+    """
+    Incremental UnixFS file encoder producing the same root CID as Storacha's uploadFile.
+
+    Data is fed with write() in pieces of any size; only the current leaf and the
+    pending links of each tree level are kept in memory. Every encoded block is
+    passed to on_block(cid, block) so callers can stream them (e.g. into a CAR).
+    """
+
+    def __init__(self, on_block=None, chunk_size=CHUNK_SIZE, width=LAYOUT_WIDTH):
+        self.on_block = on_block
+        self.chunk_size = chunk_size
+        self.width = width
+        self.size = 0
+        self._buffer = bytearray()
+        self._levels = [[]]  # pending (cid, dag_size, content_size) per tree level
+        self._closed = False
+
+    def write(self, data):
+        if self._closed:
+            raise ValueError("Encoder already closed")
+        self.size += len(data)
+        self._buffer += data
+        while len(self._buffer) >= self.chunk_size:
+            chunk = bytes(self._buffer[:self.chunk_size])
+            del self._buffer[:self.chunk_size]
+            self._add_leaf(chunk)
+
+    def close(self):
+        """
+        Flush remaining data and return the root CID string
+        """
+        if self._closed:
+            raise ValueError("Encoder already closed")
+        self._closed = True
+
+        if self._buffer or self.size == 0:
+            self._add_leaf(bytes(self._buffer))
+            self._buffer = bytearray()
+
+        # A single chunk is uploaded as a plain raw block
+        if len(self._levels) == 1 and len(self._levels[0]) == 1:
+            return cid_to_string(self._levels[0][0][0])
+
+        depth = 0
+        while True:
+            pending = self._levels[depth]
+            if pending:
+                self._add_node(depth + 1, pending)
+                self._levels[depth] = []
+            if depth + 1 == len(self._levels) - 1 and len(self._levels[depth + 1]) == 1:
+                return cid_to_string(self._levels[depth + 1][0][0])
+            depth += 1
+
+    def _emit(self, codec, block):
+        raw_cid = cid_bytes(codec, block)
+        if self.on_block:
+            self.on_block(raw_cid, block)
+        return raw_cid
+
+    def _add_leaf(self, chunk):
+        raw_cid = self._emit(RAW_CODEC, chunk)
+        self._push(0, (raw_cid, len(chunk), len(chunk)))
+
+    def _add_node(self, level, links):
+        block = _encode_file_node(links)
+        raw_cid = self._emit(DAG_PB_CODEC, block)
+        dag_size = len(block) + sum(link[1] for link in links)
+        content_size = sum(link[2] for link in links)
+        if len(self._levels) <= level:
+            self._levels.append([])
+        self._levels[level].append((raw_cid, dag_size, content_size))
+
+    def _push(self, level, link):
+        self._levels[level].append(link)
+        # Full nodes are written as soon as they fill up so memory stays bounded
+        while len(self._levels[level]) >= self.width:
+            links = self._levels[level]
+            self._levels[level] = []
+            self._add_node(level + 1, links)
+            level += 1
+
+
+def compute_cid(data, on_block=None):
+    """
+    Compute the CID Storacha will assign to the given bytes
+    """
+    encoder = UnixFSFileEncoder(on_block=on_block)
+    encoder.write(data)
+    return encoder.close()
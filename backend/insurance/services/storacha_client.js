@@ -2,25 +2,35 @@
 
 // Storacha client service for Node.js
 // This script is called by the Python backend to interact with Storacha
+// Progress logs go to stderr; stdout carries only the JSON result
 
 const fs = require('fs');
 const path = require('path');
+const { Readable } = require('stream');
+
+// When set, uploads go to the local stand-in (see start_storacha_standin) instead of Storacha
+const STANDIN_URL = process.env.STORACHA_STANDIN_URL;
 
 // Check if @storacha/client is available
 let storachaClient;
-try {
-  storachaClient = require('@storacha/client');
-} catch (error) {
-  console.error('⚠️  @storacha/client not found. Please install it with: npm install @storacha/client');
-  process.exit(1);
+if (!STANDIN_URL) {
+  try {
+    storachaClient = require('@storacha/client');
+  } catch (error) {
+    console.error('⚠️  @storacha/client not found. Please install it with: npm install @storacha/client');
+    process.exit(1);
+  }
 }
 
 async function loginToStoracha(email) {
+  if (STANDIN_URL) {
+    return { client: null, account: null, success: true, message: `Using Storacha stand-in at ${STANDIN_URL}` };
+  }
   try {
-    console.log(`🔐 Logging into Storacha with email: ${email}`);
+    console.error(`🔐 Logging into Storacha with email: ${email}`);
     const client = await storachaClient.create();
     const account = await client.login(email);
-    console.log('✅ Storacha login successful');
+    console.error('✅ Storacha login successful');
     return { client, account, success: true, message: 'Storacha login successful' };
   } catch (error) {
     console.error('❌ Storacha login failed:', error.message);
@@ -29,8 +39,11 @@ async function loginToStoracha(email) {
 }
 
 async function getOrCreateSpace(client, account, spaceDid) {
+  if (STANDIN_URL) {
+    return { did: () => spaceDid };
+  }
   try {
-    console.log(`📂 Getting or creating space with DID: ${spaceDid}`);
+    console.error(`📂 Getting or creating space with DID: ${spaceDid}`);
     
     // Wait for payment plan (if needed)
     await account.plan.wait({ interval: 1000, timeout: 15 * 60 * 1000 });
@@ -38,13 +51,13 @@ async function getOrCreateSpace(client, account, spaceDid) {
     // Try to get existing space first
     try {
       const space = await client.getSpace(spaceDid);
-      console.log(`✅ Found existing space: ${spaceDid}`);
+      console.error(`✅ Found existing space: ${spaceDid}`);
       return space;
     } catch (error) {
       // Space doesn't exist, create new one with the specific DID
-      console.log(`🆕 Creating new space with DID: ${spaceDid}`);
+      console.error(`🆕 Creating new space with DID: ${spaceDid}`);
       const space = await client.createSpace('health-insurance-space', { account, did: spaceDid });
-      console.log(`✅ Space created: ${space.did()}`);
+      console.error(`✅ Space created: ${space.did()}`);
       return space;
     }
   } catch (error) {
@@ -53,22 +66,35 @@ async function getOrCreateSpace(client, account, spaceDid) {
   }
 }
 
-async function uploadDataToStoracha(client, space, data) {
+async function uploadToStandin(blob) {
+  const response = await fetch(`${STANDIN_URL}/upload`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/octet-stream' },
+    body: Buffer.from(await blob.arrayBuffer())
+  });
+  if (!response.ok) {
+    throw new Error(`Stand-in upload failed with status ${response.status}`);
+  }
+  const { cid } = await response.json();
+  return cid;
+}
+
+async function uploadBlobToStoracha(client, space, blob) {
   try {
-    console.log('📤 Uploading data to Storacha');
+    console.error('📤 Uploading data to Storacha');
+    
+    if (STANDIN_URL) {
+      return await uploadToStandin(blob);
+    }
     
     // Set current space
     await client.setCurrentSpace(space.did());
     
-    // Convert data to JSON string
-    const jsonData = JSON.stringify(data, null, 2);
-    const blob = new Blob([jsonData], { type: 'application/json' });
-    
     // Upload file
     const cidObj = await client.uploadFile(blob);
     const cid = cidObj.toString();
     
-    console.log(`✅ Data uploaded successfully. CID: ${cid}`);
+    console.error(`✅ Data uploaded successfully. CID: ${cid}`);
     return cid;
   } catch (error) {
     console.error('❌ Data upload failed:', error.message);
@@ -76,6 +102,62 @@ async function uploadDataToStoracha(client, space, data) {
   }
 }
 
+async function uploadCarToStandin(car) {
+  const response = await fetch(`${STANDIN_URL}/car`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/vnd.ipld.car' },
+    body: car
+  });
+  if (!response.ok) {
+    throw new Error(`Stand-in CAR upload failed with status ${response.status}`);
+  }
+  const { cid } = await response.json();
+  return cid;
+}
+
+async function uploadCarToStoracha(client, space, car) {
+  try {
+    console.error('📤 Uploading CAR to Storacha');
+    
+    if (STANDIN_URL) {
+      return await uploadCarToStandin(car);
+    }
+    
+    await client.setCurrentSpace(space.did());
+    const cidObj = await client.uploadCAR(new Blob([car], { type: 'application/vnd.ipld.car' }));
+    const cid = cidObj.toString();
+    
+    console.error(`✅ CAR uploaded successfully. CID: ${cid}`);
+    return cid;
+  } catch (error) {
+    console.error('❌ CAR upload failed:', error.message);
+    throw error;
+  }
+}
+
+// Records built by the Python backend are uploaded with upload_car; these operations
+// keep the JSON layout for callers outside it
+async function uploadRecord(client, space, kind, buyerProfile, fields) {
+  return uploadDataToStoracha(client, space, { type: kind, buyer: buyerProfile, [kind]: fields });
+}
+
+function buyerProfile(buyer) {
+  return {
+    id: buyer.id,
+    full_name: buyer.full_name,
+    email: buyer.email,
+    wallet_address: buyer.wallet_address,
+    national_id: buyer.national_id
+  };
+}
+
+async function uploadDataToStoracha(client, space, data) {
+  // Convert data to JSON string
+  const jsonData = JSON.stringify(data, null, 2);
+  const blob = new Blob([jsonData], { type: 'application/json' });
+  return uploadBlobToStoracha(client, space, blob);
+}
+
 async function handleLogin(data) {
   try {
     const { email } = data;
@@ -102,28 +184,14 @@ async function uploadClaimData(data) {
     // Get or create space with specific DID
     const space = await getOrCreateSpace(client, account, spaceDid);
     
-    // Prepare data structure
-    const uploadData = {
-      type: 'claim',
-      buyer: {
-        id: buyer.id,
-        full_name: buyer.full_name,
-        email: buyer.email,
-        wallet_address: buyer.wallet_address,
-        national_id: buyer.national_id
-      },
-      claim: {
-        claim_id: claim.claim_id,
-        amount: claim.amount,
-        status: claim.status,
-        description: claim.description,
-        created_at: claim.created_at
-      },
-      uploaded_at: new Date().toISOString()
-    };
-    
     // Upload data
-    const cid = await uploadDataToStoracha(client, space, uploadData);
+    const cid = await uploadRecord(client, space, 'claim', buyerProfile(buyer), {
+      claim_id: claim.claim_id,
+      amount: claim.amount,
+      status: claim.status,
+      description: claim.description,
+      created_at: claim.created_at
+    });
     
     return { cid };
   } catch (error) {
@@ -147,27 +215,13 @@ async function uploadPremiumData(data) {
     // Get or create space with specific DID
     const space = await getOrCreateSpace(client, account, spaceDid);
     
-    // Prepare data structure
-    const uploadData = {
-      type: 'premium',
-      buyer: {
-        id: buyer.id,
-        full_name: buyer.full_name,
-        email: buyer.email,
-        wallet_address: buyer.wallet_address,
-        national_id: buyer.national_id
-      },
-      premium: {
-        transaction_hash: premium.transaction_hash,
-        amount_eth: premium.amount_eth,
-        block_timestamp: premium.block_timestamp,
-        status: premium.status
-      },
-      uploaded_at: new Date().toISOString()
-    };
-    
     // Upload data
-    const cid = await uploadDataToStoracha(client, space, uploadData);
+    const cid = await uploadRecord(client, space, 'premium', buyerProfile(buyer), {
+      transaction_hash: premium.transaction_hash,
+      amount_eth: premium.amount_eth,
+      block_timestamp: premium.block_timestamp,
+      status: premium.status
+    });
     
     return { cid };
   } catch (error) {
@@ -176,6 +230,103 @@ async function uploadPremiumData(data) {
   }
 }
 
+async function uploadContent(data) {
+  try {
+    // Content is encoded (and its CID computed) by the Python backend; upload the bytes as-is
+    const { adminEmail, spaceDid, content } = data;
+    
+    // Login to Storacha
+    const loginResult = await loginToStoracha(adminEmail);
+    if (!loginResult.success) {
+      throw new Error(loginResult.error);
+    }
+    
+    const { client, account } = loginResult;
+    
+    // Get or create space with specific DID
+    const space = await getOrCreateSpace(client, account, spaceDid);
+    
+    // Upload exact bytes so the CID matches the one computed locally
+    const blob = new Blob([Buffer.from(content, 'base64')]);
+    const cid = await uploadBlobToStoracha(client, space, blob);
+    
+    return { cid };
+  } catch (error) {
+    console.error('❌ Content upload failed:', error.message);
+    throw error;
+  }
+}
+
+async function uploadCar(data) {
+  try {
+    // A CAR built by the Python backend (e.g. a DAG-CBOR record block); its root CID is kept as-is
+    const { adminEmail, spaceDid, content } = data;
+    
+    // Login to Storacha
+    const loginResult = await loginToStoracha(adminEmail);
+    if (!loginResult.success) {
+      throw new Error(loginResult.error);
+    }
+    
+    const { client, account } = loginResult;
+    
+    // Get or create space with specific DID
+    const space = await getOrCreateSpace(client, account, spaceDid);
+    
+    const cid = await uploadCarToStoracha(client, space, Buffer.from(content, 'base64'));
+    
+    return { cid };
+  } catch (error) {
+    console.error('❌ CAR upload failed:', error.message);
+    throw error;
+  }
+}
+
+async function uploadStream(data) {
+  try {
+    // Document bytes arrive on stdin; uploadFile encodes and shards them into CARs
+    // of at most shardSize bytes as they stream in, so the file is never fully buffered
+    const { adminEmail, spaceDid, shardSize } = data;
+    const stream = Readable.toWeb(process.stdin);
+    
+    if (STANDIN_URL) {
+      const response = await fetch(`${STANDIN_URL}/upload`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/octet-stream' },
+        body: stream,
+        duplex: 'half'
+      });
+      if (!response.ok) {
+        throw new Error(`Stand-in upload failed with status ${response.status}`);
+      }
+      const { cid } = await response.json();
+      return { cid };
+    }
+    
+    // Login to Storacha
+    const loginResult = await loginToStoracha(adminEmail);
+    if (!loginResult.success) {
+      throw new Error(loginResult.error);
+    }
+    
+    const { client, account } = loginResult;
+    
+    // Get or create space with specific DID
+    const space = await getOrCreateSpace(client, account, spaceDid);
+    await client.setCurrentSpace(space.did());
+    
+    console.error('📤 Streaming document to Storacha');
+    const cidObj = await client.uploadFile({ stream: () => stream }, { shardSize });
+    const cid = cidObj.toString();
+    console.error(`✅ Document uploaded successfully. CID: ${cid}`);
+    
+    return { cid };
+  } catch (error) {
+    console.error('❌ Document stream upload failed:', error.message);
+    throw error;
+  }
+}
+
 // Main function
 async function main() {
   try {
@@ -204,6 +355,15 @@ async function main() {
       case 'upload_premium':
         result = await uploadPremiumData(data);
         break;
+      case 'upload_content':
+        result = await uploadContent(data);
+        break;
+      case 'upload_car':
+        result = await uploadCar(data);
+        break;
+      case 'upload_stream':
+        result = await uploadStream(data);
+        break;
       default:
         throw new Error(`Unknown operation: ${operation}`);
     }
@@ -0,0 +1,154 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .storacha_cid import content_matches_cid, cid_codec, RAW_CODEC, DAG_PB_CODEC
+
+# Gateway URL templates tried in order; {cid} is replaced with the content CID
+DEFAULT_GATEWAYS = 'https://{cid}.ipfs.storacha.link,https://{cid}.ipfs.w3s.link'
+
+
+class GatewayError(Exception):
+    pass
+
+
+class StorachaGateway:
+    """
+    Reads content from IPFS gateways over a persistent connection pool.
+
+    - fetch(): hedged GET; if the first gateway has not answered after hedge_delay
+      seconds the same request is sent to the next one and the first good answer wins
+    - fetch_many(): concurrent fetch of many CIDs
+    - fetch_range() / fetch_large(): HTTP range requests, large blobs in parallel parts
+    """
+
+    def __init__(self, gateways=None, timeout=None, hedge_delay=None, pool_size=None, verify_cids=True):
+        if gateways is None:
+            gateways = os.getenv('STORACHA_GATEWAYS', DEFAULT_GATEWAYS).split(',')
+        self.gateways = [gateway.strip() for gateway in gateways if gateway.strip()]
+        self.timeout = timeout if timeout is not None else float(os.getenv('STORACHA_GATEWAY_TIMEOUT', '10'))
+        self.hedge_delay = hedge_delay if hedge_delay is not None else float(os.getenv('STORACHA_GATEWAY_HEDGE_DELAY', '0.5'))
+        self.pool_size = pool_size or int(os.getenv('STORACHA_GATEWAY_POOL_SIZE', '16'))
+        self.verify_cids = verify_cids
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=len(self.gateways) or 1, pool_maxsize=self.pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        # Separate pools so fetch_many tasks never wait on their own hedged requests
+        self._request_executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix='gateway-request')
+        self._fetch_executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix='gateway-fetch')
+
+    def _get(self, url, headers, method='GET'):
+        response = self.session.request(method, url, headers=headers, timeout=self.timeout)
+        if response.status_code not in (200, 206):
+            raise GatewayError(f"{url} returned status code {response.status_code}")
+        return response
+
+    def _hedged(self, cid, headers=None, method='GET'):
+        """
+        Send the request to gateways in turn, starting the next one whenever the
+        previous has failed or not answered within hedge_delay
+        """
+        if not self.gateways:
+            raise GatewayError("No Storacha gateways configured")
+
+        pending = set()
+        errors = []
+        remaining = list(self.gateways)
+        while remaining or pending:
+            if remaining:
+                url = remaining.pop(0).format(cid=cid)
+                pending.add(self._request_executor.submit(self._get, url, headers, method))
+            timeout = self.hedge_delay if remaining else None
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    response = future.result()
+                except Exception as e:
+                    errors.append(str(e))
+                    continue
+                # Slower duplicates are left to finish on their own
+                return response
+        raise GatewayError(f"All gateways failed for {cid}: {'; '.join(errors)}")
+
+    def _accept_headers(self, cid):
+        # IPLD blocks other than UnixFS files (e.g. DAG-CBOR records) are requested as raw block bytes
+        if cid_codec(cid) in (RAW_CODEC, DAG_PB_CODEC):
+            return None
+        return {'Accept': 'application/vnd.ipld.raw'}
+
+    def fetch(self, cid):
+        """
+        Fetch the full content of a CID, checking it hashes back to the same CID
+        """
+        data = self._hedged(cid, headers=self._accept_headers(cid)).content
+        if self.verify_cids and not content_matches_cid(cid, data):
+            raise GatewayError(f"Content returned for {cid} does not match its CID")
+        return data
+
+    def fetch_many(self, cids):
+        """
+        Fetch several CIDs concurrently
+        Returns {cid: bytes or Exception}
+        """
+        unique_cids = list(dict.fromkeys(cid for cid in cids if cid))
+        futures = {cid: self._fetch_executor.submit(self.fetch, cid) for cid in unique_cids}
+        results = {}
+        for cid, future in futures.items():
+            try:
+                results[cid] = future.result()
+            except Exception as e:
+                results[cid] = e
+        return results
+
+    def fetch_size(self, cid):
+        response = self._hedged(cid, method='HEAD')
+        return int(response.headers.get('Content-Length', 0))
+
+    def fetch_range(self, cid, start, end):
+        """
+        Fetch bytes start..end (inclusive) of a CID using an HTTP range request
+        """
+        response = self._hedged(cid, headers={'Range': f'bytes={start}-{end}'})
+        if response.status_code == 200:
+            # Gateway ignored the range and sent the whole body
+            return response.content[start:end + 1]
+        content_range = response.headers.get('Content-Range', '')
+        if not content_range.startswith(f'bytes {start}-') or len(response.content) > end - start + 1:
+            raise GatewayError(f"Unexpected range response for {cid}: {content_range}")
+        return response.content
+
+    def fetch_large(self, cid, part_size=4 * 1024 * 1024):
+        """
+        Fetch a large blob as parallel ranged parts and reassemble it
+        """
+        size = self.fetch_size(cid)
+        if size <= part_size:
+            return self.fetch(cid)
+
+        ranges = [(start, min(start + part_size, size) - 1) for start in range(0, size, part_size)]
+        futures = [self._fetch_executor.submit(self.fetch_range, cid, start, end) for start, end in ranges]
+        data = b''.join(future.result() for future in futures)
+        if self.verify_cids and not content_matches_cid(cid, data):
+            raise GatewayError(f"Content returned for {cid} does not match its CID")
+        return data
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway():
+    """
+    Shared gateway client so connections are reused across requests
+    """
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = StorachaGateway()
+        return _gateway
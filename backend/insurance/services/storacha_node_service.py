@@ -1,14 +1,122 @@
 import os
 import json
+import base64
 import subprocess
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+from . import ipld
+from .storacha_cid import compute_cid, cid_codec, UnixFSFileEncoder
+from .storacha_gateway import get_gateway
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+
+# Node.js bridge to @storacha/client
+NODE_SCRIPT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'storacha_client.js')
+
+# Streaming document uploads: bytes per read from the upload, max CAR shard size, overall timeout
+STREAM_CHUNK_SIZE = int(os.getenv('STORACHA_STREAM_CHUNK_SIZE', str(256 * 1024)))
+STREAM_SHARD_SIZE = int(os.getenv('STORACHA_STREAM_SHARD_SIZE', str(16 * 1024 * 1024)))
+STREAM_TIMEOUT = int(os.getenv('STORACHA_STREAM_TIMEOUT', '300'))
+
+# Deadline for a single Node.js bridge call (login, record upload)
+CALL_TIMEOUT = float(os.getenv('STORACHA_CALL_TIMEOUT', '15'))
+
+# Record encoding for claim/premium uploads: 'dag-cbor' (compact, buyer linked by CID) or 'json'
+RECORD_ENCODING = os.getenv('STORACHA_RECORD_ENCODING', 'dag-cbor')
+
+# Background uploads started by queue_claim_upload / queue_premium_upload
+_upload_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('STORACHA_UPLOAD_WORKERS', '2')),
+    thread_name_prefix='storacha-upload'
+)
+_in_flight = set()
+_in_flight_lock = threading.Lock()
+
+
+_probe_timer = None
+_probe_timer_lock = threading.Lock()
+
+
+def _retry_deferred_uploads():
+    # Runs on the upload pool so the call that closed the circuit is not held up
+    _upload_executor.submit(StorachaNodeService().retry_pending_uploads)
+
+
+def _probe_deferred_uploads():
+    global _probe_timer
+    with _probe_timer_lock:
+        _probe_timer = None
+    # One upload is the half-open probe: success closes the circuit, which queues the rest
+    _upload_executor.submit(StorachaNodeService().retry_pending_uploads, 1)
+
+
+def _schedule_deferred_probe():
+    """
+    Retry deferred uploads once the circuit turns half-open, so they do not wait for new
+    traffic to probe it; a failed probe opens the circuit again, which schedules the next one
+    """
+    global _probe_timer
+    with _probe_timer_lock:
+        if _probe_timer is not None:
+            return
+        _probe_timer = threading.Timer(storacha_breaker.recovery_timeout, _probe_deferred_uploads)
+        _probe_timer.daemon = True
+        _probe_timer.start()
+
+
+# Shared by every StorachaNodeService so all request threads see the same circuit.
+# Uploads rejected while it is open stay pending; they are probed with once the reset
+# timeout has passed and all retried once it closes.
+storacha_breaker = CircuitBreaker(
+    'storacha',
+    failure_threshold=int(os.getenv('STORACHA_BREAKER_FAILURES', '3')),
+    recovery_timeout=float(os.getenv('STORACHA_BREAKER_RESET_TIMEOUT', '30')),
+    on_close=_retry_deferred_uploads,
+    on_open=_schedule_deferred_probe
+)
+
+
+def buyer_upload_data(buyer):
+    """
+    The buyer profile stored alongside every claim and premium record
+    """
+    return {
+        'id': str(buyer.id),
+        'full_name': buyer.full_name,
+        'email': buyer.email,
+        'wallet_address': buyer.wallet_address,
+        'national_id': buyer.national_id
+    }
+
+
+def claim_upload_data(claim):
+    return {
+        'claim_id': claim.claim_id,
+        'amount': str(claim.claim_amount),
+        'status': claim.claim_status,
+        'description': claim.claim_description,
+        'created_at': claim.created_at.isoformat()
+    }
+
+
+def premium_upload_data(premium):
+    return {
+        'transaction_hash': premium.transaction_hash,
+        'amount_eth': str(premium.amount_eth),
+        'block_timestamp': premium.block_timestamp.isoformat(),
+        'status': premium.status
+    }
+
 
 class StorachaNodeService:
     def __init__(self):
         # Get Storacha admin email from environment variables
         self.admin_email = os.getenv('STORACHA_ADMIN_EMAIL', 'admin@healthinsurance.com')
         self.space_did = 'did:key:z6Mks2sfn2CcTcEXho661oVoB26hwjd4NdAR1UQ1JiHVdKPZ'
+        self.breaker = storacha_breaker
         
     def login(self, email):
         """
@@ -27,93 +135,409 @@ class StorachaNodeService:
             print(f"Error logging into Storacha: {str(e)}")
             raise e
     
+    @staticmethod
+    def encode_json_record(record):
+        """
+        Canonical JSON encoding of a record (sorted keys, no whitespace) so identical
+        data always produces the same bytes and therefore the same CID
+        """
+        return json.dumps(record, sort_keys=True, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+    def build_buyer_record(self, buyer_data):
+        return {
+            'type': 'buyer',
+            'id': buyer_data.get('id'),
+            'full_name': buyer_data.get('full_name'),
+            'email': buyer_data.get('email'),
+            'wallet_address': buyer_data.get('wallet_address'),
+            'national_id': buyer_data.get('national_id')
+        }
+
+    def build_claim_fields(self, claim_data):
+        return {
+            'claim_id': claim_data.get('claim_id'),
+            'amount': claim_data.get('amount'),
+            'status': claim_data.get('status'),
+            'description': claim_data.get('description'),
+            'created_at': claim_data.get('created_at')
+        }
+
+    def build_premium_fields(self, premium_data):
+        return {
+            'transaction_hash': premium_data.get('transaction_hash'),
+            'amount_eth': premium_data.get('amount_eth'),
+            'block_timestamp': premium_data.get('block_timestamp'),
+            'status': premium_data.get('status')
+        }
+
+    def prepare_record_uploads(self, kind, buyer_data, fields):
+        """
+        Encode a claim/premium record and compute CIDs locally, without any network call.
+
+        dag-cbor (default): the buyer profile is its own block, stored once and
+        linked by CID from every claim and premium record.
+        json: legacy layout with the buyer embedded in each record.
+
+        Returns [(kind, cid, content), ...] with the record itself last
+        """
+        if RECORD_ENCODING == 'json':
+            buyer = self.build_buyer_record(buyer_data)
+            buyer.pop('type')
+            content = self.encode_json_record({'type': kind, 'buyer': buyer, kind: fields})
+            return [(kind, compute_cid(content), content)]
+
+        buyer_cid, buyer_block = ipld.encode_block(self.build_buyer_record(buyer_data))
+        cid, block = ipld.encode_block({'type': kind, 'buyer': ipld.Link(buyer_cid), kind: fields})
+        return [('buyer', buyer_cid, buyer_block), (kind, cid, block)]
+
+    def decode_record(self, cid, data):
+        """
+        Decode a stored record; DAG-CBOR and legacy JSON records are both readable
+        """
+        if cid_codec(cid) == ipld.DAG_CBOR_CODEC:
+            return ipld.decode(data)
+        return json.loads(data)
+
     def upload_claim_data(self, buyer_data, claim_data):
         """
-        Upload claim data to Storacha using Node.js service
+        Upload claim data to Storacha and wait for the upload to finish
         """
         try:
-            # Prepare data for Node.js service
-            data = {
-                'adminEmail': self.admin_email,
-                'spaceDid': self.space_did,
-                'buyer': buyer_data,
-                'claim': claim_data
-            }
-            
-            # Call Node.js service
-            result = self._call_node_service('upload_claim', data)
-            return result.get('cid')
+            uploads = self.prepare_record_uploads('claim', buyer_data, self.build_claim_fields(claim_data))
+            for kind, cid, content in uploads:
+                self.store_content(kind, cid, content)
+            return uploads[-1][1]
         except Exception as e:
             print(f"Error uploading claim data to Storacha: {str(e)}")
             raise e
-    
+
     def upload_premium_data(self, buyer_data, premium_data):
         """
-        Upload premium data to Storacha using Node.js service
+        Upload premium data to Storacha and wait for the upload to finish
         """
         try:
-            # Prepare data for Node.js service
-            data = {
-                'adminEmail': self.admin_email,
-                'spaceDid': self.space_did,
-                'buyer': buyer_data,
-                'premium': premium_data
-            }
-            
-            # Call Node.js service
-            result = self._call_node_service('upload_premium', data)
-            return result.get('cid')
+            uploads = self.prepare_record_uploads('premium', buyer_data, self.build_premium_fields(premium_data))
+            for kind, cid, content in uploads:
+                self.store_content(kind, cid, content)
+            return uploads[-1][1]
         except Exception as e:
             print(f"Error uploading premium data to Storacha: {str(e)}")
             raise e
+
+    def queue_claim_upload(self, buyer_data, claim_data):
+        """
+        Return the claim record CID immediately and upload in the background
+        """
+        uploads = self.prepare_record_uploads('claim', buyer_data, self.build_claim_fields(claim_data))
+        for kind, cid, content in uploads:
+            self.queue_content(kind, cid, content)
+        return uploads[-1][1]
+
+    def queue_premium_upload(self, buyer_data, premium_data):
+        """
+        Return the premium record CID immediately and upload in the background
+        """
+        uploads = self.prepare_record_uploads('premium', buyer_data, self.build_premium_fields(premium_data))
+        for kind, cid, content in uploads:
+            self.queue_content(kind, cid, content)
+        return uploads[-1][1]
+
+    def _register_upload(self, kind, cid, content):
+        from ..models import StorachaUpload
+        upload, created = StorachaUpload.objects.get_or_create(
+            cid=cid,
+            defaults={'kind': kind, 'content': content, 'size': len(content)}
+        )
+        return upload
+
+    def upload_content(self, cid, content, breaker_checked=False):
+        """
+        Send encoded content to Storacha and check the returned CID matches the local one
+        DAG-CBOR blocks are uploaded as a single-block CAR so they keep their own CID
+        """
+        if cid_codec(cid) == ipld.DAG_CBOR_CODEC:
+            operation = 'upload_car'
+            content = ipld.encode_car(cid, [(cid, content)])
+        else:
+            operation = 'upload_content'
+        result = self._call_node_service(operation, {
+            'adminEmail': self.admin_email,
+            'spaceDid': self.space_did,
+            'content': base64.b64encode(content).decode('ascii')
+        }, breaker_checked=breaker_checked)
+        returned_cid = result.get('cid')
+        if returned_cid != cid:
+            raise Exception(f"CID mismatch: computed {cid}, Storacha returned {returned_cid}")
+        return cid
+
+    def store_content(self, kind, cid, content):
+        """
+        Upload already-encoded content unless its CID is known to be stored,
+        and verify Storacha returns the CID computed locally
+        """
+        upload = self._register_upload(kind, cid, content)
+        if upload.status == 'stored':
+            print(f"Skipping Storacha upload, CID already stored: {cid}")
+            return cid
+
+        # Fail fast while the circuit is open; the row stays pending for a later retry
+        self.breaker.before_call()
+        upload.attempts += 1
+        try:
+            self.upload_content(cid, content, breaker_checked=True)
+        except Exception as e:
+            upload.status = 'failed'
+            upload.last_error = str(e)
+            upload.save(update_fields=['status', 'last_error', 'attempts'])
+            raise e
+
+        upload.status = 'stored'
+        upload.content = None
+        upload.last_error = ''
+        upload.stored_at = timezone.now()
+        upload.save(update_fields=['status', 'content', 'last_error', 'attempts', 'stored_at'])
+        return cid
+
+    def queue_content(self, kind, cid, content):
+        """
+        Schedule store_content on the background upload pool.
+        The pending row stays in the database so a failed upload can be retried later.
+        """
+        upload = self._register_upload(kind, cid, content)
+        if upload.status == 'stored':
+            return cid
+
+        with _in_flight_lock:
+            if cid in _in_flight:
+                return cid
+            _in_flight.add(cid)
+
+        _upload_executor.submit(self._background_store, kind, cid, content)
+        return cid
+
+    def _background_store(self, kind, cid, content):
+        try:
+            self.store_content(kind, cid, content)
+            print(f"✅ Background upload to Storacha finished: {cid}")
+        except CircuitOpenError as e:
+            print(f"Deferred Storacha upload for {cid}: {str(e)}")
+        except Exception as e:
+            print(f"Background upload to Storacha failed for {cid}: {str(e)}")
+        finally:
+            with _in_flight_lock:
+                _in_flight.discard(cid)
+            close_old_connections()
+
+    def retry_pending_uploads(self, limit=500):
+        """
+        Queue uploads that were deferred or failed and still have their content
+        """
+        from ..models import StorachaUpload
+        try:
+            pending = StorachaUpload.objects.filter(
+                status__in=['pending', 'failed'], content__isnull=False
+            ).order_by('created_at')[:limit]
+            queued = 0
+            for upload in pending:
+                self.queue_content(upload.kind, upload.cid, bytes(upload.content))
+                queued += 1
+            if queued:
+                print(f"Queued {queued} deferred Storacha upload(s)")
+            return queued
+        finally:
+            close_old_connections()
+
+    def upload_status(self, cid):
+        """
+        'pending', 'stored' or 'failed' for a tracked upload, None if unknown
+        """
+        from ..models import StorachaUpload
+        return StorachaUpload.objects.filter(cid=cid).values_list('status', flat=True).first()
+
+    def status(self):
+        """
+        Circuit breaker state and upload queue counts for monitoring
+        """
+        from django.db.models import Count
+        from ..models import StorachaUpload
+        uploads = {
+            row['status']: row['count']
+            for row in StorachaUpload.objects.values('status').annotate(count=Count('cid'))
+        }
+        with _in_flight_lock:
+            in_flight = len(_in_flight)
+        return {
+            'circuit': self.breaker.snapshot(),
+            'call_timeout': CALL_TIMEOUT,
+            'uploads': {state: uploads.get(state, 0) for state in ('pending', 'stored', 'failed')},
+            'in_flight': in_flight
+        }
     
+    def upload_document_stream(self, file, chunk_size=STREAM_CHUNK_SIZE):
+        """
+        Stream a document (e.g. request.FILES['file']) to Storacha in fixed-size chunks.
+        The Node.js client shards it into CARs as it arrives, so neither process holds
+        the whole document; the root CID is computed alongside and verified.
+        Returns (cid, size)
+        """
+        self.breaker.before_call()
+        encoder = UnixFSFileEncoder()
+        temp_file_path = None
+        node_finished = False
+        try:
+            with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as temp_file:
+                json.dump({
+                    'adminEmail': self.admin_email,
+                    'spaceDid': self.space_did,
+                    'shardSize': STREAM_SHARD_SIZE
+                }, temp_file)
+                temp_file_path = temp_file.name
+
+            with tempfile.TemporaryFile() as stdout_file, tempfile.TemporaryFile() as stderr_file:
+                process = subprocess.Popen(
+                    ['node', NODE_SCRIPT_PATH, 'upload_stream', temp_file_path],
+                    stdin=subprocess.PIPE, stdout=stdout_file, stderr=stderr_file
+                )
+                try:
+                    if hasattr(file, 'chunks'):
+                        chunks = file.chunks(chunk_size)
+                    else:
+                        chunks = iter(lambda: file.read(chunk_size), b'')
+                    for chunk in chunks:
+                        encoder.write(chunk)
+                        process.stdin.write(chunk)
+                except BrokenPipeError:
+                    # Node exited early; its stderr explains why
+                    pass
+                finally:
+                    try:
+                        process.stdin.close()
+                    except BrokenPipeError:
+                        pass
+
+                try:
+                    process.wait(timeout=STREAM_TIMEOUT)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    process.wait()
+                    raise Exception(f"Streaming upload timed out after {STREAM_TIMEOUT}s")
+
+                if process.returncode != 0:
+                    stderr_file.seek(0)
+                    raise Exception(f"Node.js service failed: {stderr_file.read().decode(errors='replace')}")
+
+                stdout_file.seek(0)
+                stdout = stdout_file.read()
+
+            node_finished = True
+            self.breaker.record_success()
+            cid = encoder.close()
+            returned_cid = json.loads(stdout).get('cid')
+            if returned_cid != cid:
+                raise Exception(f"CID mismatch: computed {cid}, Storacha returned {returned_cid}")
+            return cid, encoder.size
+        except Exception as e:
+            if not node_finished:
+                # The Node.js upload itself failed or timed out
+                self.breaker.record_failure(e)
+            print(f"Error streaming document to Storacha: {str(e)}")
+            raise e
+        finally:
+            if temp_file_path:
+                os.unlink(temp_file_path)
+
     def fetch_from_cid(self, cid):
         """
-        Fetch data from Storacha using CID
+        Fetch data from Storacha using CID (through the pooled gateway client)
         """
         try:
-            # For now, we'll return a stub implementation
-            # In production, this would fetch from https://${cid}.ipfs.storacha.link
-            print(f"Fetching data from Storacha CID: {cid}")
-            # This would be implemented to fetch from the gateway
-            return None
+            return get_gateway().fetch(cid)
         except Exception as e:
             print(f"Error fetching data from Storacha: {str(e)}")
             raise e
+
+    def fetch_records(self, cids, include_buyers=False):
+        """
+        Fetch and decode several records concurrently
+        Buyer profiles hold personal data (national ID, email), so by default records keep
+        only their own claim/premium fields and the buyer's CID; include_buyers=True
+        resolves the profiles, for internal use only
+        Returns {cid: record or None}
+        """
+        records = {}
+        for cid, data in get_gateway().fetch_many(cids).items():
+            if isinstance(data, Exception):
+                print(f"Error fetching data from Storacha CID {cid}: {str(data)}")
+                records[cid] = None
+                continue
+            try:
+                records[cid] = self.decode_record(cid, data)
+            except ValueError:
+                records[cid] = None
+
+        if not include_buyers:
+            return {cid: record and self.without_buyer(record) for cid, record in records.items()}
+
+        # Buyer profiles are shared between records, so each is fetched once
+        buyer_links = {
+            record['buyer'] for record in records.values()
+            if record and isinstance(record.get('buyer'), ipld.Link)
+        }
+        if buyer_links:
+            buyers = self.fetch_records(buyer_links, include_buyers=True)
+            for record in records.values():
+                if record and isinstance(record.get('buyer'), ipld.Link):
+                    record['buyer_cid'] = str(record['buyer'])
+                    record['buyer'] = buyers.get(record['buyer'])
+        return records
     
-    def _call_node_service(self, operation, data):
+    @staticmethod
+    def without_buyer(record):
+        """
+        A claim/premium record without the buyer profile: only its own fields, plus the
+        buyer's CID for DAG-CBOR records (legacy JSON records embed the profile instead)
+        """
+        kind = record.get('type')
+        public = {'type': kind, kind: record.get(kind)}
+        if isinstance(record.get('buyer'), ipld.Link):
+            public['buyer_cid'] = str(record['buyer'])
+        return public
+
+    def _call_node_service(self, operation, data, breaker_checked=False):
         """
         Call Node.js service to perform Storacha operations
+        Calls go through the circuit breaker and are bounded by CALL_TIMEOUT
         """
+        if not breaker_checked:
+            self.breaker.before_call()
+        temp_file_path = None
         try:
             # Create temporary file with data
             with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as temp_file:
                 json.dump(data, temp_file)
                 temp_file_path = temp_file.name
             
-            # Get the path to the Node.js service script
-            node_script_path = os.path.join(
-                os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-                'services',
-                'storacha_client.js'
-            )
-            
             # Call Node.js service
             result = subprocess.run([
                 'node', 
-                node_script_path, 
+                NODE_SCRIPT_PATH, 
                 operation, 
                 temp_file_path
-            ], capture_output=True, text=True, timeout=30)
-            
-            # Clean up temporary file
-            os.unlink(temp_file_path)
+            ], capture_output=True, text=True, timeout=CALL_TIMEOUT)
             
             if result.returncode != 0:
                 raise Exception(f"Node.js service failed: {result.stderr}")
             
             # Parse result
-            return json.loads(result.stdout)
+            parsed = json.loads(result.stdout)
         except Exception as e:
+            self.breaker.record_failure(e)
             print(f"Error calling Node.js service: {str(e)}")
-            raise e
\ No newline at end of file
+            raise e
+        finally:
+            # Clean up temporary file
+            if temp_file_path:
+                os.unlink(temp_file_path)
+
+        self.breaker.record_success()
+        return parsed
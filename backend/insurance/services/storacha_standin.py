@@ -0,0 +1,253 @@
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from . import ipld
+from .storacha_cid import UnixFSFileEncoder, cid_bytes, cid_codec, cid_to_string
+
+# Bytes read from the socket at a time when receiving uploads
+READ_SIZE = 64 * 1024
+
+# Matches subdomain gateway hosts like bafy....ipfs.localhost:8787
+SUBDOMAIN_HOST = re.compile(r'^(?P<cid>b[a-z2-7]+)\.ipfs\.')
+
+
+class StorachaStandinServer(ThreadingHTTPServer):
+    """
+    Local stand-in for the Storacha upload service and IPFS gateway.
+
+    Uploads are content addressed with the same UnixFS settings the real client
+    uses, so returned CIDs match what Storacha would assign. Latency and random
+    failures can be injected to exercise timeouts and error handling.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, latency_ms=0, jitter_ms=0, failure_rate=0.0, seed=None):
+        super().__init__(address, StorachaStandinHandler)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+        self.files = {}
+        self.lock = threading.Lock()
+        self.stats = {'uploads': 0, 'fetches': 0, 'failures': 0, 'bytes_stored': 0}
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def inject_faults(self):
+        """
+        Sleep for the configured latency and decide whether this request should fail
+        """
+        with self.lock:
+            delay = self.latency_ms + self.random.uniform(0, self.jitter_ms)
+            fail = self.random.random() < self.failure_rate
+            if fail:
+                self.stats['failures'] += 1
+        if delay:
+            time.sleep(delay / 1000)
+        return fail
+
+    def store(self, chunks):
+        """
+        Store an upload received as an iterable of chunks, returning (cid, size)
+        """
+        encoder = UnixFSFileEncoder()
+        parts = []
+        for chunk in chunks:
+            encoder.write(chunk)
+            parts.append(chunk)
+        cid = encoder.close()
+        data = b''.join(parts)
+        with self.lock:
+            if cid not in self.files:
+                self.stats['bytes_stored'] += len(data)
+            self.files[cid] = data
+            self.stats['uploads'] += 1
+        return cid, len(data)
+
+    def store_car(self, data):
+        """
+        Store the blocks of a CAR upload, returning its root CID
+        Each block is checked against its CID; blocks are served as raw block bytes
+        """
+        roots, blocks = ipld.decode_car(data)
+        if len(roots) != 1:
+            raise ValueError("CAR uploads must have exactly one root")
+        for cid, block in blocks:
+            if cid_to_string(cid_bytes(cid_codec(cid), block)) != cid:
+                raise ValueError(f"Block does not match CID {cid}")
+        with self.lock:
+            for cid, block in blocks:
+                if cid not in self.files:
+                    self.stats['bytes_stored'] += len(block)
+                self.files[cid] = block
+            self.stats['uploads'] += 1
+        return roots[0]
+
+    def fetch(self, cid):
+        with self.lock:
+            data = self.files.get(cid)
+            if data is not None:
+                self.stats['fetches'] += 1
+        return data
+
+
+class StorachaStandinHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        # Keep benchmark output readable
+        pass
+
+    def _send_json(self, payload, status_code=200):
+        body = json.dumps(payload).encode()
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _iter_body(self):
+        """
+        Yield the request body in pieces, for both Content-Length and chunked uploads
+        """
+        if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            while True:
+                size = int(self.rfile.readline().split(b';', 1)[0].strip(), 16)
+                if size == 0:
+                    # Skip trailers up to the terminating blank line
+                    while self.rfile.readline() not in (b'\r\n', b'\n', b''):
+                        pass
+                    return
+                remaining = size
+                while remaining:
+                    piece = self.rfile.read(min(remaining, READ_SIZE))
+                    if not piece:
+                        return
+                    remaining -= len(piece)
+                    yield piece
+                self.rfile.readline()
+        else:
+            remaining = int(self.headers.get('Content-Length') or 0)
+            while remaining:
+                piece = self.rfile.read(min(remaining, READ_SIZE))
+                if not piece:
+                    return
+                remaining -= len(piece)
+                yield piece
+
+    def do_POST(self):
+        if self.path not in ('/upload', '/car'):
+            for _ in self._iter_body():
+                pass
+            return self._send_json({'error': 'Not found'}, 404)
+        if self.server.inject_faults():
+            for _ in self._iter_body():
+                pass
+            return self._send_json({'error': 'Injected upload failure'}, 503)
+
+        if self.path == '/car':
+            try:
+                cid = self.server.store_car(b''.join(self._iter_body()))
+            except (ValueError, IndexError, KeyError) as e:
+                return self._send_json({'error': f'Invalid CAR: {e}'}, 400)
+            return self._send_json({'cid': cid})
+
+        cid, size = self.server.store(self._iter_body())
+        return self._send_json({'cid': cid, 'size': size})
+
+    def do_GET(self):
+        if self.path == '/health':
+            with self.server.lock:
+                stats = dict(self.server.stats)
+            return self._send_json({'status': 'ok', **stats})
+        return self._serve_content()
+
+    def do_HEAD(self):
+        return self._serve_content(head=True)
+
+    def _serve_content(self, head=False):
+        cid = self._requested_cid()
+        if not cid:
+            return self._send_json({'error': 'Not found'}, 404)
+        if self.server.inject_faults():
+            return self._send_json({'error': 'Injected gateway failure'}, 502)
+
+        data = self.server.fetch(cid)
+        if data is None:
+            return self._send_json({'error': f'CID {cid} not found'}, 404)
+
+        byte_range = self._parse_range(len(data))
+        if byte_range is False:
+            self.send_response(416)
+            self.send_header('Content-Range', f'bytes */{len(data)}')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        if byte_range:
+            start, end = byte_range
+            body = data[start:end + 1]
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{end}/{len(data)}')
+        else:
+            body = data
+            self.send_response(200)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('Etag', f'"{cid}"')
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def _parse_range(self, size):
+        """
+        Parse a single "bytes=start-end" range header
+        Returns (start, end), None when absent, or False when unsatisfiable
+        """
+        header = self.headers.get('Range')
+        if not header or not header.startswith('bytes=') or ',' in header:
+            return None
+        start, _, end = header[len('bytes='):].partition('-')
+        if start:
+            start = int(start)
+            end = min(int(end), size - 1) if end else size - 1
+        elif end:
+            # Suffix range: last N bytes
+            start = max(size - int(end), 0)
+            end = size - 1
+        else:
+            return None
+        if start >= size or start > end:
+            return False
+        return start, end
+
+    def _requested_cid(self):
+        """
+        Support both path (/ipfs/<cid>) and subdomain (<cid>.ipfs.host) gateway styles
+        """
+        match = SUBDOMAIN_HOST.match(self.headers.get('Host', ''))
+        if match:
+            return match.group('cid')
+        parts = self.path.split('?', 1)[0].strip('/').split('/')
+        if len(parts) >= 2 and parts[0] == 'ipfs':
+            return parts[1]
+        return None
+
+
+def start_standin(host='127.0.0.1', port=0, **options):
+    """
+    Start the stand-in in a background thread and return the running server
+    """
+    server = StorachaStandinServer((host, port), **options)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
@@ -0,0 +1,50 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+
+from .caching import invalidate_admin_stats, invalidate_buyer_history
+from .models import Buyer, Claim, Premium
+
+
+def _buyer_wallet(instance):
+    # Use the related buyer when it is already loaded, otherwise fetch just the wallet
+    if type(instance).buyer.is_cached(instance):
+        return instance.buyer.wallet_address
+    return Buyer.objects.filter(pk=instance.buyer_id).values_list('wallet_address', flat=True).first()
+
+
+def _invalidate_on_commit(wallet_address):
+    # Bumped only once the change is visible: a read inside the transaction's window would
+    # otherwise rebuild the old history and cache it under the new version
+    transaction.on_commit(lambda: invalidate_buyer_history(wallet_address))
+
+
+@receiver(pre_save, sender=Buyer)
+def buyer_saving(sender, instance, **kwargs):
+    # Remember the stored wallet, so a changed address also invalidates the old one
+    instance._stored_wallet_address = None
+    if not instance._state.adding:
+        instance._stored_wallet_address = (
+            Buyer.objects.filter(pk=instance.pk).values_list('wallet_address', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Buyer)
+@receiver(post_delete, sender=Buyer)
+def buyer_changed(sender, instance, **kwargs):
+    transaction.on_commit(invalidate_admin_stats)
+    _invalidate_on_commit(instance.wallet_address)
+    stored_wallet_address = getattr(instance, '_stored_wallet_address', None)
+    if stored_wallet_address and stored_wallet_address != instance.wallet_address:
+        _invalidate_on_commit(stored_wallet_address)
+
+
+@receiver(post_save, sender=Claim)
+@receiver(post_delete, sender=Claim)
+@receiver(post_save, sender=Premium)
+@receiver(post_delete, sender=Premium)
+def buyer_record_changed(sender, instance, **kwargs):
+    transaction.on_commit(invalidate_admin_stats)
+    wallet_address = _buyer_wallet(instance)
+    if wallet_address:
+        _invalidate_on_commit(wallet_address)
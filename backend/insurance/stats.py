@@ -0,0 +1,100 @@
+from decimal import Decimal
+
+from django.db.models import Avg, Count, DurationField, ExpressionWrapper, F, Max, Min, Q, Sum
+from django.utils import timezone
+
+from .models import Buyer, Claim, Premium
+
+# Statuses still waiting on an admin decision (same grouping as the dashboard)
+OPEN_CLAIM_STATUSES = ('submitted', 'verified', 'unverified')
+
+
+def _seconds(duration):
+    return round(duration.total_seconds(), 3) if duration is not None else None
+
+
+def claim_stats():
+    """
+    Claim counts and amounts per status from one GROUP BY query
+    """
+    by_status = {
+        choice: {'count': 0, 'amount': Decimal('0')} for choice, _ in Claim.STATUS_CHOICES
+    }
+    rows = (
+        Claim.objects.order_by()
+        .values('claim_status')
+        .annotate(count=Count('id'), amount=Sum('claim_amount'))
+    )
+    for row in rows:
+        by_status[row['claim_status']] = {'count': row['count'], 'amount': row['amount'] or Decimal('0')}
+
+    return {
+        'total': sum(entry['count'] for entry in by_status.values()),
+        'total_amount': str(sum(entry['amount'] for entry in by_status.values())),
+        'open': sum(by_status[name]['count'] for name in OPEN_CLAIM_STATUSES if name in by_status),
+        'by_status': {
+            name: {'count': entry['count'], 'amount': str(entry['amount'])}
+            for name, entry in by_status.items()
+        }
+    }
+
+
+def premium_stats():
+    """
+    Premium counts and ETH totals, overall and for confirmed payments only
+    """
+    totals = Premium.objects.aggregate(
+        count=Count('id'),
+        total_eth=Sum('amount_eth'),
+        confirmed_count=Count('id', filter=Q(status='confirmed')),
+        confirmed_eth=Sum('amount_eth', filter=Q(status='confirmed'))
+    )
+    return {
+        'count': totals['count'],
+        'total_eth': str(totals['total_eth'] or Decimal('0')),
+        'confirmed_count': totals['confirmed_count'],
+        'confirmed_eth': str(totals['confirmed_eth'] or Decimal('0'))
+    }
+
+
+def buyer_stats():
+    """
+    Buyer counts; active buyers are enabled accounts with at least one premium payment
+    """
+    return Buyer.objects.aggregate(
+        total=Count('id'),
+        enabled=Count('id', filter=Q(is_active=True)),
+        active=Count('id', filter=Q(is_active=True, premium_payment_count__gt=0))
+    )
+
+
+def verification_latency():
+    """
+    Seconds from submission to verification over claims that have been verified
+    """
+    latency = ExpressionWrapper(F('verified_at') - F('created_at'), output_field=DurationField())
+    result = Claim.objects.filter(verified_at__isnull=False).aggregate(
+        count=Count('id'),
+        average=Avg(latency),
+        fastest=Min(latency),
+        slowest=Max(latency)
+    )
+    return {
+        'count': result['count'],
+        'average_seconds': _seconds(result['average']),
+        'min_seconds': _seconds(result['fastest']),
+        'max_seconds': _seconds(result['slowest'])
+    }
+
+
+def dashboard_stats():
+    """
+    All admin dashboard figures, computed in the database (four aggregate queries)
+    """
+    return {
+        'claims': claim_stats(),
+        'premiums': premium_stats(),
+        'buyers': buyer_stats(),
+        'verification_latency': verification_latency(),
+        'generated_at': timezone.now().isoformat()
+    }
@@ -0,0 +1,101 @@
+import uuid
+from datetime import timedelta
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from insurance.models import Buyer, Claim
+
+
+class AdminClaimListingTests(TestCase):
+    def setUp(self):
+        self.buyers = [
+            Buyer.objects.create(
+                wallet_address=f'0x{n}', national_id=f'N-{n}', full_name=f'Buyer {n}', email=f'b{n}@example.com'
+            )
+            for n in range(2)
+        ]
+        self.base = timezone.now().replace(microsecond=0)
+        # 20 claims on 4 timestamps, so every page boundary falls inside a tie
+        for n in range(20):
+            self._claim(n, self.base - timedelta(minutes=n // 5), 'verified' if n % 2 else 'unverified')
+
+    def _claim(self, n, created_at, claim_status, **fields):
+        claim = Claim.objects.create(
+            claim_id=f'CLM-{n:03d}', buyer=self.buyers[n % 2], claim_amount=n, claim_status=claim_status, **fields
+        )
+        # auto_now_add ignores the value passed to create()
+        Claim.objects.filter(pk=claim.pk).update(created_at=created_at)
+
+    def _page(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def _walk(self, url, **params):
+        claim_ids, cursors, cursor = [], [], None
+        while True:
+            page = self._page(url, **params, **({'cursor': cursor} if cursor else {}))
+            claim_ids.extend(claim['claim_id'] for claim in page['results'])
+            cursor = page['next_cursor']
+            if not cursor:
+                return claim_ids, cursors
+            cursors.append(cursor)
+
+    def _expected(self, queryset, newest_first=True):
+        prefix = '-' if newest_first else ''
+        return list(queryset.order_by(f'{prefix}created_at', f'{prefix}id').values_list('claim_id', flat=True))
+
+    def test_pages_cover_ties_exactly_once(self):
+        url = reverse('admin_get_claims')
+        for page_size in (3, 4, 7):
+            for order in ('newest', 'oldest'):
+                with self.subTest(page_size=page_size, order=order):
+                    claim_ids, _ = self._walk(url, page_size=page_size, order=order)
+                    self.assertEqual(claim_ids, self._expected(Claim.objects.all(), order == 'newest'))
+
+    def test_filtered_pages_cover_ties_exactly_once(self):
+        claim_ids, _ = self._walk(reverse('admin_get_claims'), page_size=3, status='verified', buyer='0x1')
+        self.assertEqual(claim_ids, self._expected(Claim.objects.filter(claim_status='verified', buyer=self.buyers[1])))
+
+    def test_cursor_is_stable_when_rows_are_added(self):
+        url = reverse('admin_get_claims')
+        _, cursors = self._walk(url, page_size=4)
+        before = [self._page(url, page_size=4, cursor=cursor)['results'] for cursor in cursors]
+
+        # New claims land before every cursor; the one sharing the newest timestamp has the
+        # highest id, so newest first it sorts ahead of the rows it ties with
+        self._claim(100, self.base, 'verified', id=uuid.UUID(int=2 ** 128 - 1))
+        self._claim(101, self.base + timedelta(minutes=1), 'verified')
+
+        after = [self._page(url, page_size=4, cursor=cursor)['results'] for cursor in cursors]
+        self.assertEqual(after, before)
+
+    def test_buyer_listing_pages(self):
+        wallets = []
+        cursor = None
+        while True:
+            page = self._page(reverse('admin_get_buyers'), page_size=1, **({'cursor': cursor} if cursor else {}))
+            wallets.extend(buyer['wallet_address'] for buyer in page['results'])
+            cursor = page['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual(sorted(wallets), ['0x0', '0x1'])
+
+    def test_bad_cursor_is_rejected(self):
+        response = self.client.get(reverse('admin_get_claims'), {'cursor': 'nope'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_created_date_bounds(self):
+        url = reverse('admin_get_claims')
+        first_day, last_day = (self.base - timedelta(minutes=3)).date().isoformat(), self.base.date().isoformat()
+        # A date upper bound includes the whole day
+        self.assertEqual(len(self._page(url, created_from=first_day, created_to=last_day, page_size=50)['results']), 20)
+        # A datetime upper bound is exact
+        self.assertEqual(
+            len(self._page(url, created_to=(self.base - timedelta(minutes=1)).isoformat(), page_size=50)['results']), 15
+        )
+        for bad in ('2025-02-30', 'yesterday'):
+            with self.subTest(created_to=bad):
+                self.assertEqual(self.client.get(url, {'created_to': bad}).status_code, 400)
@@ -0,0 +1,80 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from insurance.models import Buyer, Claim, Premium
+from insurance.services import reverification
+
+
+class AdminStatsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.buyer = Buyer.objects.create(
+            wallet_address='0xabc', national_id='N-1', full_name='Ada Buyer', email='ada@example.com',
+            premium_payment_count=1
+        )
+        Buyer.objects.create(wallet_address='0xdef', national_id='N-2', full_name='Bo Buyer', email='bo@example.com')
+        for number, (amount, claim_status) in enumerate([('10.00', 'verified'), ('5.50', 'unverified'), ('100.00', 'paid')]):
+            Claim.objects.create(
+                claim_id=f'CLM-{number}', buyer=self.buyer, claim_amount=amount, claim_status=claim_status,
+                hospital_transaction_id=f'TX-{number}'
+            )
+        claim = Claim.objects.get(claim_id='CLM-0')
+        Claim.objects.filter(pk=claim.pk).update(verified_at=claim.created_at + timedelta(seconds=90))
+        for number, premium_status in enumerate(['confirmed', 'confirmed', 'pending']):
+            Premium.objects.create(
+                buyer=self.buyer, transaction_hash=f'0x{number}', amount_eth='0.25', amount_wei='250000000000000000',
+                block_number=number, block_timestamp=timezone.now(), status=premium_status
+            )
+        self.url = reverse('admin_get_stats')
+
+    def _stats(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_figures(self):
+        stats = self._stats()
+
+        claims = stats['claims']
+        self.assertEqual((claims['total'], claims['open']), (3, 2))
+        # Compared as numbers: the decimal places of a SUM differ between databases
+        self.assertEqual(Decimal(claims['total_amount']), Decimal('115.50'))
+        self.assertEqual(claims['by_status']['verified']['count'], 1)
+        self.assertEqual(Decimal(claims['by_status']['verified']['amount']), Decimal('10'))
+        self.assertEqual(claims['by_status']['accepted'], {'count': 0, 'amount': '0'})
+        self.assertEqual(Decimal(stats['premiums']['confirmed_eth']), Decimal('0.5'))
+        self.assertEqual(stats['premiums']['count'], 3)
+        self.assertEqual(stats['premiums']['confirmed_count'], 2)
+        self.assertEqual(stats['buyers'], {'total': 2, 'enabled': 2, 'active': 1})
+        self.assertEqual(stats['verification_latency']['count'], 1)
+        self.assertEqual(stats['verification_latency']['average_seconds'], 90.0)
+
+    def test_cached_until_a_change_commits(self):
+        generated_at = self._stats()['generated_at']
+        self.assertEqual(self._stats()['generated_at'], generated_at)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            claim = Claim.objects.get(claim_id='CLM-0')
+            claim.claim_status = 'accepted'
+            claim.save()
+            # Not before the commit: a rebuild now would cache the old figures
+            self.assertEqual(self._stats()['generated_at'], generated_at)
+        for callback in callbacks:
+            callback()
+
+        stats = self._stats()
+        self.assertEqual(stats['claims']['by_status']['accepted']['count'], 1)
+        self.assertEqual(stats['claims']['open'], 1)
+
+    def test_bulk_reverification_invalidates(self):
+        self._stats()
+        with patch.object(reverification, 'verify_transaction_id', return_value={'success': True}):
+            reverification.reverify_unverified_claims()
+
+        self.assertEqual(self._stats()['claims']['by_status']['verified']['count'], 2)
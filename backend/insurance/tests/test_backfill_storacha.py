@@ -0,0 +1,70 @@
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TransactionTestCase
+
+from insurance.models import Buyer, Claim
+from insurance.services.storacha_node_service import StorachaNodeService
+
+START = datetime(2025, 1, 1, 12, 0, tzinfo=dt_timezone.utc)
+
+
+class BackfillStorachaTests(TransactionTestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.checkpoint = os.path.join(directory, 'checkpoint.json')
+
+        buyer = Buyer.objects.create(
+            wallet_address='0xabc', national_id='N-1', full_name='Ada Buyer', email='ada@example.com'
+        )
+        for minutes, claim_id in enumerate(['CLM-A', 'CLM-B', 'CLM-C', 'CLM-D']):
+            claim = Claim.objects.create(claim_id=claim_id, buyer=buyer, claim_amount='10.00')
+            # created_at is auto_now_add; the backfill reads rows in its order
+            Claim.objects.filter(pk=claim.pk).update(created_at=START + timedelta(minutes=minutes))
+
+    def _backfill(self, failing=()):
+        uploaded = []
+
+        def upload(service, buyer_data, claim_data):
+            if claim_data['claim_id'] in failing:
+                raise RuntimeError('upload rejected')
+            uploaded.append(claim_data['claim_id'])
+            return f'cid-{claim_data["claim_id"]}'
+
+        with patch.object(StorachaNodeService, 'upload_claim_data', autospec=True, side_effect=upload):
+            call_command(
+                'backfill_storacha', only='claims', batch_size=2, concurrency=1, checkpoint=self.checkpoint,
+                stdout=StringIO(), stderr=StringIO()
+            )
+        with open(self.checkpoint) as checkpoint_file:
+            return uploaded, json.load(checkpoint_file)['claims']
+
+    def test_checkpoint_stays_before_a_failed_row(self):
+        uploaded, state = self._backfill(failing={'CLM-B'})
+
+        self.assertEqual(uploaded, ['CLM-A', 'CLM-C', 'CLM-D'])
+        claim_a = Claim.objects.get(claim_id='CLM-A')
+        self.assertEqual(state['position'], {'created_at': claim_a.created_at.isoformat(), 'id': str(claim_a.pk)})
+        self.assertEqual((state['uploaded'], state['failed']), (3, 1))
+
+        # The next run retries the failed row; the rows uploaded after it are not read again
+        uploaded, state = self._backfill()
+
+        self.assertEqual(uploaded, ['CLM-B'])
+        self.assertEqual(Claim.objects.get(claim_id='CLM-B').storacha_cid, 'cid-CLM-B')
+        self.assertEqual(state['position']['id'], str(Claim.objects.get(claim_id='CLM-B').pk))
+
+    def test_checkpoint_moves_past_uploaded_rows(self):
+        uploaded, state = self._backfill()
+
+        self.assertEqual(uploaded, ['CLM-A', 'CLM-B', 'CLM-C', 'CLM-D'])
+        self.assertEqual(state['position']['id'], str(Claim.objects.get(claim_id='CLM-D').pk))
+        self.assertFalse(Claim.objects.filter(storacha_cid='').exists())
@@ -0,0 +1,51 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from insurance.models import Buyer, Claim
+from insurance.services import billing
+from insurance.services.reverification import reverify_unverified_claims
+
+UNPAID = {'success': False, 'data': {'status': 'unpaid'}}
+PAID = {'success': True, 'data': {'status': 'paid'}}
+
+
+class VerificationCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _answers(self, *results):
+        return patch.object(billing, '_verify_uncached', side_effect=list(results))
+
+    def test_negative_results_expire_sooner(self):
+        self.assertLess(billing._cache_timeout(UNPAID), billing._cache_timeout(PAID))
+        self.assertLess(billing._cache_timeout({'success': False, 'unavailable': True}), billing._cache_timeout(UNPAID))
+
+    def test_cached_result_is_reused(self):
+        with self._answers(UNPAID) as verify:
+            billing.verify_transaction_id('TX-1')
+            self.assertEqual(billing.verify_transaction_id('TX-1'), UNPAID)
+        verify.assert_called_once()
+
+    def test_bypass_refreshes_a_stale_negative(self):
+        with self._answers(UNPAID, PAID):
+            billing.verify_transaction_id('TX-1')
+            self.assertEqual(billing.verify_transaction_id('TX-1', use_cache=False), PAID)
+        # Later cached reads see the fresh answer
+        self.assertEqual(billing.verify_transaction_id('TX-1'), PAID)
+
+    def test_reverification_ignores_cached_negatives(self):
+        buyer = Buyer.objects.create(
+            wallet_address='0xabc', national_id='N-1', full_name='Ada Buyer', email='ada@example.com'
+        )
+        Claim.objects.create(
+            claim_id='CLM-1', buyer=buyer, claim_amount='10.00',
+            hospital_transaction_id='TX-1', claim_status='unverified'
+        )
+        with self._answers(UNPAID, PAID):
+            billing.verify_transaction_id('TX-1')
+            result = reverify_unverified_claims()
+
+        self.assertEqual(result['verified'], 1)
+        self.assertEqual(Claim.objects.get(claim_id='CLM-1').claim_status, 'verified')
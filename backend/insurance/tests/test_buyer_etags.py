@@ -0,0 +1,120 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from insurance.caching import buyer_etag, invalidate_buyer_history
+from insurance.models import Buyer, Claim, Premium
+
+
+class BuyerEtagTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.buyer = Buyer.objects.create(
+            wallet_address='0xabc', national_id='N-1', full_name='Ada Buyer', email='ada@example.com'
+        )
+        self.urls = [
+            reverse(name, args=['0xabc'])
+            for name in ('get_buyer_history', 'get_buyer_claims', 'fetch_buyer_premiums')
+        ]
+
+    def _etags(self):
+        etags = []
+        for url in self.urls:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            etags.append(response['ETag'])
+        return etags
+
+    def test_matching_etag_gets_304(self):
+        for url, etag in zip(self.urls, self._etags()):
+            with self.subTest(url=url):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response['ETag'], etag)
+                self.assertEqual(response.content, b'')
+                # Weak validators from proxies match too
+                self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=f'W/{etag}').status_code, 304)
+
+    def test_resources_have_distinct_etags(self):
+        self.assertEqual(len(set(self._etags())), len(self.urls))
+
+    def test_saving_a_claim_changes_every_etag(self):
+        before = self._etags()
+        with self.captureOnCommitCallbacks(execute=True):
+            Claim.objects.create(claim_id='CLM-1', buyer=self.buyer, claim_amount='10.00')
+
+        for url, etag in zip(self.urls, before):
+            with self.subTest(url=url):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotEqual(response['ETag'], etag)
+        history = self.client.get(self.urls[0]).json()
+        self.assertEqual([claim['claim_id'] for claim in history['claims']], ['CLM-1'])
+
+    def test_updates_that_skip_signals_are_invalidated_explicitly(self):
+        before = self._etags()
+        Buyer.objects.filter(pk=self.buyer.pk).update(full_name='Ada Renamed')
+        self.assertEqual(self._etags(), before)
+
+        invalidate_buyer_history('0xabc')
+        self.assertTrue(all(a != b for a, b in zip(self._etags(), before)))
+
+    def test_other_wallets_keep_their_etags(self):
+        before = self._etags()
+        with self.captureOnCommitCallbacks(execute=True):
+            Buyer.objects.create(wallet_address='0xdef', national_id='N-2', full_name='Bo Buyer', email='bo@example.com')
+        self.assertEqual(self._etags(), before)
+
+    def test_versions_change_only_when_the_save_commits(self):
+        before = self._etags()
+        with self.captureOnCommitCallbacks() as callbacks:
+            Claim.objects.create(claim_id='CLM-1', buyer=self.buyer, claim_amount='10.00')
+            # A read before the commit still gets the old version, so nothing it caches outlives the save
+            self.assertEqual(self._etags(), before)
+        for callback in callbacks:
+            callback()
+        self.assertTrue(all(a != b for a, b in zip(self._etags(), before)))
+
+    def test_changing_the_wallet_invalidates_the_old_one(self):
+        before = buyer_etag('history', '0xabc')
+        self.buyer.wallet_address = '0xnew'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.buyer.save()
+
+        self.assertNotEqual(buyer_etag('history', '0xabc'), before)
+
+
+class PremiumDataEtagTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        buyer = Buyer.objects.create(
+            wallet_address='0xabc', national_id='N-1', full_name='Ada Buyer', email='ada@example.com'
+        )
+        Premium.objects.create(
+            buyer=buyer, transaction_hash='0x1', amount_eth='0.1', block_timestamp=timezone.now(),
+            block_number=1, storacha_cid='bafypremium'
+        )
+        self.url = reverse('fetch_buyer_premiums', args=['0xabc'])
+
+    def _get(self, records, **headers):
+        with patch('insurance.views.storacha_service.fetch_records', return_value=records):
+            return self.client.get(self.url, {'include_data': 'true'}, **headers)
+
+    def test_no_etag_while_a_record_is_missing(self):
+        etag = self.client.get(self.url)['ETag'].replace('premiums', 'premiums-data')
+        response = self._get({}, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('ETag', response)
+        self.assertIsNone(response.json()[0]['storacha_data'])
+
+    def test_complete_records_get_an_etag(self):
+        records = {'bafypremium': {'type': 'premium', 'premium': {'transaction_hash': '0x1'}}}
+        etag = self._get(records)['ETag']
+
+        self.assertEqual(self._get(records, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        # Once the gateway fails again the stale ETag is not honoured
+        self.assertEqual(self._get({}, HTTP_IF_NONE_MATCH=etag).status_code, 200)
@@ -0,0 +1,61 @@
+import threading
+import time
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from insurance.services import storacha_node_service
+from insurance.services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+
+def _fail():
+    raise RuntimeError('down')
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def test_opens_probes_and_closes(self):
+        events = []
+        breaker = CircuitBreaker(
+            'test', failure_threshold=2, recovery_timeout=0.05,
+            on_open=lambda: events.append('open'), on_close=lambda: events.append('close')
+        )
+        for _ in range(2):
+            with self.assertRaises(RuntimeError):
+                breaker.call(_fail)
+        self.assertEqual(breaker.state, OPEN)
+        with self.assertRaises(CircuitOpenError):
+            breaker.call(lambda: 'ok')
+
+        time.sleep(0.06)
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertEqual(breaker.call(lambda: 'ok'), 'ok')
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertEqual(events, ['open', 'close'])
+
+    def test_failed_probe_opens_again(self):
+        opened = []
+        breaker = CircuitBreaker('test', failure_threshold=1, recovery_timeout=0.05, on_open=lambda: opened.append(1))
+        with self.assertRaises(RuntimeError):
+            breaker.call(_fail)
+        time.sleep(0.06)
+        with self.assertRaises(RuntimeError):
+            breaker.call(_fail)
+        self.assertEqual(breaker.state, OPEN)
+        self.assertEqual(len(opened), 2)
+
+
+class DeferredUploadProbeTests(SimpleTestCase):
+    def test_probe_is_scheduled_once_per_open(self):
+        probed = threading.Event()
+        with patch.object(storacha_node_service.storacha_breaker, 'recovery_timeout', 0.05), \
+                patch.object(storacha_node_service._upload_executor, 'submit', side_effect=lambda *a: probed.set()) as submit:
+            storacha_node_service._schedule_deferred_probe()
+            # Already scheduled: no second timer
+            storacha_node_service._schedule_deferred_probe()
+            self.assertTrue(probed.wait(2))
+            time.sleep(0.1)
+
+        submit.assert_called_once()
+        # The probe retries a single deferred upload
+        self.assertEqual(submit.call_args.args[1:], (1,))
+        self.assertIsNone(storacha_node_service._probe_timer)
@@ -0,0 +1,136 @@
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from insurance.models import Buyer, Claim
+
+# PDF body -> what extraction finds in it
+EXTRACTED = {
+    b'%PDF bill A': {'transaction_id': 'TX-A', 'amount': 100.5},
+    b'%PDF bill B': {'transaction_id': 'TX-B', 'amount': 20},
+    b'%PDF bill C': {'transaction_id': None, 'amount': None},
+    b'%PDF bill D': {'transaction_id': 'TX-D', 'amount': 5},
+    b'%PDF bill E': {'transaction_id': 'TX-E', 'amount': 7},
+}
+PAID = {'TX-A', 'TX-D', 'TX-E'}
+
+
+def _extract(path, document_hash):
+    with open(path, 'rb') as f:
+        return EXTRACTED[f.read()]
+
+
+def _pdf(name, body):
+    return SimpleUploadedFile(name, body, content_type='application/pdf')
+
+
+class ClaimBatchTests(TestCase):
+    def setUp(self):
+        self.upload_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.upload_dir, ignore_errors=True)
+        settings_override = override_settings(CLAIM_UPLOAD_DIR=self.upload_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        for patcher in (
+            patch('insurance.services.claim_batch.extract_document', side_effect=_extract),
+            patch('insurance.services.claim_batch.verify_transaction_id', side_effect=lambda tid: {'success': tid in PAID}),
+            # Storacha uploads are not part of these tests
+            patch('insurance.services.claim_batch.queue_claim_record'),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.buyer = Buyer.objects.create(
+            wallet_address='0xabc', national_id='N-1', full_name='Ada Buyer', email='ada@example.com'
+        )
+        self.other = Buyer.objects.create(
+            wallet_address='0xdef', national_id='N-2', full_name='Bo Buyer', email='bo@example.com'
+        )
+        self.url = reverse('submit_claim_batch')
+
+    def test_results_per_file(self):
+        Claim.objects.create(
+            claim_id='CLM-OLD', buyer=self.buyer, claim_amount='5.00', claim_status='verified',
+            hospital_transaction_id='TX-D', document_hash=hashlib.sha256(b'%PDF bill D').hexdigest()
+        )
+        response = self.client.post(self.url, {
+            'buyer_address': '0xabc',
+            'buyers': json.dumps({'e.pdf': '0xdef', 'f.pdf': '0x404'}),
+            'files': [
+                _pdf('a.pdf', b'%PDF bill A'),
+                _pdf('b.pdf', b'%PDF bill B'),
+                _pdf('a-again.pdf', b'%PDF bill A'),
+                _pdf('notes.txt', b'not a bill'),
+                _pdf('c.pdf', b'%PDF bill C'),
+                _pdf('d.pdf', b'%PDF bill D'),
+                _pdf('e.pdf', b'%PDF bill E'),
+                _pdf('f.pdf', b'%PDF bill E'),
+            ]
+        })
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['summary'], {'total': 8, 'created': 3, 'duplicate': 2, 'failed': 3})
+        results = data['results']
+        self.assertEqual([result['index'] for result in results], list(range(8)))
+        self.assertEqual(
+            [(result['file_name'], result['status'], result.get('verification_status')) for result in results],
+            [
+                ('a.pdf', 'created', 'verified'),
+                ('b.pdf', 'created', 'unverified'),
+                ('a-again.pdf', 'duplicate', 'verified'),
+                ('notes.txt', 'failed', None),
+                ('c.pdf', 'failed', None),
+                ('d.pdf', 'duplicate', 'verified'),
+                ('e.pdf', 'created', 'verified'),
+                ('f.pdf', 'failed', None),
+            ]
+        )
+        self.assertEqual(results[0]['claim_amount'], '100.50')
+        self.assertEqual(results[2]['claim_id'], results[0]['claim_id'])
+        self.assertEqual(results[5]['claim_id'], 'CLM-OLD')
+        self.assertEqual(results[3]['error'], 'Only PDF files are allowed')
+        self.assertEqual(results[4]['error'], 'Could not extract transaction ID from PDF file')
+        self.assertEqual(results[7]['error'], 'Buyer not found')
+
+        self.assertEqual(Claim.objects.filter(buyer=self.buyer).count(), 3)
+        self.assertEqual(Claim.objects.get(claim_id=results[6]['claim_id']).buyer, self.other)
+        # Spooled files are removed once the batch is done
+        self.assertEqual(os.listdir(self.upload_dir), [])
+
+    def test_zip_archive_with_manifest(self):
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, 'w') as zip_file:
+            zip_file.writestr('bills/a.pdf', b'%PDF bill A')
+            zip_file.writestr('bills/e.pdf', b'%PDF bill E')
+            zip_file.writestr('__MACOSX/bills/._a.pdf', b'resource fork')
+            zip_file.writestr('manifest.json', json.dumps({'e.pdf': '0xdef'}))
+        response = self.client.post(self.url, {
+            'buyer_address': '0xabc',
+            'archive': SimpleUploadedFile('bills.zip', archive.getvalue(), content_type='application/zip')
+        })
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual(
+            [(result['file_name'], result['buyer_address'], result['status']) for result in results],
+            [('bills/a.pdf', '0xabc', 'created'), ('bills/e.pdf', '0xdef', 'created')]
+        )
+
+    def test_too_many_files_rejects_the_batch(self):
+        with self.settings(CLAIM_BATCH_MAX_ITEMS=1):
+            response = self.client.post(self.url, {
+                'buyer_address': '0xabc',
+                'files': [_pdf('a.pdf', b'%PDF bill A'), _pdf('b.pdf', b'%PDF bill B')]
+            })
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Claim.objects.exists())
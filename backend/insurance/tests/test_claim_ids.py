@@ -0,0 +1,62 @@
+import re
+import threading
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from insurance import claim_ids
+
+CLAIM_ID = re.compile(r'^CLM-\d{17}-[0-9A-HJKMNP-TV-Z]{16}$')
+
+
+class ClaimIdTests(SimpleTestCase):
+    def setUp(self):
+        claim_ids._reset_after_fork()
+
+    def test_format_and_creation_time(self):
+        claim_id = claim_ids.new_claim_id()
+        self.assertRegex(claim_id, CLAIM_ID)
+        created = datetime.strptime(claim_id[4:18], '%Y%m%d%H%M%S').replace(tzinfo=timezone.utc)
+        self.assertLess(abs((datetime.now(timezone.utc) - created).total_seconds()), 5)
+
+    def test_ids_are_unique_and_sorted(self):
+        issued = claim_ids.new_claim_ids(10_000)
+        issued += [claim_ids.new_claim_id() for _ in range(1_000)]
+        self.assertEqual(len(set(issued)), len(issued))
+        self.assertEqual(sorted(issued), issued)
+
+    def test_unique_across_threads(self):
+        issued = []
+
+        def issue():
+            issued.extend(claim_ids.new_claim_id() for _ in range(2_000))
+
+        threads = [threading.Thread(target=issue) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(set(issued)), 16_000)
+
+    def test_clock_stepping_back_keeps_order(self):
+        with patch('insurance.claim_ids.time.time_ns', return_value=1_700_000_000_500 * 1_000_000):
+            first = claim_ids.new_claim_id()
+        with patch('insurance.claim_ids.time.time_ns', return_value=1_700_000_000_000 * 1_000_000):
+            second = claim_ids.new_claim_id()
+        self.assertLess(first, second)
+        # The earlier clock reading is not used
+        self.assertEqual(second[:22], first[:22])
+
+    def test_exhausted_millisecond_moves_to_the_next(self):
+        now_ns = 1_700_000_000_000 * 1_000_000
+        with patch('insurance.claim_ids.time.time_ns', return_value=now_ns), \
+                patch('insurance.claim_ids.secrets.randbits', side_effect=[2 ** 80 - 2, 0]):
+            issued = claim_ids.new_claim_ids(3)
+        self.assertEqual(sorted(issued), issued)
+        self.assertEqual([claim_id[4:21] for claim_id in issued], ['20231114221320000'] * 2 + ['20231114221320001'])
+        self.assertTrue(issued[2].endswith('-' + '0' * 16))
+
+    def test_sorts_after_older_ids_of_the_same_second(self):
+        claim_id = claim_ids.new_claim_id()
+        self.assertLess(f'CLM-{claim_id[4:18]}', claim_id)
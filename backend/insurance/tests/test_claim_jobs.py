@@ -0,0 +1,77 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.utils import timezone
+
+from insurance.models import Buyer, Claim, ClaimJob
+from insurance.services import claim_pipeline
+
+
+class ClaimJobLeaseTests(TestCase):
+    def setUp(self):
+        buyer = Buyer.objects.create(
+            wallet_address='0xabc', national_id='N-1', full_name='Ada Buyer', email='ada@example.com'
+        )
+        claim = Claim.objects.create(claim_id='CLM-1', buyer=buyer, claim_amount=0)
+        self.job = ClaimJob.objects.create(claim=claim)
+
+    def _as_worker(self, name):
+        return patch.object(claim_pipeline, 'worker_id', return_value=name)
+
+    def _age(self, seconds):
+        ClaimJob.objects.filter(pk=self.job.pk).update(updated_at=timezone.now() - timedelta(seconds=seconds))
+
+    def test_only_one_worker_claims_a_job(self):
+        with self._as_worker('web-1'):
+            self.assertEqual(claim_pipeline._claim(self.job.pk), 'queued')
+        with self._as_worker('web-2'):
+            self.assertIsNone(claim_pipeline._claim(self.job.pk))
+        self.assertEqual(ClaimJob.objects.get(pk=self.job.pk).worker, 'web-1')
+
+    def test_lapsed_lease_is_taken_over(self):
+        with self._as_worker('web-1'):
+            claim_pipeline._claim(self.job.pk)
+            job = ClaimJob.objects.get(pk=self.job.pk)
+        self._age(claim_pipeline.LEASE_SECONDS + 1)
+
+        self.assertEqual(list(claim_pipeline.resumable_jobs()), [self.job])
+        with self._as_worker('web-2'):
+            self.assertEqual(claim_pipeline._claim(self.job.pk), 'queued')
+        # The first worker's next stage change finds the job gone
+        with self._as_worker('web-1'), self.assertRaises(claim_pipeline.LeaseLost):
+            claim_pipeline._set_stage(job, 'extracting')
+        self.assertEqual(ClaimJob.objects.get(pk=self.job.pk).stage, 'queued')
+
+    def test_held_jobs_are_not_resumable(self):
+        with self._as_worker('web-1'):
+            claim_pipeline._claim(self.job.pk)
+        self.assertEqual(list(claim_pipeline.resumable_jobs()), [])
+
+    def test_finishing_releases_the_lease(self):
+        with self._as_worker('web-1'):
+            claim_pipeline._claim(self.job.pk)
+            job = ClaimJob.objects.get(pk=self.job.pk)
+            claim_pipeline._set_stage(job, 'completed', finished_at=timezone.now())
+        job.refresh_from_db()
+        self.assertEqual((job.stage, job.worker), ('completed', ''))
+
+    def test_start_job_skips_jobs_held_elsewhere(self):
+        with self._as_worker('web-1'):
+            claim_pipeline._claim(self.job.pk)
+        with self._as_worker('web-2'), patch.object(claim_pipeline._extract_executor, 'submit') as submit:
+            self.assertFalse(claim_pipeline.start_job(self.job.pk))
+            submit.assert_not_called()
+            self._age(claim_pipeline.LEASE_SECONDS + 1)
+            self.assertTrue(claim_pipeline.start_job(self.job.pk))
+            submit.assert_called_once()
+        claim_pipeline._release(self.job.pk)
+
+    def test_job_without_its_pdf_fails(self):
+        with self._as_worker('web-1'):
+            claim_pipeline._claim(self.job.pk)
+            job = ClaimJob.objects.select_related('claim').get(pk=self.job.pk)
+            self.assertIsNone(claim_pipeline._extract(job))
+        job.refresh_from_db()
+        self.assertEqual((job.stage, job.error), ('failed', 'Uploaded PDF file is no longer available'))
+        self.assertFalse(Claim.objects.filter(claim_id='CLM-1').exists())
@@ -0,0 +1,109 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+
+from insurance.exports import CLAIM_EXPORT_FIELDS
+from insurance.models import Buyer, Claim, Premium
+
+START = datetime(2025, 1, 1, 12, 0, tzinfo=dt_timezone.utc)
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.ada = Buyer.objects.create(
+            wallet_address='0xabc', national_id='N-1', full_name='Ada, Buyer', email='ada@example.com'
+        )
+        self.bo = Buyer.objects.create(wallet_address='0xdef', national_id='N-2', full_name='Bo Buyer', email='bo@example.com')
+        claims = [
+            ('CLM-3', self.ada, '30.00', 'accepted'),
+            ('CLM-1', self.ada, '10.50', 'verified'),
+            ('CLM-2', self.bo, '20.00', 'unverified'),
+        ]
+        for days, (claim_id, buyer, amount, claim_status) in enumerate(claims):
+            claim = Claim.objects.create(
+                claim_id=claim_id, buyer=buyer, claim_amount=amount, claim_status=claim_status,
+                claim_description='Line one\nline "two"'
+            )
+            # created_at is auto_now_add; the export is ordered by it
+            Claim.objects.filter(pk=claim.pk).update(created_at=START + timedelta(days=days))
+        Claim.objects.filter(claim_id='CLM-1').update(verified_at=START)
+
+    def _export(self, name, export_format, **params):
+        response = self.client.get(reverse(name, args=[export_format]), params)
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode()
+
+    def _csv(self, **params):
+        return list(csv.DictReader(io.StringIO(self._export('admin_export_claims', 'csv', **params))))
+
+    def test_claims_csv(self):
+        response = self.client.get(reverse('admin_export_claims', args=['csv']))
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertRegex(response['Content-Disposition'], r'^attachment; filename="claims-\d{14}\.csv"$')
+
+        rows = self._csv()
+        self.assertEqual(list(rows[0]), [name for name, _ in CLAIM_EXPORT_FIELDS])
+        self.assertEqual([row['claim_id'] for row in rows], ['CLM-3', 'CLM-1', 'CLM-2'])
+        first, second = rows[0], rows[1]
+        self.assertEqual(first['claim_amount'], '30.00')
+        self.assertEqual(first['buyer_full_name'], 'Ada, Buyer')
+        self.assertEqual(first['claim_description'], 'Line one\nline "two"')
+        self.assertEqual(first['buyer_id'], str(self.ada.id))
+        self.assertEqual(first['created_at'], '2025-01-01T12:00:00Z')
+        self.assertEqual(first['verified_at'], '')
+        self.assertEqual(second['verified_at'], '2025-01-01T12:00:00Z')
+
+    def test_claims_csv_filters(self):
+        cases = [
+            ({'status': 'verified,unverified'}, ['CLM-1', 'CLM-2']),
+            ({'buyer': '0xdef'}, ['CLM-2']),
+            ({'min_amount': '15', 'max_amount': '30'}, ['CLM-3', 'CLM-2']),
+            ({'created_from': '2025-01-02', 'created_to': '2025-01-02'}, ['CLM-1']),
+            ({'buyer': '0xabc', 'status': 'accepted'}, ['CLM-3']),
+            ({'buyer': '0x404'}, []),
+        ]
+        for params, expected in cases:
+            with self.subTest(params=params):
+                self.assertEqual([row['claim_id'] for row in self._csv(**params)], expected)
+
+    def test_claims_ndjson(self):
+        lines = self._export('admin_export_claims', 'ndjson', status='verified').splitlines()
+        self.assertEqual(len(lines), 1)
+        record = json.loads(lines[0])
+        self.assertEqual((record['claim_id'], record['claim_amount'], record['accepted_at']), ('CLM-1', '10.50', None))
+
+    def test_invalid_requests(self):
+        for export_format, params in (('xml', {}), ('csv', {'status': 'lost'}), ('csv', {'min_amount': 'lots'})):
+            with self.subTest(export_format=export_format, params=params):
+                response = self.client.get(reverse('admin_export_claims', args=[export_format]), params)
+                self.assertEqual(response.status_code, 400)
+
+    def test_large_exports_stream_in_pieces(self):
+        Claim.objects.bulk_create([
+            Claim(claim_id=f'CLM-BULK-{number:05d}', buyer=self.bo, claim_amount=Decimal('1.00'), claim_description='x' * 100)
+            for number in range(1500)
+        ])
+        response = self.client.get(reverse('admin_export_claims', args=['ndjson']))
+        pieces = list(response.streaming_content)
+
+        self.assertGreater(len(pieces), 1)
+        self.assertEqual(sum(piece.count(b'\n') for piece in pieces), 1503)
+
+    def test_premiums_csv(self):
+        for number, (buyer, premium_status) in enumerate([(self.ada, 'confirmed'), (self.bo, 'pending'), (self.ada, 'failed')]):
+            Premium.objects.create(
+                buyer=buyer, transaction_hash=f'0x{number}', amount_eth='0.1', amount_wei='100000000000000000',
+                block_number=number, block_timestamp=START, status=premium_status
+            )
+        content = self._export('admin_export_premiums', 'csv', buyer='0xabc', status='confirmed,failed')
+        rows = list(csv.DictReader(io.StringIO(content)))
+
+        self.assertEqual([row['transaction_hash'] for row in rows], ['0x0', '0x2'])
+        self.assertEqual(rows[0]['amount_eth'], '0.100000000000000000')
+        self.assertEqual(rows[0]['gas_used'], '')
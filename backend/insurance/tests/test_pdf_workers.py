@@ -0,0 +1,63 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+import PyPDF2
+from django.test import SimpleTestCase
+
+from insurance.services.pdf_workers import PdfExtractionPool, PdfRejected
+
+
+def _blank_pdf(pages):
+    writer = PyPDF2.PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=200, height=200)
+    output = io.BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+class PdfWorkerLimitTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        # Opening a FIFO nobody writes to blocks: a document that never finishes parsing
+        self.stuck = os.path.join(directory, 'stuck.pdf')
+        os.mkfifo(self.stuck)
+
+    def _pool(self, **limits):
+        pool = PdfExtractionPool(workers=1, **limits)
+        self.addCleanup(pool.shutdown)
+        return pool
+
+    def test_timeout_kills_the_worker(self):
+        pool = self._pool(timeout=1)
+
+        with self.assertRaisesRegex(PdfRejected, 'took longer than 1 seconds'):
+            pool.extract(self.stuck)
+        self.assertEqual(pool.stats['timeouts'], 1)
+        # The killed worker is replaced for the next document
+        self.assertEqual(pool.extract(_blank_pdf(1)), {'transaction_id': None, 'amount': None})
+        self.assertEqual(pool.stats['documents'], 1)
+
+    @unittest.skipUnless(os.path.exists('/proc/self/statm'), 'worker memory is read from /proc')
+    def test_memory_limit_kills_the_worker(self):
+        # Any interpreter is past 1 MB, so the first check while parsing trips the limit
+        pool = self._pool(timeout=30, max_rss_mb=1)
+
+        with self.assertRaisesRegex(PdfRejected, 'more than 1 MB of memory'):
+            pool.extract(self.stuck)
+        self.assertEqual(pool.stats['memory_kills'], 1)
+        self.assertEqual(pool.stats['timeouts'], 0)
+
+    def test_page_limit(self):
+        pool = self._pool(max_pages=2)
+
+        with self.assertRaisesRegex(PdfRejected, r'PDF has 3 pages \(limit 2\)'):
+            pool.extract(_blank_pdf(3))
+        self.assertEqual(pool.stats['rejected'], 1)
+        # A rejection by page count keeps the worker
+        self.assertEqual(pool.extract(_blank_pdf(2)), {'transaction_id': None, 'amount': None})
+        self.assertEqual((pool.stats['timeouts'], pool.stats['crashes']), (0, 0))
@@ -0,0 +1,81 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from insurance.models import Buyer, Claim
+from insurance.services import reverification
+
+
+def _run_now(fn, *args):
+    fn(*args)
+
+
+class AdminReverifyClaimsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        buyer = Buyer.objects.create(
+            wallet_address='0xabc', national_id='N-1', full_name='Ada Buyer', email='ada@example.com'
+        )
+        for number, transaction_id in enumerate(['TX-PAID', 'TX-UNPAID', 'TX-PAID-2']):
+            Claim.objects.create(
+                claim_id=f'CLM-{number}', buyer=buyer, claim_amount='10.00',
+                hospital_transaction_id=transaction_id, claim_status='unverified'
+            )
+        Claim.objects.create(
+            claim_id='CLM-ACCEPTED', buyer=buyer, claim_amount='10.00',
+            hospital_transaction_id='TX-PAID', claim_status='accepted'
+        )
+        patcher = patch(
+            'insurance.services.reverification.verify_transaction_id',
+            side_effect=lambda transaction_id, use_cache=True: {'success': transaction_id.startswith('TX-PAID')}
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.url = reverse('admin_reverify_claims')
+
+    def test_queues_a_run_and_reports_it(self):
+        with patch.object(reverification._run_executor, 'submit', side_effect=_run_now):
+            response = self.client.post(self.url, {'batch_size': 2}, content_type='application/json')
+
+        self.assertEqual(response.status_code, 202)
+        self.assertTrue(response.json()['started'])
+        run = self.client.get(response.json()['status_url']).json()
+        self.assertEqual(
+            {key: run[key] for key in ('status', 'processed', 'verified', 'still_unverified', 'error')},
+            {'status': 'completed', 'processed': 3, 'verified': 2, 'still_unverified': 1, 'error': None}
+        )
+        statuses = dict(Claim.objects.values_list('claim_id', 'claim_status'))
+        self.assertEqual(statuses, {
+            'CLM-0': 'verified', 'CLM-1': 'unverified', 'CLM-2': 'verified', 'CLM-ACCEPTED': 'accepted'
+        })
+        self.assertIsNotNone(Claim.objects.get(claim_id='CLM-0').verified_at)
+        # The finished run no longer blocks a new one
+        self.assertIsNone(cache.get(reverification.ACTIVE_RUN_KEY))
+
+    def test_one_run_at_a_time(self):
+        with patch.object(reverification._run_executor, 'submit') as submit:
+            first = self.client.post(self.url).json()
+            second = self.client.post(self.url).json()
+
+        submit.assert_called_once()
+        self.assertFalse(second['started'])
+        self.assertEqual(second['run_id'], first['run_id'])
+        self.assertEqual(Claim.objects.filter(claim_status='verified').count(), 0)
+
+    def test_failed_run_is_reported(self):
+        with patch.object(reverification, 'reverify_unverified_claims', side_effect=RuntimeError('database went away')), \
+                patch.object(reverification._run_executor, 'submit', side_effect=_run_now):
+            response = self.client.post(self.url)
+
+        run = self.client.get(response.json()['status_url']).json()
+        self.assertEqual((run['status'], run['error']), ('failed', 'database went away'))
+
+    def test_invalid_options(self):
+        response = self.client.post(self.url, {'limit': 0}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_unknown_run(self):
+        response = self.client.get(reverse('admin_reverify_claims_status', args=['00000000-0000-0000-0000-000000000000']))
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,44 @@
+from django.test import SimpleTestCase
+
+from insurance.services.storacha_cid import (
+    DAG_PB_CODEC, RAW_CODEC, UnixFSFileEncoder, cid_codec, compute_cid, content_matches_cid
+)
+
+# Root CIDs and block counts from UnixFS.encodeFile in @storacha/upload-client
+# for bytes(i % 251 for i in range(size))
+JS_ENCODER_CIDS = {
+    0: ('bafkreihdwdcefgh4dqkjv67uzcmw7ojee6xedzdetojuzjevtenxquvyku', 1),
+    5: ('bafkreiaixnpf23vkyecj5xqispjq5ubcwgsntnnurw2bjby7khe4wnjihu', 1),
+    1024 * 1024: ('bafkreidddocae7lltzjlkooe5a3tmiwsgazn7logjvqk7bzttsidpzhxne', 1),
+    1024 * 1024 + 1: ('bafybeidjogjfwuhbzwopgd4bn3skcf5m6oz72xshywcndzxgqb623nfclu', 3),
+    3 * 1024 * 1024 + 17: ('bafybeiengxwx4jlbvzg6ykpre7r5jxqvalq7yu4qbcj2w3gzacac33gjza', 5),
+}
+
+
+def _data(size):
+    return bytes(i % 251 for i in range(251)) * (size // 251) + bytes(range(size % 251))
+
+
+class ComputeCidTests(SimpleTestCase):
+    def test_matches_the_js_encoder(self):
+        for size, (expected, block_count) in JS_ENCODER_CIDS.items():
+            with self.subTest(size=size):
+                blocks = []
+                self.assertEqual(compute_cid(_data(size), on_block=lambda cid, block: blocks.append(cid)), expected)
+                self.assertEqual(len(blocks), block_count)
+
+    def test_incremental_writes_give_the_same_cid(self):
+        size = 3 * 1024 * 1024 + 17
+        data = _data(size)
+        encoder = UnixFSFileEncoder()
+        for start in range(0, size, 300_001):
+            encoder.write(data[start:start + 300_001])
+        self.assertEqual(encoder.close(), JS_ENCODER_CIDS[size][0])
+
+    def test_codec_and_content_check(self):
+        raw_cid = JS_ENCODER_CIDS[5][0]
+        file_cid = JS_ENCODER_CIDS[1024 * 1024 + 1][0]
+        self.assertEqual(cid_codec(raw_cid), RAW_CODEC)
+        self.assertEqual(cid_codec(file_cid), DAG_PB_CODEC)
+        self.assertTrue(content_matches_cid(file_cid, _data(1024 * 1024 + 1)))
+        self.assertFalse(content_matches_cid(raw_cid, b'other'))
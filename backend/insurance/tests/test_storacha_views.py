@@ -0,0 +1,84 @@
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from insurance.models import Buyer, Claim, Premium
+from insurance.services.storacha_node_service import StorachaNodeService
+
+
+class FetchAcceptedClaimsTests(TestCase):
+    def setUp(self):
+        self.buyer = Buyer.objects.create(
+            wallet_address='0xabc', national_id='N-1', full_name='Ada Buyer', email='ada@example.com'
+        )
+        Claim.objects.create(
+            claim_id='CLM-1', buyer=self.buyer, claim_amount='120.50',
+            claim_status='accepted', storacha_cid='bafyaccepted'
+        )
+        Claim.objects.create(claim_id='CLM-2', buyer=self.buyer, claim_amount='10.00', claim_status='verified')
+        self.url = reverse('fetch_accepted_claims')
+
+    def test_without_include_data(self):
+        with patch('insurance.views.storacha_service.fetch_records') as fetch_records:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([claim['claim_id'] for claim in response.json()], ['CLM-1'])
+        self.assertNotIn('storacha_data', response.json()[0])
+        fetch_records.assert_not_called()
+
+    def test_with_include_data(self):
+        record = {'claim': {'claim_id': 'CLM-1'}}
+        with patch('insurance.views.storacha_service.fetch_records', return_value={'bafyaccepted': record}) as fetch_records:
+            response = self.client.get(self.url, {'include_data': 'true'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]['storacha_data'], record)
+        fetch_records.assert_called_once_with(['bafyaccepted'])
+
+
+class RecordDataPrivacyTests(TestCase):
+    def setUp(self):
+        self.buyer = Buyer.objects.create(
+            wallet_address='0xabc', national_id='N-1', full_name='Ada Buyer', email='ada@example.com'
+        )
+        buyer_data = {
+            'id': str(self.buyer.id), 'full_name': self.buyer.full_name, 'email': self.buyer.email,
+            'wallet_address': self.buyer.wallet_address, 'national_id': self.buyer.national_id
+        }
+        fields = {'transaction_hash': '0x1', 'amount_eth': '0.1', 'block_timestamp': '2025-01-01T00:00:00', 'status': 'paid'}
+        (_, self.buyer_cid, buyer_block), (_, cid, block) = StorachaNodeService().prepare_record_uploads(
+            'premium', buyer_data, fields
+        )
+        self.fields = fields
+        self.blocks = {cid: block, self.buyer_cid: buyer_block}
+        Premium.objects.create(
+            buyer=self.buyer, transaction_hash='0x1', amount_eth='0.1', block_timestamp=timezone.now(),
+            block_number=1, storacha_cid=cid
+        )
+
+    def _fetch_many(self, cids):
+        return {cid: self.blocks[cid] for cid in cids}
+
+    def test_premium_records_leave_out_the_buyer_profile(self):
+        with patch('insurance.services.storacha_node_service.get_gateway') as get_gateway:
+            get_gateway.return_value.fetch_many.side_effect = self._fetch_many
+            response = self.client.get(reverse('fetch_buyer_premiums', args=['0xabc']), {'include_data': 'true'})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()[0]['storacha_data']
+        self.assertEqual(data, {'type': 'premium', 'premium': self.fields, 'buyer_cid': self.buyer_cid})
+        self.assertNotIn('N-1', response.content.decode())
+        self.assertNotIn('ada@example.com', response.content.decode())
+        # The buyer block is not even fetched
+        get_gateway.return_value.fetch_many.assert_called_once()
+
+    def test_buyer_profiles_only_on_request(self):
+        with patch('insurance.services.storacha_node_service.get_gateway') as get_gateway:
+            get_gateway.return_value.fetch_many.side_effect = self._fetch_many
+            cid = Premium.objects.get().storacha_cid
+            record = StorachaNodeService().fetch_records([cid], include_buyers=True)[cid]
+
+        self.assertEqual(record['buyer']['national_id'], 'N-1')
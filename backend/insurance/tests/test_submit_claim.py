@@ -0,0 +1,107 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from insurance.models import Buyer, Claim, ClaimJob
+from insurance.services import claim_pipeline
+
+BILL = b'%PDF-1.4\n1 0 obj << /Type /Catalog >> endobj\nTransaction ID: WM9pe6ds\nTotal: 1234.50\n%%EOF\n'
+
+
+class DuplicateClaimTests(TestCase):
+    def setUp(self):
+        self.upload_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.upload_dir, ignore_errors=True)
+        settings_override = override_settings(CLAIM_UPLOAD_DIR=self.upload_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.buyer = Buyer.objects.create(
+            wallet_address='0xabc', national_id='N-1', full_name='Ada Buyer', email='ada@example.com'
+        )
+        self.url = reverse('submit_claim')
+
+    def _submit(self, buyer_address='0xabc', content=BILL):
+        return self.client.post(self.url, {
+            'buyer_address': buyer_address,
+            'claim_description': 'Medical treatment',
+            'file': SimpleUploadedFile('bill.pdf', content, content_type='application/pdf')
+        })
+
+    def test_resubmitting_a_bill_returns_the_existing_claim(self):
+        first = self._submit()
+        self.assertEqual(first.status_code, 202)
+
+        second = self._submit()
+        self.assertEqual(second.status_code, 200)
+        data = second.json()
+        self.assertTrue(data['duplicate'])
+        self.assertEqual(data['claim_id'], first.json()['claim_id'])
+        self.assertEqual(data['job_id'], first.json()['job_id'])
+        self.assertEqual(data['status_url'], first.json()['status_url'])
+
+        self.assertEqual(Claim.objects.count(), 1)
+        self.assertEqual(ClaimJob.objects.count(), 1)
+        # The second copy is not kept on disk
+        self.assertEqual(os.listdir(self.upload_dir), [f"{data['job_id']}.pdf"])
+
+    def test_a_different_bill_is_a_new_claim(self):
+        self.assertEqual(self._submit().status_code, 202)
+        self.assertEqual(self._submit(content=BILL + b'\n').status_code, 202)
+        self.assertEqual(Claim.objects.count(), 2)
+
+    def test_the_same_bill_from_another_buyer_is_a_new_claim(self):
+        Buyer.objects.create(wallet_address='0xdef', national_id='N-2', full_name='Bo Buyer', email='bo@example.com')
+        self.assertEqual(self._submit().status_code, 202)
+        self.assertEqual(self._submit('0xdef').status_code, 202)
+
+    def test_claims_without_a_job_are_returned_as_completed(self):
+        Claim.objects.create(
+            claim_id='CLM-OLD', buyer=self.buyer, claim_amount='1234.50', claim_status='verified',
+            hospital_transaction_id='WM9pe6ds', document_hash=hashlib.sha256(BILL).hexdigest()
+        )
+        response = self._submit()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            {key: response.json()[key] for key in ('duplicate', 'claim_id', 'job_id', 'status', 'verification_status')},
+            {'duplicate': True, 'claim_id': 'CLM-OLD', 'job_id': None, 'status': 'completed', 'verification_status': 'verified'}
+        )
+        self.assertEqual(os.listdir(self.upload_dir), [])
+
+    def test_a_job_that_crashed_does_not_block_resubmission(self):
+        with self.captureOnCommitCallbacks():
+            first = self._submit().json()
+        job_id = first['job_id']
+        claim_pipeline._claim(job_id)
+        with patch.object(claim_pipeline, 'extract_document', side_effect=RuntimeError('worker pool broken')):
+            claim_pipeline._run_stage(claim_pipeline._extract, job_id)
+
+        job = ClaimJob.objects.get(pk=job_id)
+        self.assertEqual((job.stage, job.error, job.document_path, job.worker), ('failed', 'worker pool broken', '', ''))
+        self.assertFalse(Claim.objects.filter(claim_id=first['claim_id']).exists())
+        self.assertEqual(os.listdir(self.upload_dir), [])
+
+        with self.captureOnCommitCallbacks():
+            second = self._submit()
+        self.assertEqual(second.status_code, 202)
+        self.assertNotEqual(second.json()['claim_id'], first['claim_id'])
+
+    def test_a_crash_after_verification_keeps_the_claim(self):
+        with self.captureOnCommitCallbacks():
+            first = self._submit().json()
+        Claim.objects.filter(claim_id=first['claim_id']).update(claim_status='verified', hospital_transaction_id='WM9pe6ds')
+        job_id = first['job_id']
+        claim_pipeline._claim(job_id)
+        ClaimJob.objects.filter(pk=job_id).update(stage='uploading')
+        with patch.object(claim_pipeline, 'queue_claim_record', side_effect=RuntimeError('database went away')):
+            claim_pipeline._run_stage(claim_pipeline._verify_and_upload, job_id)
+
+        self.assertEqual(ClaimJob.objects.get(pk=job_id).stage, 'failed')
+        self.assertEqual(self._submit().json()['claim_id'], first['claim_id'])
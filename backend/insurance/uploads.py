@@ -0,0 +1,118 @@
+import hashlib
+import os
+
+from django.conf import settings
+from django.core.files.move import file_move_safe
+from django.core.files.uploadhandler import MemoryFileUploadHandler, TemporaryFileUploadHandler
+
+# Uploaded files carry the SHA-256 of their content (file.content_hash), computed
+# chunk by chunk as the request body is read, so duplicates are found without
+# reading the file a second time. Files above FILE_UPLOAD_MAX_MEMORY_SIZE are
+# spooled to a temporary file as they arrive instead of being kept in memory.
+
+
+class UploadTooLarge(Exception):
+    def __init__(self, size, max_size):
+        super().__init__(f'Upload is larger than the {max_size} byte limit')
+        self.size = size
+        self.max_size = max_size
+
+
+class ContentHashMixin:
+    def new_file(self, *args, **kwargs):
+        # Before super(): the memory handler raises StopFutureHandlers when it takes the file
+        self.content_hash = hashlib.sha256()
+        super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        remaining = super().receive_data_chunk(raw_data, start)
+        if remaining is None:
+            # This handler kept the chunk (the memory handler passes large files on)
+            self.content_hash.update(raw_data)
+        return remaining
+
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        if file is not None:
+            file.content_hash = self.content_hash.hexdigest()
+        return file
+
+
+class HashingMemoryFileUploadHandler(ContentHashMixin, MemoryFileUploadHandler):
+    pass
+
+
+class HashingTemporaryFileUploadHandler(ContentHashMixin, TemporaryFileUploadHandler):
+    pass
+
+
+def content_hash(file):
+    """
+    SHA-256 hex digest of an uploaded file; hashed here if no hashing upload handler ran
+    """
+    digest = getattr(file, 'content_hash', None)
+    if digest:
+        return digest
+    sha256 = hashlib.sha256()
+    for chunk in file.chunks():
+        sha256.update(chunk)
+    file.seek(0)
+    return sha256.hexdigest()
+
+
+def limit_upload_size(request, max_size):
+    """
+    Refuse a request body over max_size bytes from its Content-Length, before any of it is
+    read; call before request.data or request.FILES is touched. Django never reads past the
+    declared length (and parses no multipart body without one), so this bounds the upload.
+    Raises UploadTooLarge.
+    """
+    try:
+        declared = int(request.META.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        declared = 0
+    if declared > max_size:
+        raise UploadTooLarge(declared, max_size)
+
+
+def store_upload(file, name):
+    """
+    Keep an uploaded file in CLAIM_UPLOAD_DIR without reading it into memory: a file
+    already spooled to disk is moved there, a small in-memory one is written out.
+    Returns the path.
+    """
+    os.makedirs(settings.CLAIM_UPLOAD_DIR, exist_ok=True)
+    path = os.path.join(settings.CLAIM_UPLOAD_DIR, name)
+    if hasattr(file, 'temporary_file_path'):
+        file_move_safe(file.temporary_file_path(), path, allow_overwrite=True)
+    else:
+        with open(path, 'wb') as destination:
+            for chunk in file.chunks():
+                destination.write(chunk)
+    return path
+
+
+def spool_stream(stream, name, chunk_size=64 * 1024):
+    """
+    Copy a readable stream (e.g. a zip member) into CLAIM_UPLOAD_DIR, hashing it on the way.
+    Returns (path, sha256 hex digest, size).
+    """
+    os.makedirs(settings.CLAIM_UPLOAD_DIR, exist_ok=True)
+    path = os.path.join(settings.CLAIM_UPLOAD_DIR, name)
+    sha256 = hashlib.sha256()
+    size = 0
+    with open(path, 'wb') as destination:
+        for chunk in iter(lambda: stream.read(chunk_size), b''):
+            sha256.update(chunk)
+            size += len(chunk)
+            destination.write(chunk)
+    return path, sha256.hexdigest(), size
+
+
+def discard_upload(path):
+    if not path:
+        return
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -1,19 +1,22 @@
 from django.urls import path
 from .views import (
-    add_buyer, submit_claim, claim_history, verify_claim,
+    add_buyer, submit_claim, submit_claim_batch, claim_job_status, claim_history, verify_claim,
     upload_transaction_record, upload_claim_doc,
     admin_register, admin_login, admin_verify_wallet,
-    admin_get_claims, admin_get_buyers, admin_update_claim_status,
+    admin_get_claims, admin_get_buyers, admin_get_stats, admin_update_claim_status,
+    admin_reverify_claims, admin_reverify_claims_status, admin_export_claims, admin_export_premiums,
     buyer_register, buyer_login, buyer_verify_wallet,
     store_claim_document, get_buyer_history, get_buyer_claims,
     upload_claim_to_storacha, upload_premium_to_storacha,
-    fetch_accepted_claims, fetch_buyer_premiums
+    fetch_accepted_claims, fetch_buyer_premiums, storacha_status
 )
 
 urlpatterns = [
     # Buyer endpoints
     path('add-buyer/', add_buyer, name='add_buyer'),
     path('submit-claim/', submit_claim, name='submit_claim'),
+    path('submit-claim/batch/', submit_claim_batch, name='submit_claim_batch'),
+    path('claim-jobs/<uuid:job_id>/', claim_job_status, name='claim_job_status'),
     path('claim-history/', claim_history, name='claim_history'),
     path('verify-claim/', verify_claim, name='verify_claim'),
     path('upload-transaction/', upload_transaction_record, name='upload_transaction_record'),
@@ -30,13 +33,19 @@ urlpatterns = [
     path('admin/verify-wallet/', admin_verify_wallet, name='admin_verify_wallet'),
     path('admin/claims/', admin_get_claims, name='admin_get_claims'),
     path('admin/buyers/', admin_get_buyers, name='admin_get_buyers'),
+    path('admin/stats/', admin_get_stats, name='admin_get_stats'),
     path('admin/update-claim-status/', admin_update_claim_status, name='admin_update_claim_status'),
+    path('admin/reverify-claims/', admin_reverify_claims, name='admin_reverify_claims'),
+    path('admin/reverify-claims/<uuid:run_id>/', admin_reverify_claims_status, name='admin_reverify_claims_status'),
+    path('admin/export/claims/<str:export_format>/', admin_export_claims, name='admin_export_claims'),
+    path('admin/export/premiums/<str:export_format>/', admin_export_premiums, name='admin_export_premiums'),
     
     # Storacha endpoints
     path('upload-claim/', upload_claim_to_storacha, name='upload_claim_to_storacha'),
     path('upload-premium/', upload_premium_to_storacha, name='upload_premium_to_storacha'),
     path('fetch-accepted-claims/', fetch_accepted_claims, name='fetch_accepted_claims'),
     path('fetch-premiums/<str:wallet_address>/', fetch_buyer_premiums, name='fetch_buyer_premiums'),
+    path('storacha-status/', storacha_status, name='storacha_status'),
     
     # New centralized Storacha endpoints
     path('store-claim-document/', store_claim_document, name='store_claim_document'),
@@ -5,13 +5,30 @@ from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
-from .models import Buyer, Claim, Admin
+from .models import Buyer, Claim, ClaimDoc, Admin, Premium, ClaimJob
 from .serializers import BuyerSerializer, ClaimSerializer
+from .pagination import keyset_page
+from .filters import filter_claims, filter_premiums
+from .stats import dashboard_stats
+from .exports import EXPORT_FORMATS, CLAIM_EXPORT_FIELDS, PREMIUM_EXPORT_FIELDS, stream_rows
+from django.http import StreamingHttpResponse
+from django.conf import settings
+from django.core.cache import cache
+from .claim_ids import new_claim_id
+from .caching import ADMIN_STATS_KEY, buyer_history_cache_key, buyer_history_version, buyer_etag
+from .uploads import UploadTooLarge, content_hash, discard_upload, limit_upload_size, store_upload
+from django.utils.http import parse_etags
+from django.db import IntegrityError, transaction
+from django.urls import reverse
 import json
-import PyPDF2
-import re
-import requests
-from .services.storacha_node_service import StorachaNodeService
+from .services.storacha_node_service import (
+    StorachaNodeService, buyer_upload_data, claim_upload_data, premium_upload_data
+)
+from .services.circuit_breaker import CircuitOpenError
+from .services.billing import verify_transaction_id
+from .services.claim_pipeline import start_job
+from .services.claim_batch import BatchError, collect_batch_items, process_claim_batch
+from .services.reverification import get_reverification_run, start_reverification
 
 # Initialize Storacha service
 storacha_service = StorachaNodeService()
@@ -74,56 +91,96 @@ def store_claim_document(request):
             'error': f'Failed to store claim document: {str(e)}'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+def not_modified(request, etag):
+    """
+    304 response if the client's If-None-Match already has this ETag, else None
+    """
+    if_none_match = request.headers.get('If-None-Match')
+    if not if_none_match:
+        return None
+    # If-None-Match uses weak comparison, so W/"x" matches "x"
+    client_etags = [tag.removeprefix('W/') for tag in parse_etags(if_none_match)]
+    if etag in client_etags or '*' in client_etags:
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+    return None
+
+
+def with_etag(response, etag):
+    response['ETag'] = etag
+    # Let clients keep the payload but revalidate on every poll
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def build_buyer_history(buyer):
+    """
+    Assemble a buyer's premium payment and claim history
+    """
+    # Get premium payments
+    premiums = buyer.premiums.all().order_by('-created_at')
+    
+    # Get claims
+    claims = buyer.claim_set.all().order_by('-created_at')
+    
+    return {
+        'buyer_info': {
+            'wallet_address': buyer.wallet_address,
+            'full_name': buyer.full_name,
+            'email': buyer.email,
+            'total_premiums_paid': str(buyer.total_premiums_paid),
+            'premium_payment_count': buyer.premium_payment_count,
+            'last_premium_payment': buyer.last_premium_payment
+        },
+        'premium_payments': [
+            {
+                'amount_eth': str(premium.amount_eth),
+                'transaction_hash': premium.transaction_hash,
+                'block_timestamp': premium.block_timestamp,
+                'status': premium.status
+            }
+            for premium in premiums
+        ],
+        'claims': [
+            {
+                'claim_id': claim.claim_id,
+                'amount': str(claim.claim_amount),
+                'status': claim.claim_status,
+                'description': claim.claim_description,
+                'created_at': claim.created_at,
+                'hospital_transaction_id': claim.hospital_transaction_id,
+                'verified_at': claim.verified_at,
+                'accepted_at': claim.accepted_at,
+                'status_message': get_claim_status_message(claim)
+            }
+            for claim in claims
+        ],
+        'claim_documents': buyer.claim_documents or []
+    }
+
+
 @api_view(['GET'])
 def get_buyer_history(request, wallet_address):
     """
     Get buyer's premium payment and claim history
+    Served from the cache until a Buyer, Claim or Premium save invalidates it;
+    If-None-Match with the current ETag gets 304
     """
     try:
-        buyer = get_object_or_404(Buyer, wallet_address=wallet_address)
+        version = buyer_history_version(wallet_address)
+        etag = buyer_etag('history', wallet_address, version)
+        response = not_modified(request, etag)
+        if response:
+            return response
         
-        # Get premium payments
-        premiums = buyer.premiums.all().order_by('-created_at')
+        cache_key = buyer_history_cache_key(wallet_address, version)
+        history_data = cache.get(cache_key)
         
-        # Get claims
-        claims = buyer.claim_set.all().order_by('-created_at')
+        if history_data is None:
+            buyer = get_object_or_404(Buyer, wallet_address=wallet_address)
+            history_data = build_buyer_history(buyer)
+            cache.set(cache_key, history_data, settings.BUYER_HISTORY_CACHE_TIMEOUT)
         
-        history_data = {
-            'buyer_info': {
-                'wallet_address': buyer.wallet_address,
-                'full_name': buyer.full_name,
-                'email': buyer.email,
-                'total_premiums_paid': str(buyer.total_premiums_paid),
-                'premium_payment_count': buyer.premium_payment_count,
-                'last_premium_payment': buyer.last_premium_payment
-            },
-            'premium_payments': [
-                {
-                    'amount_eth': str(premium.amount_eth),
-                    'transaction_hash': premium.transaction_hash,
-                    'block_timestamp': premium.block_timestamp,
-                    'status': premium.status
-                }
-                for premium in premiums
-            ],
-            'claims': [
-                {
-                    'claim_id': claim.claim_id,
-                    'amount': str(claim.claim_amount),
-                    'status': claim.claim_status,
-                    'description': claim.claim_description,
-                    'created_at': claim.created_at,
-                    'hospital_transaction_id': claim.hospital_transaction_id,
-                    'verified_at': claim.verified_at,
-                    'accepted_at': claim.accepted_at,
-                    'status_message': get_claim_status_message(claim)
-                }
-                for claim in claims
-            ],
-            'claim_documents': buyer.claim_documents or []
-        }
-        
-        return Response(history_data, status=status.HTTP_200_OK)
+        return with_etag(Response(history_data, status=status.HTTP_200_OK), etag)
         
     except Exception as e:
         return Response({
@@ -151,14 +208,20 @@ def get_claim_status_message(claim):
 def get_buyer_claims(request, wallet_address):
     """
     Get buyer's claim documents from their record
+    If-None-Match with the current ETag gets 304 without loading the buyer
     """
     try:
+        etag = buyer_etag('claims', wallet_address)
+        response = not_modified(request, etag)
+        if response:
+            return response
+        
         buyer = get_object_or_404(Buyer, wallet_address=wallet_address)
         
-        return Response({
+        return with_etag(Response({
             'buyer_address': buyer.wallet_address,
             'claim_documents': buyer.claim_documents or []
-        }, status=status.HTTP_200_OK)
+        }, status=status.HTTP_200_OK), etag)
         
     except Exception as e:
         return Response({
@@ -180,8 +243,13 @@ def submit_claim(request):
         "claim_description": "Medical treatment",
         "file": PDF file
     }
+    Only validates and stores the claim and file, then returns 202 with a job id.
+    Extraction, verification and the Storacha upload run in the background;
+    poll status_url (claim_job_status) for the outcome.
     """
     try:
+        # Before the body is read: oversized uploads are refused from Content-Length
+        limit_upload_size(request, settings.CLAIM_UPLOAD_MAX_BYTES)
         buyer_address = request.data.get('buyer_address')
         claim_description = request.data.get('claim_description')
         file = request.FILES.get('file')
@@ -200,182 +268,192 @@ def submit_claim(request):
         # Get buyer
         buyer = get_object_or_404(Buyer, wallet_address=buyer_address)
         
-        # Extract claim data from PDF
-        claim_data = extract_claim_data_from_pdf(file)
-        transaction_id = claim_data.get('transaction_id')
-        pdf_amount = claim_data.get('amount')
-        
-        if not transaction_id:
-            return Response({
-                'error': 'Could not extract transaction ID from PDF file'
-            }, status=status.HTTP_400_BAD_REQUEST)
-        
-        # Use amount from PDF if available, otherwise use form data
-        claim_amount = pdf_amount if pdf_amount is not None else request.data.get('claim_amount', '0')
-        
-        # Create claim
-        claim_id = f"CLM-{timezone.now().strftime('%Y%m%d%H%M%S')}"
-        claim = Claim.objects.create(
-            claim_id=claim_id,
-            buyer=buyer,
-            claim_amount=claim_amount,
-            claim_description=claim_description,
-            hospital_transaction_id=transaction_id,
-            claim_status='submitted'
-        )
+        # The same bill from the same buyer (retry, double click, resubmission) returns the existing claim
+        document_hash = content_hash(file)
+        existing = Claim.objects.filter(buyer=buyer, document_hash=document_hash).first()
+        if existing is not None:
+            return duplicate_claim_response(request, existing)
         
-        # Verify transaction ID
-        verification_result = verify_transaction_id(transaction_id)
-        claim_status = 'verified' if verification_result.get('success', False) else 'unverified'
-        claim.claim_status = claim_status
-        if claim_status == 'verified':
-            claim.verified_at = timezone.now()
-        claim.save()
+        # Amount from the PDF replaces this once it has been extracted
+        claim_amount = request.data.get('claim_amount', '0')
         
-        # Upload claim data to Storacha
+        # Create claim and its processing job together
+        claim_id = new_claim_id()
+        job = ClaimJob(file_name=file.name)
+        # Moved (or, if small, written) to disk; the job's worker memory-maps it from there
+        job.document_path = store_upload(file, f'{job.id}.pdf')
         try:
-            # Prepare buyer data
-            buyer_data = {
-                'id': str(buyer.id),
-                'full_name': buyer.full_name,
-                'email': buyer.email,
-                'wallet_address': buyer.wallet_address,
-                'national_id': buyer.national_id
-            }
-            
-            # Prepare claim data
-            claim_data = {
-                'claim_id': claim.claim_id,
-                'amount': str(claim.claim_amount),
-                'status': claim.claim_status,
-                'description': claim.claim_description,
-                'created_at': claim.created_at.isoformat()
-            }
-            
-            # Upload to Storacha
-            cid = storacha_service.upload_claim_data(buyer_data, claim_data)
-            
-            # Save CID to claim
-            claim.storacha_cid = cid
-            claim.save(update_fields=['storacha_cid'])
-        except Exception as e:
-            print(f"Error uploading claim to Storacha: {str(e)}")
-            # Continue anyway - the claim was created successfully
+            with transaction.atomic():
+                claim = Claim.objects.create(
+                    claim_id=claim_id,
+                    buyer=buyer,
+                    claim_amount=claim_amount,
+                    claim_description=claim_description,
+                    claim_status='submitted',
+                    document_hash=document_hash
+                )
+                job.claim = claim
+                job.save()
+                transaction.on_commit(lambda: start_job(job.id))
+        except IntegrityError:
+            discard_upload(job.document_path)
+            # A concurrent upload of the same bill created the claim first
+            existing = Claim.objects.filter(buyer=buyer, document_hash=document_hash).first()
+            if existing is None:
+                raise
+            return duplicate_claim_response(request, existing)
+        except Exception:
+            discard_upload(job.document_path)
+            raise
         
         return Response({
             'success': True,
-            'message': 'Claim submitted successfully',
+            'message': 'Claim received and is being processed',
             'claim_id': claim_id,
-            'transaction_id': transaction_id,
-            'claim_amount': str(claim_amount),
-            'verification_status': claim_status,
-            'storacha_cid': claim.storacha_cid
-        }, status=status.HTTP_201_CREATED)
+            'job_id': str(job.id),
+            'status': job.stage,
+            'status_url': request.build_absolute_uri(reverse('claim_job_status', args=[job.id]))
+        }, status=status.HTTP_202_ACCEPTED)
         
+    except UploadTooLarge as e:
+        return Response({
+            'error': f'PDF file is too large (limit {e.max_size / (1024 * 1024):g} MB)'
+        }, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
     except Exception as e:
         return Response({
             'error': f'Failed to submit claim: {str(e)}'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-def extract_transaction_id_from_pdf(file):
+@api_view(['POST'])
+def submit_claim_batch(request):
     """
-    Extract transaction ID from PDF file content
+    Submit many claim PDFs in one request (hospitals filing for patients, bulk filers)
+    Expected payload (multipart): {
+        "files": PDF files (repeat the field), and/or
+        "archive": zip of PDFs, optionally with a manifest.json of {file name: buyer address},
+        "buyers": JSON object {file name: buyer address},
+        "buyer_address": "0x..." for files not listed in buyers,
+        "claim_description": "Medical treatment" (optional)
+    }
+    Files are extracted in parallel and verified concurrently, and all new claims are
+    inserted at once. Returns 200 with a result per file: created, duplicate or failed.
     """
     try:
-        # Reset file pointer to beginning
-        file.seek(0)
-        
-        # Read PDF content
-        pdf_reader = PyPDF2.PdfReader(file)
-        text = ""
-        
-        # Extract text from all pages
-        for page in pdf_reader.pages:
-            text += page.extract_text()
-        
-        # Look for transaction ID pattern (you can adjust this regex based on your PDF format)
-        # This looks for patterns like "Transaction ID: XXX" or "TXN: XXX"
-        patterns = [
-            r'Transaction\s*ID[:\s]*([A-Za-z0-9\-_]+)',
-            r'TXN[:\s]*([A-Za-z0-9\-_]+)',
-            r'Transaction[:\s]*([A-Za-z0-9\-_]+)',
-            r'ID[:\s]*([A-Za-z0-9\-_]+)'
-        ]
-        
-        transaction_id = None
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                transaction_id = match.group(1)
-                break
-        
-        return transaction_id
+        limit_upload_size(request, settings.CLAIM_BATCH_MAX_BYTES)
+        files = request.FILES.getlist('files')
+        archive = request.FILES.get('archive')
+        if not files and archive is None:
+            return Response({
+                'error': 'Missing required fields: files or archive'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            buyers = json.loads(request.data.get('buyers') or '{}')
+        except ValueError:
+            buyers = None
+        if not isinstance(buyers, dict):
+            return Response({
+                'error': 'buyers must be a JSON object mapping file names to buyer addresses'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        items = collect_batch_items(
+            files, archive, buyers, request.data.get('buyer_address'),
+            settings.CLAIM_BATCH_MAX_ITEMS, settings.CLAIM_BATCH_MAX_BYTES
+        )
+        results = process_claim_batch(items, request.data.get('claim_description') or 'Batch claim submission')
+
+        summary = {'total': len(results), 'created': 0, 'duplicate': 0, 'failed': 0}
+        for result in results:
+            summary[result['status']] += 1
+        return Response({
+            'success': True,
+            'summary': summary,
+            'results': results
+        }, status=status.HTTP_200_OK)
+
+    except UploadTooLarge as e:
+        return Response({
+            'error': f'Batch is too large (limit {e.max_size / (1024 * 1024):g} MB)'
+        }, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+    except BatchError as e:
+        return Response({
+            'error': str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
-        print(f"Error extracting transaction ID from PDF: {str(e)}")
-        return None
+        return Response({
+            'error': f'Failed to submit claim batch: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-def extract_claim_data_from_pdf(file):
+def duplicate_claim_response(request, claim):
+    """
+    200 with the existing claim and its processing job, in the shape claim_job_status returns
     """
-    Extract claim data (transaction ID and amount) from PDF file content
+    job = claim.jobs.order_by('-created_at').first()
+    if job is not None:
+        data = serialize_claim_job(job)
+        data['status_url'] = request.build_absolute_uri(reverse('claim_job_status', args=[job.id]))
+    else:
+        # Claims submitted before background processing have no job
+        data = {
+            'job_id': None,
+            'status': 'completed',
+            'error': None,
+            'claim_id': claim.claim_id,
+            'transaction_id': claim.hospital_transaction_id,
+            'claim_amount': str(claim.claim_amount),
+            'verification_status': claim.claim_status,
+            'storacha_cid': claim.storacha_cid
+        }
+    return Response({
+        'success': True,
+        'duplicate': True,
+        'message': 'This bill was already submitted; returning the existing claim',
+        **data
+    }, status=status.HTTP_200_OK)
+
+
+def serialize_claim_job(job):
+    claim = job.claim
+    data = {
+        'job_id': str(job.id),
+        'status': job.stage,
+        'error': job.error or None,
+        'created_at': job.created_at.isoformat(),
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+        'claim_id': None
+    }
+    if claim is not None:
+        data.update({
+            'claim_id': claim.claim_id,
+            'transaction_id': claim.hospital_transaction_id,
+            'claim_amount': str(claim.claim_amount),
+            'verification_status': claim.claim_status,
+            'storacha_cid': claim.storacha_cid
+        })
+    return data
+
+
+@api_view(['GET'])
+def claim_job_status(request, job_id):
+    """
+    Progress of a submitted claim: queued, extracting, verifying, uploading, completed or failed
+    Once completed the response carries the same claim fields the synchronous submission returned
     """
     try:
-        # Reset file pointer to beginning
-        file.seek(0)
-        
-        # Read PDF content
-        pdf_reader = PyPDF2.PdfReader(file)
-        text = ""
-        
-        # Extract text from all pages
-        for page in pdf_reader.pages:
-            text += page.extract_text()
-        
-        # Extract transaction ID
-        transaction_id_patterns = [
-            r'Transaction\s*ID[:\s]*([A-Za-z0-9\-_]+)',
-            r'TXN[:\s]*([A-Za-z0-9\-_]+)',
-            r'Transaction[:\s]*([A-Za-z0-9\-_]+)',
-            r'ID[:\s]*([A-Za-z0-9\-_]+)'
-        ]
-        
-        transaction_id = None
-        for pattern in transaction_id_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                transaction_id = match.group(1)
-                break
-        
-        # Extract amount
-        amount_patterns = [
-            r'Amount[:\s]*\$?([0-9,]+\.?[0-9]*)',
-            r'Total[:\s]*\$?([0-9,]+\.?[0-9]*)',
-            r'Claim\s*Amount[:\s]*\$?([0-9,]+\.?[0-9]*)',
-            r'\$([0-9,]+\.?[0-9]*)'
-        ]
-        
-        amount = None
-        for pattern in amount_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                amount_str = match.group(1).replace(',', '')  # Remove commas
-                try:
-                    amount = float(amount_str)
-                    break
-                except ValueError:
-                    continue
+        job = ClaimJob.objects.select_related('claim').filter(pk=job_id).first()
+        if job is None:
+            return Response({
+                'error': 'Claim job not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        return Response(serialize_claim_job(job), status=status.HTTP_200_OK)
         
-        return {
-            'transaction_id': transaction_id,
-            'amount': amount
-        }
     except Exception as e:
-        print(f"Error extracting claim data from PDF: {str(e)}")
-        return {
-            'transaction_id': None,
-            'amount': None
-        }
+        return Response({
+            'error': f'Failed to get claim job: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
 @api_view(['POST'])
@@ -397,8 +475,8 @@ def verify_claim(request):
         # Get claim
         claim = get_object_or_404(Claim, claim_id=claim_id)
         
-        # Verify transaction ID
-        verification_result = verify_transaction_id(claim.hospital_transaction_id)
+        # Verify transaction ID, skipping cached results: this is an explicit re-check
+        verification_result = verify_transaction_id(claim.hospital_transaction_id, use_cache=False)
         
         # Update claim status based on verification
         if verification_result.get('success', False):
@@ -423,68 +501,6 @@ def verify_claim(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-def verify_transaction_id(transaction_id):
-    """
-    Verify transaction ID against billing API
-    """
-    try:
-        # Call the verification API
-        url = f"http://127.0.0.1:8080/billing/api/verify-transaction/{transaction_id}/"
-        response = requests.get(url, timeout=10)
-        
-        if response.status_code == 200:
-            data = response.json()
-            # Check if transaction is successful based on status field
-            # Handle different possible success indicators
-            is_success = (
-                data.get('status') == 'paid' or 
-                data.get('success') == True or
-                data.get('status') == 'success'
-            )
-            return {
-                'success': is_success,
-                'data': data
-            }
-        else:
-            return {
-                'success': False,
-                'error': f'API returned status code {response.status_code}'
-            }
-    except requests.exceptions.RequestException as e:
-        # If the primary API is not available, try the fallback (8000)
-        try:
-            url = f"http://127.0.0.1:8000/billing/api/verify-transaction/{transaction_id}/"
-            response = requests.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                # Check if transaction is successful based on status field
-                is_success = (
-                    data.get('status') == 'paid' or 
-                    data.get('success') == True or
-                    data.get('status') == 'success'
-                )
-                return {
-                    'success': is_success,
-                    'data': data
-                }
-            else:
-                return {
-                    'success': False,
-                    'error': f'API returned status code {response.status_code}'
-                }
-        except requests.exceptions.RequestException as fallback_e:
-            return {
-                'success': False,
-                'error': f'API request failed on both ports: {str(e)} and {str(fallback_e)}'
-            }
-    except Exception as e:
-        return {
-            'success': False,
-            'error': f'Unexpected error: {str(e)}'
-        }
-
-
 @api_view(['GET'])
 def claim_history(request):
     """Get claim history - placeholder function"""
@@ -497,8 +513,63 @@ def upload_transaction_record(request):
 
 @api_view(['POST'])
 def upload_claim_doc(request):
-    """Upload claim document - placeholder function"""
-    return Response({'message': 'upload_claim_doc function - implement as needed'}, status=status.HTTP_501_NOT_IMPLEMENTED)
+    """
+    Upload a claim document (e.g. medical PDF) to Storacha
+    The file is streamed to Storacha in chunks, so large documents are never held in memory
+    Expected payload: {
+        "claim_id": "CLM-20250101120000",
+        "file": document file
+    }
+    """
+    try:
+        claim_id = request.data.get('claim_id')
+        file = request.FILES.get('file')
+        
+        if not all([claim_id, file]):
+            return Response({
+                'error': 'Missing required fields: claim_id, file'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Get claim
+        claim = get_object_or_404(Claim.objects.select_related('buyer'), claim_id=claim_id)
+        
+        # Stream document to Storacha
+        cid, file_size = storacha_service.upload_document_stream(file)
+        
+        # Record document against the claim
+        ClaimDoc.objects.create(claim=claim, storacha_cid=cid)
+        
+        # Add to buyer's claim_documents list
+        buyer = claim.buyer
+        if not buyer.claim_documents:
+            buyer.claim_documents = []
+        buyer.claim_documents.append({
+            'claim_id': claim.claim_id,
+            'cid': cid,
+            'filename': file.name,
+            'file_size': file_size,
+            'timestamp': timezone.now().isoformat(),
+            'status': 'submitted'
+        })
+        buyer.save(update_fields=['claim_documents'])
+        
+        return Response({
+            'success': True,
+            'message': 'Claim document uploaded to Storacha successfully',
+            'claim_id': claim_id,
+            'cid': cid,
+            'file_size': file_size
+        }, status=status.HTTP_201_CREATED)
+        
+    except CircuitOpenError as e:
+        # Streams cannot be deferred, so tell the client when to retry
+        return Response({
+            'error': f'Storacha is currently unavailable: {str(e)}'
+        }, status=status.HTTP_503_SERVICE_UNAVAILABLE, headers={'Retry-After': str(int(e.retry_after) + 1)})
+    except Exception as e:
+        return Response({
+            'error': f'Failed to upload claim document: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 # Admin authentication functions
 @api_view(['POST'])
@@ -603,30 +674,57 @@ def admin_verify_wallet(request):
             'error': f'Wallet verification failed: {str(e)}'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+def serialize_admin_claim(claim):
+    return {
+        'claim_id': claim.claim_id,
+        'buyer': claim.buyer.wallet_address,
+        'buyer_name': claim.buyer.full_name,
+        'claim_amount': str(claim.claim_amount),
+        'claim_description': claim.claim_description,
+        'claim_status': claim.claim_status,
+        'created_at': claim.created_at,
+        'hospital_transaction_id': claim.hospital_transaction_id,
+        'verified_at': claim.verified_at,
+        'accepted_at': claim.accepted_at
+    }
+
+
+def serialize_admin_buyer(buyer):
+    return {
+        'id': str(buyer.id),
+        'wallet_address': buyer.wallet_address,
+        'name': buyer.full_name,
+        'email': buyer.email,
+        'created_at': buyer.created_at,
+        'is_active': buyer.is_active,
+        'last_login': buyer.last_login,
+        'total_premiums_paid': str(buyer.total_premiums_paid),
+        'premium_payment_count': buyer.premium_payment_count
+    }
+
+
 @api_view(['GET'])
 def admin_get_claims(request):
-    """Get all claims for admin dashboard"""
+    """
+    Get claims for admin dashboard, one page at a time
+    Query params:
+        page_size (default ADMIN_PAGE_SIZE), cursor (next_cursor of the previous page),
+        order (newest | oldest),
+        status (comma-separated), buyer (wallet address), created_from, created_to,
+        min_amount, max_amount, hospital_transaction_id
+    """
     try:
-        # Get all claims ordered by creation date
-        claims = Claim.objects.select_related('buyer').all().order_by('-created_at')
+        claims = Claim.objects.select_related('buyer')
         
-        claims_data = [
-            {
-                'claim_id': claim.claim_id,
-                'buyer': claim.buyer.wallet_address,
-                'buyer_name': claim.buyer.full_name,
-                'claim_amount': str(claim.claim_amount),
-                'claim_description': claim.claim_description,
-                'claim_status': claim.claim_status,
-                'created_at': claim.created_at,
-                'hospital_transaction_id': claim.hospital_transaction_id,
-                'verified_at': claim.verified_at,
-                'accepted_at': claim.accepted_at
-            }
-            for claim in claims
-        ]
+        try:
+            claims = filter_claims(claims, request.query_params)
+            page = keyset_page(claims, request, serialize_admin_claim)
+        except ValueError as e:
+            return Response({
+                'error': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
         
-        return Response(claims_data, status=status.HTTP_200_OK)
+        return Response(page, status=status.HTTP_200_OK)
         
     except Exception as e:
         return Response({
@@ -635,33 +733,175 @@ def admin_get_claims(request):
 
 @api_view(['GET'])
 def admin_get_buyers(request):
-    """Get all buyers for admin dashboard"""
+    """
+    Get buyers for admin dashboard, one page at a time
+    Query params: page_size (default ADMIN_PAGE_SIZE), cursor (next_cursor of the previous page),
+    order (newest | oldest)
+    """
     try:
-        # Get all buyers ordered by creation date
-        buyers = Buyer.objects.all().order_by('-created_at')
-        
-        buyers_data = [
-            {
-                'id': str(buyer.id),
-                'wallet_address': buyer.wallet_address,
-                'name': buyer.full_name,
-                'email': buyer.email,
-                'created_at': buyer.created_at,
-                'is_active': buyer.is_active,
-                'last_login': buyer.last_login,
-                'total_premiums_paid': str(buyer.total_premiums_paid),
-                'premium_payment_count': buyer.premium_payment_count
-            }
-            for buyer in buyers
-        ]
+        try:
+            page = keyset_page(Buyer.objects.all(), request, serialize_admin_buyer)
+        except ValueError as e:
+            return Response({
+                'error': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
         
-        return Response(buyers_data, status=status.HTTP_200_OK)
+        return Response(page, status=status.HTTP_200_OK)
         
     except Exception as e:
         return Response({
             'error': f'Failed to get buyers: {str(e)}'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@api_view(['GET'])
+def admin_get_stats(request):
+    """
+    Dashboard statistics (claims by status, premiums, buyers, verification latency)
+    Aggregated in the database and cached until a Buyer, Claim or Premium changes,
+    or for at most ADMIN_STATS_CACHE_TIMEOUT seconds
+    """
+    try:
+        stats = cache.get(ADMIN_STATS_KEY)
+        if stats is None:
+            stats = dashboard_stats()
+            cache.set(ADMIN_STATS_KEY, stats, settings.ADMIN_STATS_CACHE_TIMEOUT)
+        
+        return Response(stats, status=status.HTTP_200_OK)
+        
+    except Exception as e:
+        return Response({
+            'error': f'Failed to get stats: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+@api_view(['POST'])
+def admin_reverify_claims(request):
+    """
+    Queue a re-check of unverified claims against the billing API, e.g. after an outage
+    Optional payload: {
+        "limit": 1000,          # at most ADMIN_REVERIFY_LIMIT claims per run
+        "batch_size": 200,
+        "concurrency": 8
+    }
+    Returns 202 with the run; poll status_url for its progress. While a run is in
+    progress no second one starts and the active run is returned instead.
+    Larger backlogs: python manage.py reverify_claims
+    """
+    try:
+        options = {}
+        for name, default in (('limit', settings.ADMIN_REVERIFY_LIMIT), ('batch_size', None), ('concurrency', None)):
+            value = request.data.get(name, default)
+            if value is None:
+                continue
+            try:
+                value = int(value)
+            except (TypeError, ValueError):
+                value = 0
+            if value < 1:
+                return Response({
+                    'error': f'{name} must be a positive integer'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            options[name] = value
+        options['limit'] = min(options['limit'], settings.ADMIN_REVERIFY_LIMIT)
+        
+        run, started = start_reverification(**options)
+        
+        return Response({
+            'success': True,
+            'message': 'Re-verification queued' if started else 'A re-verification run is already in progress',
+            'started': started,
+            **run,
+            'status_url': request.build_absolute_uri(reverse('admin_reverify_claims_status', args=[run['run_id']]))
+        }, status=status.HTTP_202_ACCEPTED)
+        
+    except Exception as e:
+        return Response({
+            'error': f'Failed to re-verify claims: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+def admin_reverify_claims_status(request, run_id):
+    """
+    Progress of a run queued by admin_reverify_claims
+    """
+    try:
+        run = get_reverification_run(run_id)
+        if run is None:
+            return Response({
+                'error': 'Re-verification run not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        return Response(run, status=status.HTTP_200_OK)
+        
+    except Exception as e:
+        return Response({
+            'error': f'Failed to get re-verification run: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+def export_response(queryset, fields, export_format, name):
+    response = StreamingHttpResponse(
+        stream_rows(queryset, fields, export_format),
+        content_type=EXPORT_FORMATS[export_format]
+    )
+    filename = f"{name}-{timezone.now().strftime('%Y%m%d%H%M%S')}.{export_format}"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+@api_view(['GET'])
+def admin_export_claims(request, export_format):
+    """
+    Stream claims with buyer fields as NDJSON or CSV (export_format: ndjson | csv)
+    Accepts the same filters as admin_get_claims; rows are ordered oldest first
+    """
+    try:
+        if export_format not in EXPORT_FORMATS:
+            return Response({
+                'error': 'Invalid export format. Must be "ndjson" or "csv"'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            claims = filter_claims(Claim.objects.all(), request.query_params)
+        except ValueError as e:
+            return Response({
+                'error': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        return export_response(claims.order_by('created_at', 'id'), CLAIM_EXPORT_FIELDS, export_format, 'claims')
+        
+    except Exception as e:
+        return Response({
+            'error': f'Failed to export claims: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+def admin_export_premiums(request, export_format):
+    """
+    Stream premiums with buyer fields as NDJSON or CSV (export_format: ndjson | csv)
+    Query params: buyer (wallet address), status, created_from, created_to; rows are ordered oldest first
+    """
+    try:
+        if export_format not in EXPORT_FORMATS:
+            return Response({
+                'error': 'Invalid export format. Must be "ndjson" or "csv"'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            premiums = filter_premiums(Premium.objects.all(), request.query_params)
+        except ValueError as e:
+            return Response({
+                'error': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        return export_response(premiums.order_by('created_at', 'id'), PREMIUM_EXPORT_FIELDS, export_format, 'premiums')
+        
+    except Exception as e:
+        return Response({
+            'error': f'Failed to export premiums: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 @api_view(['POST'])
 def admin_update_claim_status(request):
     """Update claim status"""
@@ -725,32 +965,21 @@ def store_claim_in_storacha(claim):
     Store claim data in Storacha
     """
     try:
-        # Prepare buyer data
-        buyer_data = {
-            'id': str(claim.buyer.id),
-            'full_name': claim.buyer.full_name,
-            'email': claim.buyer.email,
-            'wallet_address': claim.buyer.wallet_address,
-            'national_id': claim.buyer.national_id
-        }
-        
-        # Prepare claim data
-        claim_data = {
-            'claim_id': claim.claim_id,
-            'amount': str(claim.claim_amount),
-            'status': claim.claim_status,
-            'description': claim.claim_description,
-            'created_at': claim.created_at.isoformat()
-        }
+        buyer_data = buyer_upload_data(claim.buyer)
+        claim_data = claim_upload_data(claim)
         
-        # Upload to Storacha
-        cid = storacha_service.upload_claim_data(buyer_data, claim_data)
+        # Upload to Storacha; while the circuit is open the upload is deferred instead
+        try:
+            cid = storacha_service.upload_claim_data(buyer_data, claim_data)
+            print(f"✅ Claim {claim.claim_id} stored in Storacha with CID: {cid}")
+        except CircuitOpenError as e:
+            cid = storacha_service.queue_claim_upload(buyer_data, claim_data)
+            print(f"Storacha unavailable, deferred upload of claim {claim.claim_id} ({cid}): {str(e)}")
         
         # Save CID to claim
         claim.storacha_cid = cid
         claim.save(update_fields=['storacha_cid'])
         
-        print(f"✅ Claim {claim.claim_id} stored in Storacha with CID: {cid}")
         return cid
     except Exception as e:
         print(f"Error storing claim in Storacha: {str(e)}")
@@ -791,7 +1020,9 @@ def login_to_storacha(email):
     Login to Storacha and return session info
     """
     try:
-        from .services.storacha_node_service import StorachaNodeService
+        from .services.storacha_node_service import (
+    StorachaNodeService, buyer_upload_data, claim_upload_data, premium_upload_data
+)
         storacha_service = StorachaNodeService()
         
         # Login to Storacha
@@ -965,6 +1196,15 @@ def upload_claim_to_storacha(request):
         # Store claim data in Storacha
         cid = store_claim_in_storacha(claim)
         
+        if storacha_service.upload_status(cid) != 'stored':
+            return Response({
+                'success': True,
+                'message': 'Storacha is unavailable, claim upload deferred',
+                'claim_id': claim_id,
+                'cid': cid,
+                'deferred': True
+            }, status=status.HTTP_202_ACCEPTED)
+        
         return Response({
             'success': True,
             'message': 'Claim data uploaded to Storacha successfully',
@@ -997,30 +1237,30 @@ def upload_premium_to_storacha(request):
         # Get premium
         premium = get_object_or_404(Premium, id=premium_id)
         
-        # Prepare buyer data
-        buyer_data = {
-            'id': str(premium.buyer.id),
-            'full_name': premium.buyer.full_name,
-            'email': premium.buyer.email,
-            'wallet_address': premium.buyer.wallet_address,
-            'national_id': premium.buyer.national_id
-        }
-        
-        # Prepare premium data
-        premium_data = {
-            'transaction_hash': premium.transaction_hash,
-            'amount_eth': str(premium.amount_eth),
-            'block_timestamp': premium.block_timestamp.isoformat(),
-            'status': premium.status
-        }
+        buyer_data = buyer_upload_data(premium.buyer)
+        premium_data = premium_upload_data(premium)
         
-        # Upload to Storacha
-        cid = storacha_service.upload_premium_data(buyer_data, premium_data)
+        # Upload to Storacha; while the circuit is open the upload is deferred instead
+        try:
+            cid = storacha_service.upload_premium_data(buyer_data, premium_data)
+            deferred = False
+        except CircuitOpenError:
+            cid = storacha_service.queue_premium_upload(buyer_data, premium_data)
+            deferred = True
         
         # Save CID to premium
         premium.storacha_cid = cid
         premium.save(update_fields=['storacha_cid'])
         
+        if deferred:
+            return Response({
+                'success': True,
+                'message': 'Storacha is unavailable, premium upload deferred',
+                'premium_id': str(premium_id),
+                'cid': cid,
+                'deferred': True
+            }, status=status.HTTP_202_ACCEPTED)
+        
         return Response({
             'success': True,
             'message': 'Premium data uploaded to Storacha successfully',
@@ -1034,15 +1274,41 @@ def upload_premium_to_storacha(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@api_view(['GET'])
+def storacha_status(request):
+    """
+    Storacha circuit breaker state and upload queue counts for monitoring
+    """
+    try:
+        service_status = storacha_service.status()
+        return Response({
+            'success': True,
+            **service_status
+        }, status=status.HTTP_200_OK)
+        
+    except Exception as e:
+        return Response({
+            'error': f'Failed to get Storacha status: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 @api_view(['GET'])
 def fetch_accepted_claims(request):
     """
     Fetch all accepted claims with their Storacha CIDs
+    Pass ?include_data=true to also fetch the stored records from the gateway
     """
     try:
+        include_data = request.query_params.get('include_data') == 'true'
+        
         # Get all accepted claims
         claims = Claim.objects.filter(claim_status='accepted').select_related('buyer').order_by('-created_at')
         
+        # Fetch all stored records concurrently in one go
+        records = {}
+        if include_data:
+            records = storacha_service.fetch_records([claim.storacha_cid for claim in claims])
+        
         claims_data = []
         for claim in claims:
             claims_data.append({
@@ -1056,6 +1322,8 @@ def fetch_accepted_claims(request):
                 'storacha_cid': claim.storacha_cid,
                 'storacha_url': f'https://{claim.storacha_cid}.ipfs.storacha.link' if claim.storacha_cid else None
             })
+            if include_data:
+                claims_data[-1]['storacha_data'] = records.get(claim.storacha_cid)
         
         return Response(claims_data, status=status.HTTP_200_OK)
         
@@ -1069,14 +1337,30 @@ def fetch_accepted_claims(request):
 def fetch_buyer_premiums(request, wallet_address):
     """
     Fetch all premiums for a buyer with their Storacha CIDs
+    Pass ?include_data=true to also fetch the stored records from the gateway
+    If-None-Match with the current ETag gets 304 before anything is queried. With
+    include_data the ETag is only sent (and honoured) once every record was fetched:
+    a record missing now (gateway error, upload still pending) may appear without any save
     """
     try:
+        include_data = request.query_params.get('include_data') == 'true'
+        etag = buyer_etag('premiums-data' if include_data else 'premiums', wallet_address)
+        if not include_data:
+            response = not_modified(request, etag)
+            if response:
+                return response
+        
         # Get buyer
         buyer = get_object_or_404(Buyer, wallet_address=wallet_address)
         
         # Get all premiums for this buyer
         premiums = Premium.objects.filter(buyer=buyer).order_by('-created_at')
         
+        # Fetch all stored records concurrently in one go
+        records = {}
+        if include_data:
+            records = storacha_service.fetch_records([premium.storacha_cid for premium in premiums])
+        
         premiums_data = []
         for premium in premiums:
             premiums_data.append({
@@ -1088,8 +1372,18 @@ def fetch_buyer_premiums(request, wallet_address):
                 'storacha_cid': premium.storacha_cid,
                 'storacha_url': f'https://{premium.storacha_cid}.ipfs.storacha.link' if premium.storacha_cid else None
             })
-        
-        return Response(premiums_data, status=status.HTTP_200_OK)
+            if include_data:
+                premiums_data[-1]['storacha_data'] = records.get(premium.storacha_cid)
+        
+        if include_data:
+            if any(premium.storacha_cid and records.get(premium.storacha_cid) is None for premium in premiums):
+                return Response(premiums_data, status=status.HTTP_200_OK)
+            # Stored records never change, so a complete response is as stable as the DB version
+            response = not_modified(request, etag)
+            if response:
+                return response
+        
+        return with_etag(Response(premiums_data, status=status.HTTP_200_OK), etag)
         
     except Exception as e:
         return Response({
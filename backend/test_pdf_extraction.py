@@ -16,7 +16,7 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 django.setup()
 
 # Import the extraction function
-from insurance.views import extract_claim_data_from_pdf
+from insurance.services.claim_extraction import extract_claim_data_from_pdf
 
 # Create a mock PDF file with test content
 pdf_content = """
@@ -41,7 +41,7 @@ class MockPage:
 
 # Test the extraction function
 print("Testing PDF extraction...")
-with patch('insurance.views.PyPDF2.PdfReader', MockPdfReader):
+with patch('insurance.services.claim_extraction.PyPDF2.PdfReader', MockPdfReader):
     # Create a mock file object
     mock_file = BytesIO(b"fake pdf content")
     mock_file.name = "test.pdf"
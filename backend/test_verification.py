@@ -13,9 +13,16 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 django.setup()
 
+# Without a configured billing API, answer from the local stand-in
+if not os.getenv('BILLING_API_URLS'):
+    from insurance.services.billing_standin import start_billing_standin
+    standin = start_billing_standin(dataset={'WM9pe6ds': 'paid'})
+    os.environ['BILLING_API_URLS'] = standin.url
+    print("Using billing stand-in at", standin.url)
+
 # Import the verification function
-from insurance.views import verify_transaction_id
+from insurance.services.billing import verify_transaction_id
 
-# Test the function
-result = verify_transaction_id('WM9pe6ds')
+# Test the function (skip the result cache so the API is really called)
+result = verify_transaction_id('WM9pe6ds', use_cache=False)
 print("Verification result:", result)
\ No newline at end of file
@@ -15,9 +15,9 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 django.setup()
 
 # Import the verification function
-from insurance.views import verify_transaction_id
+from insurance.services.billing import verify_transaction_id
 
-# Mock the requests.get function to simulate API response
+# Mock the pooled session's get() function to simulate API response
 def mock_get_success(*args, **kwargs):
     mock_response = Mock()
     mock_response.status_code = 200
@@ -37,13 +37,13 @@ def mock_get_failure(*args, **kwargs):
 
 # Test with successful response
 print("Testing with successful API response...")
-with patch('requests.get', side_effect=mock_get_success):
-    result = verify_transaction_id('WM9pe6ds')
+with patch('requests.Session.get', side_effect=mock_get_success):
+    result = verify_transaction_id('WM9pe6ds', use_cache=False)
     print("Verification result:", result)
     print("Success status:", result.get('success'))
 
 print("\nTesting with failed API response...")
-with patch('requests.get', side_effect=mock_get_failure):
-    result = verify_transaction_id('WM9pe6ds')
+with patch('requests.Session.get', side_effect=mock_get_failure):
+    result = verify_transaction_id('WM9pe6ds', use_cache=False)
     print("Verification result:", result)
     print("Success status:", result.get('success'))
\ No newline at end of file
@@ -27,6 +27,32 @@ interface Buyer {
   premium_payment_count: number;
 }
 
+interface DashboardStats {
+  claims: {
+    total: number;
+    total_amount: string;
+    open: number;
+    by_status: Record<string, { count: number; amount: string }>;
+  };
+  premiums: {
+    count: number;
+    total_eth: string;
+    confirmed_count: number;
+    confirmed_eth: string;
+  };
+  buyers: {
+    total: number;
+    enabled: number;
+    active: number;
+  };
+  verification_latency: {
+    count: number;
+    average_seconds: number | null;
+    min_seconds: number | null;
+    max_seconds: number | null;
+  };
+}
+
 interface AdminDashboardProps {
   adminData?: {
     id: string;
@@ -39,7 +65,10 @@ interface AdminDashboardProps {
 export default function AdminDashboard({ adminData }: AdminDashboardProps) {
   const [claims, setClaims] = useState<Claim[]>([]);
   const [buyers, setBuyers] = useState<Buyer[]>([]);
+  const [claimsCursor, setClaimsCursor] = useState<string | null>(null);
+  const [buyersCursor, setBuyersCursor] = useState<string | null>(null);
   const [acceptedClaims, setAcceptedClaims] = useState<any[]>([]);
+  const [stats, setStats] = useState<DashboardStats | null>(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [activeTab, setActiveTab] = useState<'claims' | 'buyers' | 'analytics' | 'registration' | 'accepted'>('registration');
@@ -65,6 +94,55 @@ export default function AdminDashboard({ adminData }: AdminDashboardProps) {
     }
   };
 
+  const fetchStats = async () => {
+    try {
+      const response = await fetch(`${import.meta.env.VITE_BACKEND_URL}/admin/stats/`);
+      if (!response.ok) {
+        throw new Error('Failed to fetch stats');
+      }
+      setStats(await response.json());
+    } catch (err) {
+      console.error('Error fetching stats:', err);
+    }
+  };
+
+  const formatSeconds = (seconds: number | null) => {
+    if (seconds === null) return '—';
+    if (seconds < 60) return `${seconds.toFixed(1)}s`;
+    if (seconds < 3600) return `${(seconds / 60).toFixed(1)}m`;
+    return `${(seconds / 3600).toFixed(1)}h`;
+  };
+
+  const loadMoreClaims = async () => {
+    if (!claimsCursor) return;
+    try {
+      const response = await fetch(`${import.meta.env.VITE_BACKEND_URL}/admin/claims/?cursor=${encodeURIComponent(claimsCursor)}`);
+      if (!response.ok) {
+        throw new Error('Failed to fetch claims data');
+      }
+      const data = await response.json();
+      setClaims(prev => [...prev, ...data.results]);
+      setClaimsCursor(data.next_cursor);
+    } catch (err) {
+      console.error('Error loading more claims:', err);
+    }
+  };
+
+  const loadMoreBuyers = async () => {
+    if (!buyersCursor) return;
+    try {
+      const response = await fetch(`${import.meta.env.VITE_BACKEND_URL}/admin/buyers/?cursor=${encodeURIComponent(buyersCursor)}`);
+      if (!response.ok) {
+        throw new Error('Failed to fetch buyers data');
+      }
+      const data = await response.json();
+      setBuyers(prev => [...prev, ...data.results]);
+      setBuyersCursor(data.next_cursor);
+    } catch (err) {
+      console.error('Error loading more buyers:', err);
+    }
+  };
+
   const fetchData = async () => {
     try {
       setLoading(true);
@@ -83,11 +161,14 @@ export default function AdminDashboard({ adminData }: AdminDashboardProps) {
       }
       const buyersData = await buyersResponse.json();
       
-      setClaims(claimsData);
-      setBuyers(buyersData);
+      // Listings are paginated; next_cursor loads the following page
+      setClaims(claimsData.results);
+      setClaimsCursor(claimsData.next_cursor);
+      setBuyers(buyersData.results);
+      setBuyersCursor(buyersData.next_cursor);
       
-      // Fetch accepted claims
-      await fetchAcceptedClaims();
+      // Fetch accepted claims and the aggregated analytics figures
+      await Promise.all([fetchAcceptedClaims(), fetchStats()]);
     } catch (err) {
       setError('Failed to fetch data: ' + (err as Error).message);
       console.error('Error fetching data:', err);
@@ -490,7 +571,7 @@ export default function AdminDashboard({ adminData }: AdminDashboardProps) {
               <div className="flex justify-between items-center">
                 <h3 className="text-lg font-semibold">Claims Management</h3>
                 <div className="text-sm text-gray-500">
-                  Total Claims: {claims.length}
+                  Showing {claims.length} claims{claimsCursor ? ' (more available)' : ''}
                 </div>
               </div>
 
@@ -563,6 +644,17 @@ export default function AdminDashboard({ adminData }: AdminDashboardProps) {
                   </tbody>
                 </table>
               </div>
+
+              {claimsCursor && (
+                <div className="flex justify-center">
+                  <button
+                    onClick={loadMoreClaims}
+                    className="px-4 py-2 text-sm bg-gray-100 text-gray-700 rounded-md hover:bg-gray-200"
+                  >
+                    Load more claims
+                  </button>
+                </div>
+              )}
             </div>
           )}
 
@@ -621,7 +713,7 @@ export default function AdminDashboard({ adminData }: AdminDashboardProps) {
               <div className="flex justify-between items-center">
                 <h3 className="text-lg font-semibold">Registered Buyers</h3>
                 <div className="text-sm text-gray-500">
-                  Total Buyers: {buyers.length}
+                  Showing {buyers.length} buyers{buyersCursor ? ' (more available)' : ''}
                 </div>
               </div>
 
@@ -663,6 +755,17 @@ export default function AdminDashboard({ adminData }: AdminDashboardProps) {
                   </tbody>
                 </table>
               </div>
+
+              {buyersCursor && (
+                <div className="flex justify-center">
+                  <button
+                    onClick={loadMoreBuyers}
+                    className="px-4 py-2 text-sm bg-gray-100 text-gray-700 rounded-md hover:bg-gray-200"
+                  >
+                    Load more buyers
+                  </button>
+                </div>
+              )}
             </div>
           )}
 
@@ -674,26 +777,58 @@ export default function AdminDashboard({ adminData }: AdminDashboardProps) {
               <div className="grid grid-cols-1 md:grid-cols-3 gap-6">
                 <div className="bg-blue-50 rounded-lg p-6">
                   <div className="text-2xl font-bold text-blue-600">
-                    {claims.length}
+                    {stats ? stats.claims.total : claims.length}
                   </div>
                   <div className="text-sm text-blue-800">Total Claims</div>
                 </div>
                 
                 <div className="bg-green-50 rounded-lg p-6">
                   <div className="text-2xl font-bold text-green-600">
-                    {claims.filter(c => c.claim_status === 'accepted').length}
+                    {stats ? stats.claims.by_status.accepted.count : claims.filter(c => c.claim_status === 'accepted').length}
                   </div>
                   <div className="text-sm text-green-800">Accepted Claims</div>
                 </div>
                 
                 <div className="bg-yellow-50 rounded-lg p-6">
                   <div className="text-2xl font-bold text-yellow-600">
-                    {claims.filter(c => c.claim_status === 'pending' || c.claim_status === 'submitted' || c.claim_status === 'verified' || c.claim_status === 'unverified').length}
+                    {stats ? stats.claims.open : claims.filter(c => c.claim_status === 'pending' || c.claim_status === 'submitted' || c.claim_status === 'verified' || c.claim_status === 'unverified').length}
                   </div>
                   <div className="text-sm text-yellow-800">Pending Claims</div>
                 </div>
               </div>
 
+              {stats && (
+                <div className="grid grid-cols-1 md:grid-cols-4 gap-6">
+                  <div className="bg-purple-50 rounded-lg p-6">
+                    <div className="text-2xl font-bold text-purple-600">
+                      ${stats.claims.total_amount}
+                    </div>
+                    <div className="text-sm text-purple-800">Total Claimed</div>
+                  </div>
+
+                  <div className="bg-indigo-50 rounded-lg p-6">
+                    <div className="text-2xl font-bold text-indigo-600">
+                      {stats.premiums.confirmed_eth} ETH
+                    </div>
+                    <div className="text-sm text-indigo-800">Premiums Collected ({stats.premiums.confirmed_count} payments)</div>
+                  </div>
+
+                  <div className="bg-teal-50 rounded-lg p-6">
+                    <div className="text-2xl font-bold text-teal-600">
+                      {stats.buyers.active} / {stats.buyers.total}
+                    </div>
+                    <div className="text-sm text-teal-800">Active Buyers</div>
+                  </div>
+
+                  <div className="bg-orange-50 rounded-lg p-6">
+                    <div className="text-2xl font-bold text-orange-600">
+                      {formatSeconds(stats.verification_latency.average_seconds)}
+                    </div>
+                    <div className="text-sm text-orange-800">Avg. Time to Verification</div>
+                  </div>
+                </div>
+              )}
+
               <div className="bg-gray-50 rounded-lg p-6">
                 <h4 className="font-semibold mb-4">Recent Activity</h4>
                 <div className="space-y-2">
@@ -94,10 +94,33 @@ export default function BuyerDashboard() {
         throw new Error(errorData.error || 'Failed to submit claim');
       }
       
-      const result = await response.json();
+      const submission = await response.json();
+      console.log('📨 Claim received:', submission);
+      
+      // Extraction, verification and upload run in the background; poll the job until it finishes
+      // A bill this buyer already submitted comes back as the existing claim (duplicate: true)
+      setClaimStatus(submission.duplicate
+        ? `🔄 This bill was already submitted as claim ${submission.claim_id}, checking its status...`
+        : `🔄 Claim ${submission.claim_id} received, processing...`);
+      let result = submission;
+      while (result.status !== 'completed' && result.status !== 'failed') {
+        await new Promise(resolve => setTimeout(resolve, 1000));
+        const statusResponse = await fetch(`${import.meta.env.VITE_BACKEND_URL}/claim-jobs/${submission.job_id}/`);
+        if (!statusResponse.ok) {
+          throw new Error('Failed to check claim status');
+        }
+        result = await statusResponse.json();
+        if (result.status !== 'completed' && result.status !== 'failed') {
+          setClaimStatus(`🔄 Claim ${submission.claim_id}: ${result.status}...`);
+        }
+      }
+      
+      if (result.status === 'failed') {
+        throw new Error(result.error || 'Failed to process claim');
+      }
       console.log('✅ Claim submitted:', result);
       
-      setClaimStatus(`✅ Claim submitted successfully!
+      setClaimStatus(`${submission.duplicate ? 'ℹ️ This bill was already submitted.' : '✅ Claim submitted successfully!'}
 📋 Claim ID: ${result.claim_id}
 💳 Transaction ID: ${result.transaction_id}
 💰 Claim Amount: $${result.claim_amount}
@@ -107,6 +130,7 @@ Admin will review your claim and update the status.`);
       
       // Clear the file input
       setFile(null);
+      fetchClaimHistory();
       
     } catch (error) {
       console.error('Claim submission error:', error);